@@ -5,6 +5,7 @@ Proyecto de Procesos Unitarios — 5to Semestre
 Visualización y análisis del sistema de transporte de agua
 desde un río, cruzando una montaña, hasta una planta industrial.
 """
+import inspect
 import sys
 from pathlib import Path
 
@@ -17,17 +18,26 @@ import numpy as np
 import streamlit.components.v1 as components
 
 from core.hidraulica import (
-    calcular_sistema_completo,
     area_seccion, velocidad, carga_cinetica,
-    reynolds, f_colebrook, f_haaland, kw_a_hp,
+    reynolds, kw_a_hp, regimen_flujo, potencia_instalada,
 )
 from core.tramos import obtener_definicion_tramos, obtener_elevaciones_acumuladas
 from core.datos import extraer_datos_completos
+from core.grafo import GrafoHidraulico
+from core.optimizacion import optimizar_estaciones, optimizar_diametro
+from core.perfilado import PERFILADOR
+from core.incertidumbre import monte_carlo_potencia
+from core.sensibilidad import indices_sobol
+from core.tabla_moody import cargar_tabla, curvas_moody
 from visualizaciones.mapa_piezometrico import (
     crear_mapa_piezometrico,
     crear_desglose_perdidas,
     crear_grafico_potencia,
     crear_perfil_terreno_con_tramos,
+    crear_grafico_pareto_diametro,
+    crear_histograma_potencia,
+    crear_grafico_sobol,
+    crear_diagrama_moody,
 )
 from visualizaciones.modelo_3d import generar_modelo_tramo
 
@@ -42,15 +52,20 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Tiempos por etapa de este rerun (pestaña oculta ?diagnostico=1)
+PERFILADOR.iniciar_rerun()
+
 # CSS global para animaciones de transición
-st.markdown("""
+with PERFILADOR.etapa('css'):
+    st.markdown("""
 <style>
     * { transition: background-color 0.2s ease, border-color 0.2s ease; }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # CSS personalizado para Tema Dark Engineering (Versión Optimizada)
-st.markdown("""
+with PERFILADOR.etapa('css'):
+    st.markdown("""
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
     
@@ -526,18 +541,25 @@ st.markdown("""
         to { transform: rotate(360deg); }
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
 # ====================================
 # SESSION STATE & INIT
 # ====================================
+# Definición única de la potencia total (encabezado, Monte Carlo, optimizadores)
+AYUDA_POTENCIA_INSTALADA = (
+    "Suma sobre los tramos de la potencia por estación × número de estaciones."
+)
+
 # Valores por defecto
 DEFAULTS = {
     "Q": 0.025,
     "D": 0.1541,
     "epsilon": 0.000046,
     "rho": 998.0,
-    "mu": 0.0010
+    "mu": 0.0010,
+    "metodo_friccion": "regimen",
+    "render_diferido": True,
 }
 
 # Inicializar estado si no existe
@@ -555,7 +577,7 @@ def reset_defaults():
 # ====================================
 
 # --- Header Sidebar ---
-with st.sidebar:
+with st.sidebar, PERFILADOR.etapa('sidebar'):
     st.markdown(
         """
         <div style="display: flex; align-items: center; gap: 10px; margin-bottom: 20px;">
@@ -570,7 +592,7 @@ with st.sidebar:
     st.markdown("<br>", unsafe_allow_html=True)
 
 # --- Controles Agrupados ---
-with st.sidebar:
+with st.sidebar, PERFILADOR.etapa('sidebar'):
     # 1. Tubería
     with st.expander("🔧 Parámetros de Tubería", expanded=True):
         st.session_state.Q = st.slider(
@@ -603,6 +625,21 @@ with st.sidebar:
             help="Rugosidad absoluta del material (Acero comercial ≈ 0.000046 m)"
         )
 
+        metodos_friccion = ["regimen", "colebrook", "tabla"]
+        st.session_state.metodo_friccion = st.radio(
+            "Factor de fricción",
+            options=metodos_friccion,
+            index=metodos_friccion.index(st.session_state.metodo_friccion),
+            format_func=lambda m: {
+                "regimen": "Según régimen",
+                "colebrook": "Colebrook (exacto)",
+                "tabla": "Tabla de Moody (interpolada)",
+            }[m],
+            help="Según régimen: 64/Re en laminar, interpolación en transición y "
+                 "Colebrook en turbulento. La tabla precalculada evita resolver la "
+                 "ecuación implícita (error relativo < 1e-6 frente a Colebrook)."
+        )
+
     # 2. Fluido
     with st.expander("💧 Propiedades del Fluido", expanded=False):
         st.session_state.rho = st.slider(
@@ -638,7 +675,7 @@ with st.sidebar:
     _A = area_seccion(st.session_state.D)
     _v = velocidad(st.session_state.Q, _A)
     _Re = reynolds(st.session_state.rho, _v, st.session_state.D, st.session_state.mu)
-    _regimen = "Turbulento" if _Re > 4000 else ("Transición" if _Re > 2300 else "Laminar")
+    _regimen = regimen_flujo(_Re)
     
     col_res1, col_res2 = st.columns(2)
     with col_res1:
@@ -664,71 +701,143 @@ with st.sidebar:
 # ====================================
 # CÁLCULOS CENTRALIZADOS
 # ====================================
-@st.cache_data
-def calcular(Q, D, rho, mu, epsilon):
-    return calcular_sistema_completo(Q=Q, D=D, rho=rho, mu=mu, epsilon=epsilon)
-
-resultados = calcular(
-    st.session_state.Q,
-    st.session_state.D,
-    st.session_state.rho,
-    st.session_state.mu,
-    st.session_state.epsilon
-)
+# Grafo de cálculo incremental por sesión: al mover un control solo se
+# recalculan los nodos que dependen de esa entrada
+with PERFILADOR.etapa('calculo'):
+    if 'grafo' not in st.session_state:
+        st.session_state.grafo = GrafoHidraulico()
+    grafo = st.session_state.grafo
+    grafo.fijar(
+        Q=st.session_state.Q,
+        D=st.session_state.D,
+        rho=st.session_state.rho,
+        mu=st.session_state.mu,
+        epsilon=st.session_state.epsilon,
+        metodo_friccion=st.session_state.metodo_friccion,
+    )
+    resultados = grafo.resultado()
 
-# Valores derivados globales
-A = area_seccion(st.session_state.D)
-v = velocidad(st.session_state.Q, A)
-hv = carga_cinetica(v)
-Re = reynolds(st.session_state.rho, v, st.session_state.D, st.session_state.mu)
-f_col = f_colebrook(Re, st.session_state.epsilon, st.session_state.D)
-f_haa = f_haaland(Re, st.session_state.epsilon, st.session_state.D)
+    # Valores derivados globales
+    A = area_seccion(st.session_state.D)
+    v = velocidad(st.session_state.Q, A)
+    hv = carga_cinetica(v)
+    Re = reynolds(st.session_state.rho, v, st.session_state.D, st.session_state.mu)
+    # Todos los tramos comparten Re y ε/D: se reutiliza el factor ya calculado
+    f_col = resultados[1]['f_colebrook']
+    f_haa = resultados[1]['f_haaland']
 
-# Potencia total
-pot_total_kw = sum(r['potencia_kw'] for r in resultados.values())
-pot_total_hp = kw_a_hp(pot_total_kw) if pot_total_kw > 0 else 0
+    # Potencia total: misma definición que Monte Carlo, Sobol y los optimizadores
+    pot_total_kw = float(potencia_instalada(
+        resultados.columna('potencia_kw'), resultados.columna('num_estaciones')
+    ))
+    pot_total_hp = kw_a_hp(pot_total_kw) if pot_total_kw > 0 else 0
 
 
 # ====================================
 # HEADER / HERO SECTION
 # ====================================
-st.markdown(
-    """
-    <div class="hero-container">
-        <div class="hero-icon">🏔️</div>
-        <div class="hero-text">
-            <h1>Sistema Hidráulico Montañoso</h1>
-            <p>Simulación de transporte de fluidos: Río → Montaña → Planta Industrial</p>
+with PERFILADOR.etapa('encabezado'):
+    st.markdown(
+        """
+        <div class="hero-container">
+            <div class="hero-icon">🏔️</div>
+            <div class="hero-text">
+                <h1>Sistema Hidráulico Montañoso</h1>
+                <p>Simulación de transporte de fluidos: Río → Montaña → Planta Industrial</p>
+            </div>
+            <div style="flex-grow: 1;"></div>
+            <a href="https://github.com/samuelthecreat/PROCESOS_UNITARIOS---PROYECTO_MOUNTAIN" target="_blank" class="github-btn">
+                <svg height="20" width="20" viewBox="0 0 16 16">
+                    <path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59.4.07.55-.17.55-.38 0-.19-.01-.82-.01-1.49-2.01.37-2.53-.49-2.69-.94-.09-.23-.48-.94-.82-1.13-.28-.15-.68-.52-.01-.53.63-.01 1.08.58 1.23.82.72 1.21 1.87.87 2.33.66.07-.52.28-.87.51-1.07-1.78-.2-3.64-.89-3.64-3.95 0-.87.31-1.59.82-2.15-.08-.2-.36-1.02.08-2.12 0 0 .67-.21 2.2.82.64-.18 1.32-.27 2-.27.68 0 1.36.09 2 .27 1.53-1.04 2.2-.82 2.2-.82.44 1.1.16 1.92.08 2.12.51.56.82 1.27.82 2.15 0 3.07-1.87 3.75-3.65 3.95.29.25.54.73.54 1.48 0 1.07-.01 1.93-.01 2.2 0 .21.15.46.55.38A8.013 8.013 0 0016 8c0-4.42-3.58-8-8-8z"></path>
+                </svg>
+                Repositorio
+            </a>
         </div>
-        <div style="flex-grow: 1;"></div>
-        <a href="https://github.com/samuelthecreat/PROCESOS_UNITARIOS---PROYECTO_MOUNTAIN" target="_blank" class="github-btn">
-            <svg height="20" width="20" viewBox="0 0 16 16">
-                <path d="M8 0C3.58 0 0 3.58 0 8c0 3.54 2.29 6.53 5.47 7.59.4.07.55-.17.55-.38 0-.19-.01-.82-.01-1.49-2.01.37-2.53-.49-2.69-.94-.09-.23-.48-.94-.82-1.13-.28-.15-.68-.52-.01-.53.63-.01 1.08.58 1.23.82.72 1.21 1.87.87 2.33.66.07-.52.28-.87.51-1.07-1.78-.2-3.64-.89-3.64-3.95 0-.87.31-1.59.82-2.15-.08-.2-.36-1.02.08-2.12 0 0 .67-.21 2.2.82.64-.18 1.32-.27 2-.27.68 0 1.36.09 2 .27 1.53-1.04 2.2-.82 2.2-.82.44 1.1.16 1.92.08 2.12.51.56.82 1.27.82 2.15 0 3.07-1.87 3.75-3.65 3.95.29.25.54.73.54 1.48 0 1.07-.01 1.93-.01 2.2 0 .21.15.46.55.38A8.013 8.013 0 0016 8c0-4.42-3.58-8-8-8z"></path>
-            </svg>
-            Repositorio
-        </a>
-    </div>
-    """,
-    unsafe_allow_html=True
+        """,
+        unsafe_allow_html=True
+    )
+
+    # Metrics Bar — usando componentes nativos Streamlit
+    cols = st.columns(4)
+    with cols[0]:
+        st.metric("💧 Caudal de Diseño", f"{st.session_state.Q*1000:.1f} L/s", "Constante")
+    with cols[1]:
+        st.metric(
+            "⚡ Potencia Instalada", f"{pot_total_kw:.1f} kW", f"{pot_total_hp:.1f} HP",
+            help=AYUDA_POTENCIA_INSTALADA,
+        )
+    with cols[2]:
+        st.metric("📍 Elevación Máxima", "500 m", "Tramo 4")
+    with cols[3]:
+        st.metric("📏 Longitud Total", "3.4 km", "8 Tramos")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+# ====================================
+# VISTAS CACHEADAS
+# ====================================
+# Con pestañas con estado (Streamlit reciente) solo la pestaña abierta
+# construye sus figuras; cada vista se guarda por tupla de entradas, así
+# que volver a una combinación ya vista no la reconstruye.
+TABS_CON_ESTADO = 'on_change' in inspect.signature(st.tabs).parameters
+
+entradas = (
+    st.session_state.Q, st.session_state.D, st.session_state.rho,
+    st.session_state.mu, st.session_state.epsilon, st.session_state.metodo_friccion,
 )
 
-# Metrics Bar — usando componentes nativos Streamlit
-cols = st.columns(4)
-with cols[0]:
-    st.metric("💧 Caudal de Diseño", f"{st.session_state.Q*1000:.1f} L/s", "Constante")
-with cols[1]:
-    st.metric("⚡ Potencia Total", f"{pot_total_kw:.1f} kW", f"{pot_total_hp:.1f} HP")
-with cols[2]:
-    st.metric("📍 Elevación Máxima", "500 m", "Tramo 4")
-with cols[3]:
-    st.metric("📏 Longitud Total", "3.4 km", "8 Tramos")
 
-st.markdown("<br>", unsafe_allow_html=True)
+def pestaña_visible(pestaña) -> bool:
+    """False solo si las pestañas rastrean estado y esta no es la abierta."""
+    return getattr(pestaña, 'open', None) is not False
+
+
+def resultado_vigente(clave: str):
+    """
+    Resultado guardado en la sesión como (entradas, resultado), solo si
+    se calculó con las entradas actuales. Si cambiaron, se descarta y se
+    avisa: no se muestran resultados de otro Q, D, ρ, μ o ε.
+    """
+    guardado = st.session_state.get(clave)
+    if guardado is None:
+        return None
+    entradas_calculo, resultado = guardado
+    if entradas_calculo != entradas:
+        del st.session_state[clave]
+        st.info("Los parámetros cambiaron desde el último cálculo: vuelva a ejecutarlo.")
+        return None
+    return resultado
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def vista_mapa_piezometrico(entradas, _resultados):
+    return crear_mapa_piezometrico(_resultados, entradas[0], entradas[1])
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def vista_perfil_terreno(entradas, _resultados):
+    return crear_perfil_terreno_con_tramos(_resultados)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def vista_desglose_perdidas(entradas, _resultados):
+    return crear_desglose_perdidas(_resultados)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def vista_grafico_potencia(entradas, _resultados):
+    return crear_grafico_potencia(_resultados)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def vista_modelo_3d(entradas, num_tramo, _resultados):
+    return generar_modelo_tramo(num_tramo, _resultados)
+
 
 # ====================================
 # TABS PRINCIPALES
 # ====================================
-tab_home, tab_map, tab_terrain, tab_loss, tab_3d, tab_data, tab_docs = st.tabs([
+nombres_tabs = [
     "🏠 Inicio",
     "📈 Mapa Piezométrico",
     "🏔️ Perfil Topográfico",
@@ -736,13 +845,23 @@ tab_home, tab_map, tab_terrain, tab_loss, tab_3d, tab_data, tab_docs = st.tabs([
     "🧊 Modelo 3D",
     "📊 Datos Detallados",
     "📑 Documentación"
-])
+]
+# Pestaña oculta de diagnóstico: se muestra con ?diagnostico=1 en la URL
+mostrar_diagnostico = st.query_params.get("diagnostico") == "1"
+if mostrar_diagnostico:
+    nombres_tabs.append("🩺 Diagnóstico")
+opciones_tabs = {}
+if TABS_CON_ESTADO and st.session_state.render_diferido:
+    opciones_tabs = {"key": "pestaña_activa", "on_change": "rerun"}
+tab_home, tab_map, tab_terrain, tab_loss, tab_3d, tab_data, tab_docs, *tab_diag = st.tabs(
+    nombres_tabs, **opciones_tabs
+)
 
 
 # ==============================
 # TAB HOME: Resumen
 # ==============================
-with tab_home:
+with tab_home, PERFILADOR.etapa('pestaña_inicio'):
     col_h1, col_h2 = st.columns([1, 1])
     with col_h1:
         st.markdown("### 📋 Resumen del Proyecto")
@@ -788,7 +907,7 @@ with tab_home:
 # ==============================
 # TAB 1: MAPA PIEZOMÉTRICO
 # ==============================
-with tab_map:
+with tab_map, PERFILADOR.etapa('pestaña_mapa'):
     st.markdown("### Líneas de Energía y Gradiente Hidráulico")
     st.caption("Visualización de las presiones a lo largo de todo el recorrido. La línea **cian (EGL)** representa la energía total y la **amarilla (HGL)** el gradiente hidráulico.")
     
@@ -797,19 +916,21 @@ with tab_map:
         "Si la línea de gradiente hidráulico (HGL) cruza por debajo de la tubería, existe riesgo de **presión negativa y cavitación**."
     )
 
-    fig_piezo = crear_mapa_piezometrico(resultados, st.session_state.Q, st.session_state.D)
-    st.plotly_chart(fig_piezo, use_container_width=True)
+    if pestaña_visible(tab_map):
+        fig_piezo = vista_mapa_piezometrico(entradas, resultados)
+        st.plotly_chart(fig_piezo, use_container_width=True)
 
 
 # ==============================
 # TAB 2: PERFIL DEL TERRENO
 # ==============================
-with tab_terrain:
+with tab_terrain, PERFILADOR.etapa('pestaña_perfil'):
     st.markdown("### Perfil Topográfico")
     st.caption("Elevación del terreno y segmentación por tramos. Colores indican la función del tramo (Bombeo, Gravedad, Plano).")
     
-    fig_terreno = crear_perfil_terreno_con_tramos(resultados)
-    st.plotly_chart(fig_terreno, use_container_width=True)
+    if pestaña_visible(tab_terrain):
+        fig_terreno = vista_perfil_terreno(entradas, resultados)
+        st.plotly_chart(fig_terreno, use_container_width=True)
     
     # Tabla resumen de tramos
     st.subheader("Resumen de Tramos")
@@ -845,22 +966,20 @@ with tab_terrain:
     """, unsafe_allow_html=True)
     
     definiciones = obtener_definicion_tramos()
-    tabla_tramos = []
-    for i in range(1, 9):
-        d = definiciones[i]
-        r = resultados[i]
-        tabla_tramos.append({
-            'Tramo': i,
-            'Distancia (m)': d['distancia'],
-            'Altura (m)': d['altura'],
-            'Pendiente (°)': d['pendiente'],
-            'L. Tubería (m)': d['longitud_tuberia'],
-            'Tipo': d['tipo'].replace('_', ' ').title(),
-            'Potencia (kW)': r['potencia_kw'],
-        })
+    tabla_tramos = resultados.to_dataframe()[
+        ['distancia', 'altura', 'pendiente', 'longitud_tuberia', 'tipo', 'potencia_kw']
+    ].rename(columns={
+        'distancia': 'Distancia (m)',
+        'altura': 'Altura (m)',
+        'pendiente': 'Pendiente (°)',
+        'longitud_tuberia': 'L. Tubería (m)',
+        'tipo': 'Tipo',
+        'potencia_kw': 'Potencia por estación (kW)',
+    }).rename_axis('Tramo').reset_index()
+    tabla_tramos['Tipo'] = tabla_tramos['Tipo'].str.replace('_', ' ').str.title()
     
     st.dataframe(
-        pd.DataFrame(tabla_tramos),
+        tabla_tramos,
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -869,8 +988,8 @@ with tab_terrain:
             "Altura (m)": st.column_config.NumberColumn(format="%d m"),
             "Pendiente (°)": st.column_config.NumberColumn(format="%.1f°"),
             "L. Tubería (m)": st.column_config.NumberColumn(format="%.1f m"),
-            "Potencia (kW)": st.column_config.ProgressColumn(
-                format="%.2f kW", min_value=0, max_value=max(t['Potencia (kW)'] for t in tabla_tramos),
+            "Potencia por estación (kW)": st.column_config.ProgressColumn(
+                format="%.2f kW", min_value=0, max_value=float(tabla_tramos['Potencia por estación (kW)'].max()),
             ),
         }
     )
@@ -879,19 +998,206 @@ with tab_terrain:
 # ==============================
 # TAB 3: ANÁLISIS DE PÉRDIDAS
 # ==============================
-with tab_loss:
+with tab_loss, PERFILADOR.etapa('pestaña_perdidas'):
     st.markdown("### Análisis de Eficiencia y Pérdidas")
     
     col_left, col_right = st.columns(2)
     with col_left:
         st.subheader("Desglose de Pérdidas")
-        fig_perdidas = crear_desglose_perdidas(resultados)
-        st.plotly_chart(fig_perdidas, use_container_width=True)
+        if pestaña_visible(tab_loss):
+            fig_perdidas = vista_desglose_perdidas(entradas, resultados)
+            st.plotly_chart(fig_perdidas, use_container_width=True)
     
     with col_right:
         st.subheader("Consumo de Potencia")
-        fig_potencia = crear_grafico_potencia(resultados)
-        st.plotly_chart(fig_potencia, use_container_width=True)
+        if pestaña_visible(tab_loss):
+            fig_potencia = vista_grafico_potencia(entradas, resultados)
+            st.plotly_chart(fig_potencia, use_container_width=True)
+    
+    # Sensibilidad global (Sobol)
+    st.subheader("Sensibilidad Global (Índices de Sobol)")
+    st.caption(
+        "Fracción de la varianza de la salida atribuible a cada entrada (S1: efecto "
+        "directo; ST: incluye interacciones), variando Q ±10 %, D ±2 %, ε ×0.5–3, "
+        "ρ ±0.5 %, μ −20/+25 % y el K_total de cada tramo ±30 %."
+    )
+    col_s1, col_s2 = st.columns([1, 2])
+    with col_s1:
+        salida_sobol = st.selectbox(
+            "Salida",
+            ['potencia_total_kw'] + [f'carga_estacion_T{t}' for t in range(1, 9)],
+            key="sobol_salida",
+        )
+        if st.button("📊 Calcular índices de Sobol", key="sobol_btn"):
+            st.session_state.sobol = indices_sobol(
+                n_base=4096, Q=st.session_state.Q, D=st.session_state.D,
+                rho=st.session_state.rho, mu=st.session_state.mu,
+                epsilon=st.session_state.epsilon, semilla=0,
+            )
+    # Solo los índices (salidas × variables) quedan en la sesión, no las muestras
+    sobol = st.session_state.get("sobol")
+    if sobol is not None and pestaña_visible(tab_loss):
+        with col_s1:
+            st.dataframe(
+                sobol[sobol['salida'] == salida_sobol][['variable', 'S1', 'ST']],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "S1": st.column_config.NumberColumn(format="%.4f"),
+                    "ST": st.column_config.NumberColumn(format="%.4f"),
+                },
+            )
+        with col_s2:
+            st.plotly_chart(crear_grafico_sobol(sobol, salida_sobol), use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Recomendación de estaciones de bombeo
+    st.subheader("Recomendación de Estaciones de Bombeo")
+    st.caption(
+        "Busca el número de estaciones por tramo con bomba que minimiza la potencia total "
+        "o el costo de ciclo de vida, respetando la presión máxima de descarga (1.6 MPa)."
+    )
+    col_opt1, col_opt2 = st.columns([1, 2])
+    with col_opt1:
+        objetivo_opt = st.radio(
+            "Criterio", ["potencia", "costo"],
+            format_func=lambda x: "Potencia total mínima" if x == "potencia" else "Costo de ciclo de vida mínimo",
+            key="objetivo_estaciones",
+        )
+        recomendar = st.button("⚙️ Recomendar estaciones", use_container_width=True)
+    with col_opt2:
+        if recomendar:
+            try:
+                st.session_state.recomendacion_estaciones = (entradas, optimizar_estaciones(
+                    Q=st.session_state.Q, D=st.session_state.D,
+                    rho=st.session_state.rho, mu=st.session_state.mu,
+                    epsilon=st.session_state.epsilon, objetivo=objetivo_opt,
+                ))
+            except ValueError as e:
+                st.session_state.recomendacion_estaciones = None
+                st.warning(str(e))
+        rec = resultado_vigente("recomendacion_estaciones")
+        if rec:
+            st.dataframe(
+                pd.DataFrame({
+                    "Tramo": list(rec['num_estaciones']),
+                    "Estaciones actuales": [resultados[t]['num_estaciones'] for t in rec['num_estaciones']],
+                    "Estaciones recomendadas": list(rec['num_estaciones'].values()),
+                }),
+                use_container_width=True,
+                hide_index=True,
+            )
+            m1, m2, m3 = st.columns(3)
+            m1.metric(
+                "Potencia instalada", f"{rec['potencia_total_kw']:.1f} kW",
+                help=AYUDA_POTENCIA_INSTALADA,
+            )
+            m2.metric("Costo ciclo de vida", f"${rec['costo_ciclo_vida']:,.0f}")
+            m3.metric("Presión máx. descarga", f"{rec['presion_max_mpa']:.2f} MPa")
+    
+    st.markdown("---")
+    
+    # Diámetro económico
+    st.subheader("Diámetro Económico")
+    st.caption(
+        "Barre los diámetros comerciales (acero cédula 40) al caudal actual y compara el "
+        "costo de capital anualizado (tubería + bombas) con el costo anual de energía."
+    )
+    if st.button("📐 Optimizar diámetro", key="optimizar_diametro_btn"):
+        st.session_state.barrido_diametro = (entradas, optimizar_diametro(
+            Q=st.session_state.Q, rho=st.session_state.rho,
+            mu=st.session_state.mu, epsilon=st.session_state.epsilon,
+        ))
+    barrido = resultado_vigente("barrido_diametro")
+    if barrido is not None and pestaña_visible(tab_loss):
+        col_d1, col_d2 = st.columns([2, 1])
+        with col_d1:
+            st.plotly_chart(crear_grafico_pareto_diametro(barrido), use_container_width=True)
+        with col_d2:
+            optimo = barrido[barrido['optimo']]
+            if not optimo.empty:
+                st.metric(
+                    "Diámetro recomendado", f"{optimo['D'].iloc[0]*1000:.1f} mm",
+                    f"{optimo['velocidad'].iloc[0]:.2f} m/s",
+                )
+                st.metric("Costo total anual", f"${optimo['costo_total_anual'].iloc[0]:,.0f}")
+            st.dataframe(
+                barrido[['D', 'velocidad', 'potencia_total_kw', 'costo_total_anual', 'pareto']],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "D": st.column_config.NumberColumn("D (m)", format="%.4f"),
+                    "velocidad": st.column_config.NumberColumn("v (m/s)", format="%.2f"),
+                    "potencia_total_kw": st.column_config.NumberColumn("P (kW)", format="%.1f"),
+                    "costo_total_anual": st.column_config.NumberColumn("USD/año", format="%.0f"),
+                },
+            )
+    
+    st.markdown("---")
+    
+    # Incertidumbre (Monte Carlo)
+    st.subheader("Incertidumbre de la Potencia (Monte Carlo)")
+    st.caption(
+        "Muestrea Q (±5 %), ρ, μ (±15 %), ε (lognormal, σ = 0.5) y los K de cada accesorio "
+        "alrededor de los valores actuales, y evalúa los 8 tramos por lotes vectorizados. "
+        "Use el P95 para dimensionar motores."
+    )
+    col_mc1, col_mc2 = st.columns([1, 1])
+    with col_mc1:
+        n_muestras = st.select_slider(
+            "Número de muestras",
+            options=[10_000, 100_000, 1_000_000],
+            value=100_000,
+            format_func=lambda n: f"{n:,}",
+            key="mc_muestras",
+        )
+    with col_mc2:
+        incertidumbre_K = st.slider(
+            "Incertidumbre de K (σ log)", 0.0, 0.5, 0.2, 0.05, key="mc_incertidumbre_K"
+        )
+    if st.button("🎲 Ejecutar Monte Carlo", key="monte_carlo_btn"):
+        mc = monte_carlo_potencia(
+            n_muestras=n_muestras, Q=st.session_state.Q, D=st.session_state.D,
+            rho=st.session_state.rho, mu=st.session_state.mu,
+            epsilon=st.session_state.epsilon, incertidumbre_K=incertidumbre_K,
+            semilla=0,
+        )
+        # En la sesión solo el resumen (percentiles, histograma, índices):
+        # las muestras llegan a 1M de filas
+        st.session_state.monte_carlo = {k: v for k, v in mc.items() if k != 'muestras'}
+    mc = st.session_state.get("monte_carlo")
+    if mc is not None and pestaña_visible(tab_loss):
+        tabla = mc['percentiles']
+        col_h1, col_h2 = st.columns([2, 1])
+        with col_h1:
+            st.plotly_chart(
+                crear_histograma_potencia(mc['histograma'], tabla['potencia_total_kw'].to_dict()),
+                use_container_width=True,
+            )
+        with col_h2:
+            if 95 in tabla.index:
+                st.metric(
+                    "Potencia instalada P95", f"{tabla.loc[95, 'potencia_total_kw']:.1f} kW",
+                    f"media {mc['media']:.1f} kW", delta_color="off",
+                    help=AYUDA_POTENCIA_INSTALADA,
+                )
+            st.dataframe(
+                mc['sensibilidad'][['src2', 'spearman']],
+                use_container_width=True,
+                column_config={
+                    "src2": st.column_config.NumberColumn("SRC²", format="%.4f"),
+                    "spearman": st.column_config.NumberColumn("Spearman", format="%.3f"),
+                },
+            )
+        st.dataframe(
+            tabla.T.rename(columns=lambda p: f"P{p}"),
+            use_container_width=True,
+            column_config={
+                f"P{p}": st.column_config.NumberColumn(f"P{p} (kW)", format="%.2f")
+                for p in tabla.index
+            },
+        )
     
     st.markdown("---")
     
@@ -922,7 +1228,7 @@ with tab_loss:
 # ==============================
 # TAB 4: MODELO 3D
 # ==============================
-with tab_3d:
+with tab_3d, PERFILADOR.etapa('pestaña_3d'):
     st.markdown(f"### Visualización 3D: Tramo {tramo_3d}")
     
     defn_3d = definiciones[tramo_3d]
@@ -936,8 +1242,9 @@ with tab_3d:
     kpi4.metric("Potencia", f"{r_3d['potencia_kw']:.2f} kW")
 
     # Render 3D
-    html_3d = generar_modelo_tramo(tramo_3d, resultados)
-    components.html(html_3d, height=720, scrolling=False)
+    if pestaña_visible(tab_3d):
+        html_3d = vista_modelo_3d(entradas, tramo_3d, resultados)
+        components.html(html_3d, height=720, scrolling=False)
     
     st.caption(
         "**Leyenda Visual:** El gradiente de color (Azul → Rojo) indica la caída de presión a lo largo del tramo. "
@@ -951,30 +1258,31 @@ with tab_3d:
 # ==============================
 # TAB 5: DATOS DETALLADOS
 # ==============================
-with tab_data:
+with tab_data, PERFILADOR.etapa('pestaña_datos'):
     st.markdown("### Tablas de Datos y Fórmulas")
     
-    datos = extraer_datos_completos()
-    
     with st.expander("📐 Perfil del Terreno (Raw Data)", expanded=False):
-        st.dataframe(datos['perfil_terreno'], use_container_width=True)
+        if pestaña_visible(tab_data):
+            # extraer_datos_completos ya memoiza por mtime/tamaño y SHA-256 del CSV
+            with PERFILADOR.etapa('extraer_datos'):
+                datos = extraer_datos_completos()
+            st.dataframe(datos['perfil_terreno'], use_container_width=True)
 
     with st.expander("📋 Tabla General de Resultados", expanded=True):
-        tabla_completa = []
-        for i in range(1, 9):
-            r = resultados[i]
-            tabla_completa.append({
-                "Tramo": i,
-                "Velocidad (m/s)": r['velocidad'],
-                "Reynolds": r['reynolds'],
-                "f (Colebrook)": r['f_colebrook'],
-                "hf (m)": r['perdidas_friccion_colebrook'],
-                "hm (m)": r['perdidas_menores'],
-                "H Total (m)": r['carga_total']
-            })
+        tabla_completa = resultados.to_dataframe()[[
+            'velocidad', 'reynolds', 'f_colebrook',
+            'perdidas_friccion_colebrook', 'perdidas_menores', 'carga_total',
+        ]].rename(columns={
+            'velocidad': "Velocidad (m/s)",
+            'reynolds': "Reynolds",
+            'f_colebrook': "f (Colebrook)",
+            'perdidas_friccion_colebrook': "hf (m)",
+            'perdidas_menores': "hm (m)",
+            'carga_total': "H Total (m)",
+        }).rename_axis("Tramo").reset_index()
         
         st.dataframe(
-            pd.DataFrame(tabla_completa),
+            tabla_completa,
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -988,6 +1296,20 @@ with tab_data:
             }
         )
 
+    with st.expander("⏱️ Costo del último recálculo", expanded=False):
+        st.caption(
+            "Nodos del grafo de cálculo recalculados por el último cambio de "
+            "parámetros; el resto se reutilizó del cálculo anterior."
+        )
+        st.dataframe(
+            grafo.tiempos(),
+            use_container_width=True,
+            column_config={
+                "ultimo_ms": st.column_config.NumberColumn("Último (ms)", format="%.3f"),
+                "total_ms": st.column_config.NumberColumn("Total (ms)", format="%.3f"),
+            },
+        )
+
     st.markdown("#### Fórmulas Utilizadas")
     fc1, fc2 = st.columns(2)
     with fc1:
@@ -997,6 +1319,22 @@ with tab_data:
         st.latex(r"h_f = f \cdot \frac{L}{D} \cdot \frac{v^2}{2g}")
         st.latex(r"P = \rho \cdot g \cdot Q \cdot H")
 
+    with st.expander("📈 Diagrama de Moody", expanded=False):
+        tabla_moody = cargar_tabla()
+        st.caption(
+            f"Curvas interpoladas de la tabla precalculada `source/moody_tabla.npy` "
+            f"({tabla_moody.valores.shape[0]}×{tabla_moody.valores.shape[1]} nodos, "
+            f"error relativo máximo {tabla_moody.error_rel_max:.1e} frente a Colebrook)."
+        )
+        if pestaña_visible(tab_data):
+            st.plotly_chart(
+                crear_diagrama_moody(
+                    curvas_moody(),
+                    punto=(Re, f_col, st.session_state.epsilon / st.session_state.D),
+                ),
+                use_container_width=True,
+            )
+
 
 # ==============================
 # VISOR DE DOCUMENTOS
@@ -1055,7 +1393,7 @@ if "preview_file" in st.session_state and st.session_state.preview_file:
 # ==============================
 # TAB 6: DOCUMENTACIÓN
 # ==============================
-with tab_docs:
+with tab_docs, PERFILADOR.etapa('pestaña_documentacion'):
     st.markdown("### Documentación del Proyecto")
     
     col_d1, col_d2 = st.columns([2, 1])
@@ -1089,6 +1427,51 @@ with tab_docs:
                 st.rerun()
 
 
+# ==============================
+# TAB OCULTA: DIAGNÓSTICO
+# ==============================
+if tab_diag:
+    with tab_diag[0]:
+        st.markdown("### Tiempo por etapa de cada rerun")
+        st.caption(
+            "Percentiles de los últimos reruns de todas las sesiones del proceso "
+            "(el rerun actual se agrega al terminar). 'fraccion' es la parte del "
+            "rerun completo que ocupa cada etapa (p50)."
+        )
+        if TABS_CON_ESTADO:
+            # Con key, el cambio ya aplica a las pestañas del rerun que provoca
+            st.toggle(
+                "Renderizado diferido: solo la pestaña abierta construye sus figuras",
+                key="render_diferido",
+            )
+        memoria = st.toggle(
+            "Registrar memoria por etapa (tracemalloc, agrega costo)",
+            value=PERFILADOR.memoria,
+        )
+        if memoria != PERFILADOR.memoria:
+            PERFILADOR.configurar(memoria=memoria)
+
+        perfil = PERFILADOR.percentiles()
+        st.metric("Reruns registrados", PERFILADOR.reruns)
+        if perfil.empty:
+            st.info("Aún no hay reruns completos: interactúe con la app y vuelva a esta pestaña.")
+        else:
+            st.dataframe(perfil.style.format(precision=2), use_container_width=True)
+            st.bar_chart(perfil.drop(index="rerun", errors="ignore")["p50_ms"])
+
+        col_json, col_prom, col_limpiar = st.columns(3)
+        with col_json:
+            st.download_button("⬇️ JSON", PERFILADOR.a_json(), file_name="perfil.json",
+                               mime="application/json", use_container_width=True)
+        with col_prom:
+            st.download_button("⬇️ Prometheus", PERFILADOR.a_prometheus(), file_name="perfil.prom",
+                               mime="text/plain", use_container_width=True)
+        with col_limpiar:
+            st.button("↺ Reiniciar registros", on_click=PERFILADOR.limpiar, use_container_width=True)
+        if PERFILADOR.directorio is not None:
+            st.caption(f"Exportando también a `{PERFILADOR.directorio}` (perfil.json, perfil.prom).")
+
+
 # ====================================
 # FOOTER
 # ====================================
@@ -1106,3 +1489,5 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+PERFILADOR.terminar_rerun()
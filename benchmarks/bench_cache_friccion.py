@@ -0,0 +1,63 @@
+"""
+bench_cache_friccion.py — Costo de la caché de factores de fricción.
+
+Compara, por llamada escalar, la ruta con caché (aciertos), la ruta sin
+caché (Newton-Raphson en cada llamada) y la ruta de referencia con
+`scipy.optimize.fsolve`. También mide un recálculo completo del sistema
+(8 tramos) con la caché caliente y fría.
+
+Uso:
+    python benchmarks/bench_cache_friccion.py [--llamadas 20000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.hidraulica import (
+    CACHE_FRICCION, _colebrook_vectorizado, _f_colebrook_fsolve,
+    calcular_sistema_completo, f_colebrook,
+)
+
+
+def _medir(funcion, n: int) -> float:
+    """Tiempo medio por llamada (µs)."""
+    t0 = time.perf_counter()
+    for _ in range(n):
+        funcion()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--llamadas', type=int, default=20_000)
+    args = parser.parse_args()
+    n = args.llamadas
+
+    Re, epsilon, D = 2.06e5, 0.000046, 0.1541
+    CACHE_FRICCION.limpiar()
+    f_colebrook(Re, epsilon, D)
+
+    t_cache = _medir(lambda: f_colebrook(Re, epsilon, D), n)
+    t_newton = _medir(lambda: float(_colebrook_vectorizado(Re, epsilon / D)), n)
+    t_fsolve = _medir(lambda: _f_colebrook_fsolve(Re, epsilon, D), n // 10)
+
+    print(f'Caché (acierto)       : {t_cache:8.2f} µs/llamada')
+    print(f'Newton sin caché      : {t_newton:8.2f} µs/llamada ({t_newton / t_cache:.0f}×)')
+    print(f'fsolve (referencia)   : {t_fsolve:8.2f} µs/llamada ({t_fsolve / t_cache:.0f}×)')
+
+    def sistema_frio():
+        CACHE_FRICCION.limpiar()
+        calcular_sistema_completo()
+
+    t_frio = _medir(sistema_frio, n // 100)
+    t_caliente = _medir(calcular_sistema_completo, n // 100)
+    print(f'Sistema, caché fría   : {t_frio:8.1f} µs')
+    print(f'Sistema, caché caliente: {t_caliente:7.1f} µs')
+    print(f'Estadísticas          : {CACHE_FRICCION.estadisticas()}')
+
+
+if __name__ == '__main__':
+    main()
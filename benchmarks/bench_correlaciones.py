@@ -0,0 +1,43 @@
+"""
+bench_correlaciones.py — Precisión vs. velocidad de las correlaciones de fricción.
+
+Ejecuta `comparar_correlaciones` sobre una malla densa Re × ε/D y
+muestra, para cada método, el error relativo frente a Colebrook y el
+costo por evaluación, junto con el método elegido para varias
+tolerancias.
+
+Uso:
+    python benchmarks/bench_correlaciones.py [--n-re 500] [--n-rugosidad 200]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.hidraulica import comparar_correlaciones, elegir_metodo_friccion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n-re', type=int, default=500)
+    parser.add_argument('--n-rugosidad', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    tabla = comparar_correlaciones(
+        n_re=args.n_re, n_rugosidad=args.n_rugosidad, repeticiones=args.repeticiones,
+    )
+    print(f'Malla: {args.n_re} Re × {args.n_rugosidad} ε/D = {args.n_re * args.n_rugosidad:,} puntos')
+    print(tabla.to_string(formatters={
+        'error_rel_max': '{:.2e}'.format,
+        'error_rel_medio': '{:.2e}'.format,
+        'ns_por_evaluacion': '{:.1f}'.format,
+    }))
+    print()
+    for tolerancia in (5e-2, 1e-3, 1e-6, 1e-10):
+        print(f'Tolerancia {tolerancia:.0e} → {elegir_metodo_friccion(tolerancia, tabla)}')
+
+
+if __name__ == '__main__':
+    main()
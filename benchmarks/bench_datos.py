@@ -0,0 +1,158 @@
+"""
+bench_datos.py — Parseo del CSV frente a las cachés de core.datos.
+
+Mide `extraer_datos_completos` en tres situaciones: parseo completo (sin
+cachés), proceso nuevo con el .cache.npz en disco (la cuadrícula numérica
+se carga en vez de parsearse) y llamada repetida (caché en memoria).
+Verifica que los tres den el mismo resultado y que modificar el CSV
+invalide las cachés.
+
+También amplía la hoja con N tramos más (copias del tramo 7 a la derecha
+y filas nuevas en el resumen, que desplazan todas las secciones de abajo)
+y verifica que el extractor por esquema encuentre todos los tramos con
+los mismos datos que la hoja original.
+
+Uso:
+    python benchmarks/bench_datos.py [--repeticiones 200] [--tramos 50]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from core import datos
+
+
+def _iguales(a, b) -> bool:
+    """Comparación profunda de los resultados (DataFrames, dicts y escalares)."""
+    if isinstance(a, pd.DataFrame):
+        return a.equals(b)
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_iguales(a[k], b[k]) for k in a)
+    return a == b or (isinstance(a, float) and np.isnan(a) and np.isnan(b))
+
+
+def ampliar_csv(origen: Path, destino: Path, extra: int) -> None:
+    """
+    Escribe una copia del CSV con `extra` tramos más, copias del tramo 7
+    numeradas desde 9: bloques de detalle agregados a la derecha y filas
+    agregadas al final del resumen.
+    """
+    tabla = datos.leer_tabla(origen)
+    secciones = datos.localizar_secciones(tabla)
+    ancho = tabla.numeros.shape[1]
+    filas = [list(fila) for fila in tabla.filas]
+
+    bloque = secciones.tramos[7]
+    for r in range(bloque.fila_inicio - 1, bloque.fila_fin):
+        celdas = filas[r][bloque.col_inicio:bloque.col_fin]
+        celdas += [''] * (5 - len(celdas))
+        filas[r] += [''] * (ancho - len(filas[r]))
+        for k in range(extra):
+            filas[r] += [f'TRAMO {9 + k}', *celdas[1:]] if r == bloque.fila_inicio - 1 else celdas
+
+    i, j = secciones.resumen
+    resumen = range(i + 1, i + 1 + len(datos.extraer_resumen_tramos(tabla, secciones)))
+    fila_7 = next(filas[r] for r in resumen if tabla.numeros[r, j] == 7)
+    filas[resumen.stop:resumen.stop] = [[str(9 + k), *fila_7[j + 1:]] for k in range(extra)]
+    destino.write_text(''.join(';'.join(fila) + '\n' for fila in filas), encoding='utf-8')
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - t0) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeticiones', type=int, default=200)
+    parser.add_argument('--tramos', type=int, default=50, help='tramos a agregar en la hoja ampliada')
+    args = parser.parse_args()
+    n = args.repeticiones
+    fallas = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        csv = Path(carpeta) / datos.RUTA_CSV.name
+        shutil.copy(datos.RUTA_CSV, csv)
+        cache = datos.ruta_cache(csv)
+
+        def parseo():
+            datos.limpiar_cache()
+            cache.unlink(missing_ok=True)
+            return datos.extraer_datos_completos(csv)
+
+        def desde_cache():
+            datos.limpiar_cache()
+            return datos.extraer_datos_completos(csv)
+
+        t_parseo = _medir(parseo, n)
+        referencia = parseo()
+        t_tabla_parseo = _medir(lambda: (datos.limpiar_cache(), cache.unlink(missing_ok=True),
+                                         datos.leer_tabla(csv)), n)
+        t_tabla_cache = _medir(lambda: (datos.limpiar_cache(), datos.leer_tabla(csv)), n)
+        t_cache = _medir(desde_cache, n)
+        en_disco = desde_cache()
+        t_memoria = _medir(lambda: datos.extraer_datos_completos(csv), n * 50)
+
+        print(f'CSV de {csv.stat().st_size / 1024:.1f} KB, .cache.npz de {cache.stat().st_size / 1024:.1f} KB')
+        print(f'{"":<34}{"leer_tabla":>14}{"extraer_datos":>16}')
+        print(f'{"parseo completo":<34}{t_tabla_parseo * 1e6:11.0f} µs{t_parseo * 1e6:13.0f} µs')
+        print(f'{"proceso nuevo con .cache.npz":<34}{t_tabla_cache * 1e6:11.0f} µs{t_cache * 1e6:13.0f} µs')
+        print(f'{"llamada repetida (memoria)":<34}{"":>14}{t_memoria * 1e6:13.1f} µs')
+        print(f'parseo de celdas evitado: {t_tabla_parseo / t_tabla_cache:.1f}×; '
+              f'llamada repetida: {t_parseo / t_memoria:,.0f}×')
+
+        if not (_iguales(referencia, en_disco) and _iguales(referencia, datos.extraer_datos_completos(csv))):
+            fallas.append('resultados')
+
+        # Hoja ampliada: más tramos y todas las secciones desplazadas
+        ampliado = Path(carpeta) / 'ampliado.csv'
+        ampliar_csv(csv, ampliado, args.tramos)
+        t_original = _medir(lambda: datos._extraer(datos.leer_tabla(csv)), max(1, n // 10))
+        t_ampliado = _medir(lambda: datos._extraer(datos.leer_tabla(ampliado)), max(1, n // 10))
+        grande = datos.extraer_datos_completos(ampliado)
+        tramos = grande['tramos_detalle']
+        correcto = (
+            list(tramos) == list(range(1, 9 + args.tramos))
+            and all(_iguales(tramos[t], referencia['tramos_detalle'][t]) for t in range(1, 9))
+            and all(_iguales(tramos[t], referencia['tramos_detalle'][7]) for t in range(9, 9 + args.tramos))
+            and len(grande['resumen_tramos']) == 7 + args.tramos
+            and grande['resumen_tramos'].iloc[:7].equals(referencia['resumen_tramos'])
+            and all(_iguales(grande[k], referencia[k])
+                    for k in ('perfil_terreno', 'parametros', 'tramo_8_distancias'))
+        )
+        print(f'\nHoja ampliada a {len(tramos)} tramos: extracción {t_ampliado * 1e3:.1f} ms '
+              f'(original, 8 tramos: {t_original * 1e3:.1f} ms); datos iguales: {correcto}')
+        if not correcto:
+            fallas.append('hoja ampliada')
+
+        # Invalidación: cambiar la escala (fila 15) debe verse sin limpiar nada
+        lineas = csv.read_text(encoding='utf-8').splitlines(keepends=True)
+        campos = lineas[15].split(';')
+        campos[1] = '999'
+        lineas[15] = ';'.join(campos)
+        csv.write_text(''.join(lineas), encoding='utf-8')
+        escala = datos.extraer_datos_completos(csv)['parametros']['escala']
+        huella = datos.leer_tabla(csv).huella
+        with np.load(cache) as npz:
+            huella_cache = str(npz['huella'])
+        print(f'\nCSV modificado: escala = {escala:g}, .cache.npz regenerado: {huella_cache == huella}')
+        if escala != 999 or huella_cache != huella:
+            fallas.append('invalidación')
+
+    datos.limpiar_cache()
+    if fallas:
+        raise SystemExit(f'ERROR: verificaciones fallidas: {", ".join(fallas)}')
+
+
+if __name__ == '__main__':
+    main()
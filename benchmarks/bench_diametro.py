@@ -0,0 +1,58 @@
+"""
+bench_diametro.py — Tiempo del barrido de diámetro económico.
+
+Evalúa una malla de 500 diámetros × 200 caudales con `optimizar_diametro`
+(un solo lote vectorizado) y reporta el tiempo total y por punto.
+Verifica que el frente de Pareto contenga solo diseños factibles.
+
+Uso:
+    python benchmarks/bench_diametro.py [--n-diametros 500] [--n-caudales 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.optimizacion import optimizar_diametro
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n-diametros', type=int, default=500)
+    parser.add_argument('--n-caudales', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    diametros = np.linspace(0.05, 0.60, args.n_diametros)
+    caudales = np.linspace(0.005, 0.100, args.n_caudales)
+
+    tiempos = []
+    for _ in range(args.repeticiones):
+        t0 = time.perf_counter()
+        df = optimizar_diametro(Q=caudales, diametros=diametros)
+        tiempos.append(time.perf_counter() - t0)
+
+    t = min(tiempos)
+    n = len(df)
+    print(f'Malla                : {args.n_diametros} D × {args.n_caudales} Q = {n:,} puntos')
+    print(f'Tiempo (mejor de {args.repeticiones}) : {t:.3f} s ({t / n * 1e6:.2f} µs/punto)')
+    print(f'Puntos factibles     : {int(df["factible"].sum()):,}')
+    print(f'Puntos en Pareto     : {int(df["pareto"].sum()):,}')
+
+    optimos = df[df['optimo']]
+    for q in caudales[[0, len(caudales) // 2, -1]]:
+        fila = optimos[np.isclose(optimos['Q'], q)]
+        if not fila.empty:
+            print(f'  Q = {q * 1000:6.1f} L/s → D óptimo = {fila["D"].iloc[0] * 1000:6.1f} mm')
+
+    no_factibles = int((df['pareto'] & ~df['factible']).sum())
+    if no_factibles:
+        raise SystemExit(f'ERROR: {no_factibles:,} puntos del frente de Pareto exceden la presión máxima')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+bench_epanet.py — Importación y exportación de modelos EPANET (.inp).
+
+Exporta la cadena de 8 tramos, la vuelve a leer y verifica que tanto la
+red leída como las definiciones reconstruidas reproduzcan la potencia de
+`calcular_sistema_completo`. Luego escribe y lee una malla de ~10 000
+enlaces (Hazen-Williams, unidades GPM) y compara su solución con la de
+la red original, midiendo tiempos y memoria de la lectura.
+
+Uso:
+    python benchmarks/bench_epanet.py [--lado 71]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from core.epanet import definiciones_desde_red, escribir_inp, leer_inp
+from core.hidraulica import calcular_sistema_completo
+from core.red import calcular_sistema_red, construir_red, red_desde_tramos, resolver_red
+
+
+def _malla(lado: int, semilla: int = 0):
+    """Malla lado × lado de Hazen-Williams alimentada por dos tanques."""
+    rng = np.random.default_rng(semilla)
+    nombre = lambda i, j: f'N{i}_{j}'
+    nodos = [{'nombre': 'R1', 'elevacion': 90.0, 'tipo': 'tanque'},
+             {'nombre': 'R2', 'elevacion': 85.0, 'tipo': 'tanque'}]
+    enlaces = [
+        {'nombre': 'A1', 'desde': 'R1', 'hasta': nombre(0, 0), 'tipo': 'tuberia',
+         'longitud': 100.0, 'diametro': 0.6, 'hazen': 130.0},
+        {'nombre': 'A2', 'desde': 'R2', 'hasta': nombre(lado - 1, lado - 1), 'tipo': 'tuberia',
+         'longitud': 100.0, 'diametro': 0.6, 'hazen': 130.0},
+    ]
+    for i in range(lado):
+        for j in range(lado):
+            nodos.append({'nombre': nombre(i, j), 'elevacion': float(rng.uniform(0, 20)),
+                          'demanda': float(rng.uniform(0.5, 1.5) * 1e-4)})
+            for di, dj in ((0, 1), (1, 0)):
+                if i + di < lado and j + dj < lado:
+                    enlaces.append({
+                        'nombre': f'P{i}_{j}_{di}{dj}', 'desde': nombre(i, j),
+                        'hasta': nombre(i + di, j + dj), 'tipo': 'tuberia',
+                        'longitud': float(rng.uniform(50, 150)),
+                        'diametro': float(rng.choice([0.1, 0.15, 0.2])),
+                        'hazen': float(rng.choice([100.0, 120.0, 140.0])),
+                    })
+    return construir_red(nodos, enlaces)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lado', type=int, default=71, help='uniones por lado (71 → ~10 000 enlaces)')
+    args = parser.parse_args()
+    fallas = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = Path(carpeta) / 'cadena.inp'
+        escribir_inp(red_desde_tramos(), ruta)
+        leida, opciones = leer_inp(ruta)
+
+        referencia = calcular_sistema_completo().columna('potencia_kw')
+        enlaces = resolver_red(leida, rho=opciones['rho'], mu=opciones['mu'])['enlaces']
+        tramos = calcular_sistema_completo().tramos
+        bombas = enlaces[enlaces['tipo'] == 'bomba']
+        potencia_red = bombas.groupby('tramo')['potencia_kw'].mean().reindex(tramos, fill_value=0.0).to_numpy()
+        potencia_def = calcular_sistema_red(definiciones=definiciones_desde_red(leida))['potencia_kw'].to_numpy()
+        error_red = np.max(np.abs(potencia_red - referencia))
+        error_def = np.max(np.abs(potencia_def - referencia))
+        print('Cadena de 8 tramos exportada y leída:')
+        print(f'  red leída (curvas de 1 punto)   : error máximo {error_red:.1e} kW')
+        print(f'  definiciones reconstruidas      : error máximo {error_def:.1e} kW')
+        if error_red > 1e-6 or error_def > 1e-9:
+            fallas.append('cadena')
+
+        red = _malla(args.lado)
+        ruta = Path(carpeta) / 'malla.inp'
+        t0 = time.perf_counter()
+        escribir_inp(red, ruta, unidades='GPM')
+        t_escribir = time.perf_counter() - t0
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        leida, opciones = leer_inp(ruta)
+        t_leer = time.perf_counter() - t0
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        tamano = ruta.stat().st_size
+
+        t0 = time.perf_counter()
+        sol = resolver_red(leida, rho=opciones['rho'], mu=opciones['mu'])
+        t_resolver = time.perf_counter() - t0
+        original = resolver_red(red)
+        # El archivo agrupa uniones y tanques: se compara por nombre de nodo
+        carga = pd.Series(sol['nodos']['carga'].to_numpy(), index=leida.nodo_nombre)
+        carga_original = pd.Series(original['nodos']['carga'].to_numpy(), index=red.nodo_nombre)
+        error_carga = np.max(np.abs(carga.reindex(red.nodo_nombre).to_numpy() - carga_original.to_numpy()))
+
+    print(f'\nMalla {args.lado}×{args.lado}: {red.n_nodos:,} nodos, {red.n_enlaces:,} enlaces '
+          f'({tamano / 1e6:.1f} MB en GPM)')
+    print(f'  escritura     : {t_escribir * 1e3:7.0f} ms')
+    print(f'  lectura       : {t_leer * 1e3:7.0f} ms (pico de memoria {pico / 1e6:.1f} MB)')
+    print(f'  solución      : {t_resolver * 1e3:7.0f} ms ({sol["iteraciones"]} iteraciones)')
+    print(f'  diferencia de carga con la red original: {error_carga:.1e} m')
+    if error_carga > 1e-6:
+        fallas.append('malla')
+
+    if fallas:
+        raise SystemExit(f'ERROR: verificaciones fallidas: {", ".join(fallas)}')
+
+
+if __name__ == '__main__':
+    main()
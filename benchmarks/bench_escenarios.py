@@ -0,0 +1,124 @@
+"""
+bench_escenarios.py — Corrida masiva de escenarios con pool de procesos.
+
+Genera un archivo con miles de escenarios (parámetros aleatorios y
+reemplazos por tramo), los corre con `ejecutar_escenarios`, verifica una
+muestra contra `GrafoHidraulico` con las definiciones modificadas (o
+`calcular_sistema_completo` si no hay reemplazos), simula una
+interrupción borrando partes y comprueba que la reanudación calcule
+solo los escenarios faltantes.
+
+Uso:
+    python benchmarks/bench_escenarios.py [--n 20000] [--trabajadores 2] [--formato csv]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from core.escenarios import FORMATOS, ejecutar_escenarios, leer_resultados
+from core.grafo import GrafoHidraulico
+from core.hidraulica import calcular_sistema_completo
+from core.tramos import obtener_definicion_tramos
+
+
+def _escenarios(n: int, semilla: int = 0) -> pd.DataFrame:
+    """Escenarios aleatorios; un tercio cambia estaciones del tramo 3 y K del tramo 5."""
+    rng = np.random.default_rng(semilla)
+    tabla = pd.DataFrame({
+        'escenario': [f'E{i:06d}' for i in range(n)],
+        'Q': rng.uniform(0.005, 0.100, n),
+        'D': rng.uniform(0.05, 0.30, n),
+        'rho': rng.uniform(900.0, 1100.0, n),
+        'mu': rng.uniform(0.0005, 0.0020, n),
+        'epsilon': rng.uniform(0.00001, 0.001, n),
+        'metodo_friccion': rng.choice(['colebrook', 'haaland'], n),
+    })
+    cambia = rng.random(n) < 1 / 3
+    tabla['num_estaciones_T3'] = np.where(cambia, rng.integers(1, 5, n), np.nan)
+    tabla['K_total_T5'] = np.where(cambia, rng.uniform(5.0, 20.0, n), np.nan)
+    return tabla
+
+
+def _error_relativo(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.max(np.abs(a - b) / np.maximum(np.abs(b), 1e-12)))
+
+
+def _referencia(fila) -> np.ndarray:
+    """Potencia por tramo de un escenario con la ruta escalar."""
+    parametros = {k: fila[k] for k in ('Q', 'D', 'rho', 'mu', 'epsilon', 'metodo_friccion')}
+    if np.isnan(fila['num_estaciones_T3']):
+        return calcular_sistema_completo(**parametros).columna('potencia_kw')
+    definiciones = {t: dict(d) for t, d in obtener_definicion_tramos().items()}
+    definiciones[3]['num_estaciones'] = int(fila['num_estaciones_T3'])
+    definiciones[5]['K_total'] = fila['K_total_T5']
+    return GrafoHidraulico(**parametros, definiciones=definiciones).resultado().columna('potencia_kw')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=20_000, help='número de escenarios')
+    parser.add_argument('--trabajadores', type=int, default=2)
+    parser.add_argument('--bloque', type=int, default=1000)
+    parser.add_argument('--formato', choices=FORMATOS, default='csv')
+    args = parser.parse_args()
+    fallas = []
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = Path(carpeta) / 'escenarios.csv'
+        _escenarios(args.n).to_csv(ruta, index=False)
+        salida = Path(carpeta) / 'salida'
+
+        resumen = ejecutar_escenarios(ruta, salida, trabajadores=args.trabajadores,
+                                      tamano_bloque=args.bloque, formato=args.formato)
+        print(f"{resumen['calculados']:,} escenarios en {resumen['segundos']:.2f} s "
+              f"({resumen['calculados'] / resumen['segundos']:,.0f}/s, {args.trabajadores} trabajadores)")
+        print(resumen['trabajadores'].to_string(float_format=lambda x: f'{x:,.2f}'))
+
+        resultados = leer_resultados(salida, args.formato)
+        escenarios = pd.read_csv(ruta)
+        if len(resultados) != 8 * args.n:
+            fallas.append('filas')
+
+        # Muestra contra la ruta escalar
+        muestra = escenarios.sample(50, random_state=1)
+        potencia = resultados.set_index(['escenario', 'tramo'])['potencia_kw']
+        t0 = time.perf_counter()
+        error = max(
+            _error_relativo(potencia.loc[fila['escenario']].to_numpy(), _referencia(fila))
+            for _, fila in muestra.iterrows()
+        )
+        t_escalar = (time.perf_counter() - t0) / len(muestra)
+        print(f'\nMuestra de {len(muestra)} escenarios: error relativo máximo {error:.1e} '
+              f'(ruta escalar ≈ {1 / t_escalar:,.0f} escenarios/s)')
+        if error > 1e-9:
+            fallas.append('muestra')
+
+        # Interrupción simulada: se pierde la mitad de las partes
+        partes = sorted(salida.glob(f'bloque-*.{args.formato}'))
+        perdidos = 0
+        for parte in partes[::2]:
+            leer = pd.read_parquet if args.formato == 'parquet' else pd.read_csv
+            perdidos += leer(parte)['escenario'].nunique()
+            parte.unlink()
+        reanudado = ejecutar_escenarios(ruta, salida, trabajadores=args.trabajadores,
+                                        tamano_bloque=args.bloque, formato=args.formato)
+        print(f"Reanudación: {reanudado['calculados']:,} calculados "
+              f"({perdidos:,} perdidos), {reanudado['omitidos']:,} omitidos")
+        if reanudado['calculados'] != perdidos:
+            fallas.append('reanudación')
+        if not leer_resultados(salida, args.formato).equals(resultados):
+            fallas.append('resultados reanudados')
+
+    if fallas:
+        raise SystemExit(f'ERROR: verificaciones fallidas: {", ".join(fallas)}')
+
+
+if __name__ == '__main__':
+    main()
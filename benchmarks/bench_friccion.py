@@ -0,0 +1,71 @@
+"""
+bench_friccion.py — Rendimiento del solver vectorizado de Colebrook-White.
+
+Compara la ruta de referencia (scipy.optimize.fsolve, un escalar por
+llamada) contra el solver vectorizado sobre 10⁶ pares (Re, ε/D) y
+verifica que ambas rutas coincidan dentro de 1e-10.
+
+Uso:
+    python benchmarks/bench_friccion.py [--n 1000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.hidraulica import f_colebrook, f_haaland, f_swamee_jain, _f_colebrook_fsolve
+
+
+def _muestras(n: int, semilla: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Pares (Re, ε/D) log-uniformes en todo el rango turbulento."""
+    rng = np.random.default_rng(semilla)
+    Re = 10**rng.uniform(np.log10(4000), 8, n)
+    rugosidad_relativa = 10**rng.uniform(-7, -1.3, n)
+    return Re, rugosidad_relativa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=1_000_000, help='pares (Re, ε/D)')
+    parser.add_argument('--n-ref', type=int, default=2_000,
+                        help='pares evaluados con fsolve para validar')
+    args = parser.parse_args()
+
+    Re, rr = _muestras(args.n)
+
+    # --- Ruta de referencia (fsolve escalar) sobre una submuestra ---
+    n_ref = min(args.n_ref, args.n)
+    t0 = time.perf_counter()
+    f_ref = np.array([_f_colebrook_fsolve(Re[i], rr[i], 1.0) for i in range(n_ref)])
+    t_ref = time.perf_counter() - t0
+
+    # --- Solver vectorizado sobre todos los pares ---
+    t0 = time.perf_counter()
+    f_vec = f_colebrook(Re, rr, 1.0)
+    t_vec = time.perf_counter() - t0
+
+    error_max = np.max(np.abs(f_vec[:n_ref] - f_ref))
+
+    print(f'Colebrook fsolve (escalar): {n_ref / t_ref:>14,.0f} eval/s '
+          f'({t_ref / n_ref * 1e6:.1f} µs/eval)')
+    print(f'Colebrook vectorizado     : {args.n / t_vec:>14,.0f} eval/s '
+          f'({t_vec:.3f} s para {args.n:,} pares)')
+    print(f'Aceleración               : {(t_ref / n_ref) / (t_vec / args.n):,.0f}×')
+    print(f'Error absoluto máximo     : {error_max:.2e}')
+
+    for nombre, funcion in (('Haaland', f_haaland), ('Swamee-Jain', f_swamee_jain)):
+        t0 = time.perf_counter()
+        funcion(Re, rr, 1.0)
+        t = time.perf_counter() - t0
+        print(f'{nombre + " vectorizado":<26}: {args.n / t:>14,.0f} eval/s')
+
+    if error_max > 1e-10:
+        raise SystemExit(f'ERROR: diferencia con fsolve {error_max:.2e} > 1e-10')
+
+
+if __name__ == '__main__':
+    main()
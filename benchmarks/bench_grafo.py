@@ -0,0 +1,87 @@
+"""
+bench_grafo.py — Recálculo incremental por entrada frente al cálculo completo.
+
+Para cada entrada del panel lateral (Q, D, ρ, μ, ε) cambia solo esa
+entrada en un `GrafoHidraulico`, verifica que el resultado coincida con
+`calcular_sistema_completo` y mide cuánto cuesta el recálculo y cuántos
+nodos se reevaluaron.
+
+Uso:
+    python benchmarks/bench_grafo.py [--repeticiones 300]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.grafo import GrafoHidraulico
+from core.hidraulica import calcular_sistema_completo
+
+BASE = {'Q': 0.025, 'D': 0.1541, 'rho': 998.0, 'mu': 0.001, 'epsilon': 0.000046}
+
+
+def _coincide(resultado, referencia) -> bool:
+    """Mismas columnas y valores numéricos (NaN en las claves ausentes)."""
+    if resultado.nombres_columnas != referencia.nombres_columnas:
+        return False
+    a, b = resultado.to_dataframe(), referencia.to_dataframe()
+    numericas = a.select_dtypes('number').columns
+    return a.drop(columns=numericas).equals(b.drop(columns=numericas)) and np.allclose(
+        a[numericas].to_numpy(float), b[numericas].to_numpy(float),
+        rtol=1e-12, atol=0, equal_nan=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeticiones', type=int, default=300)
+    args = parser.parse_args()
+    n = args.repeticiones
+
+    grafo = GrafoHidraulico(**BASE)
+    grafo.resultado()
+    fallas = []
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        calcular_sistema_completo(**{**BASE, 'rho': BASE['rho'] * (1 + 1e-6 * (i + 1))})
+    t_completo = (time.perf_counter() - t0) / n
+    print(f'calcular_sistema_completo: {t_completo * 1e6:8.1f} µs')
+    print(f'{"entrada":<10}{"µs/cambio":>12}{"nodos":>8}{"aceleración":>14}')
+
+    for nombre, valor in BASE.items():
+        # Valores distintos en cada repetición para no reutilizar la caché de f
+        t0 = time.perf_counter()
+        for i in range(n):
+            grafo.fijar(**{nombre: valor * (1 + 1e-6 * (i + 1))})
+            grafo.resultado()
+        t_grafo = (time.perf_counter() - t0) / n
+        nodos = len(grafo.ultimo_recalculo)
+
+        grafo.fijar(**{nombre: valor * 1.1})
+        if not _coincide(grafo.resultado(), calcular_sistema_completo(**{**BASE, nombre: valor * 1.1})):
+            fallas.append(nombre)
+        grafo.fijar(**{nombre: valor})
+        print(f'{nombre:<10}{t_grafo * 1e6:12.1f}{nodos:8d}{t_completo / t_grafo:13.1f}×')
+
+    grafo.resultado()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        grafo.fijar(**BASE)
+        grafo.resultado()
+    t_igual = (time.perf_counter() - t0) / n
+    print(f'{"sin cambio":<10}{t_igual * 1e6:12.1f}{len(grafo.ultimo_recalculo):8d}')
+
+    print('\nCosto por nodo (acumulado):')
+    print(grafo.tiempos().to_string(float_format=lambda x: f'{x:.3f}'))
+
+    if fallas:
+        raise SystemExit(f'ERROR: el grafo no coincide con calcular_sistema_completo al cambiar {fallas}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+bench_incertidumbre.py — Tiempo del análisis Monte Carlo de potencia.
+
+Evalúa un millón de muestras del sistema completo (8 tramos) por lotes
+vectorizados y reporta el tiempo, las muestras por segundo y los
+percentiles de la potencia total.
+
+Uso:
+    python benchmarks/bench_incertidumbre.py [--muestras 1000000] [--procesos 1]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.incertidumbre import monte_carlo_potencia
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--muestras', type=int, default=1_000_000)
+    parser.add_argument('--procesos', type=int, default=1)
+    parser.add_argument('--tamano-bloque', type=int, default=100_000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    res = monte_carlo_potencia(
+        n_muestras=args.muestras, procesos=args.procesos,
+        tamano_bloque=args.tamano_bloque, semilla=0,
+    )
+    t = time.perf_counter() - t0
+
+    print(f'Muestras              : {args.muestras:,} ({args.procesos} proceso(s))')
+    print(f'Tiempo                : {t:.2f} s ({args.muestras / t:,.0f} muestras/s)')
+    print(f'Potencia total        : media {res["media"]:.2f} kW, σ {res["desviacion"]:.2f} kW')
+    for p, valor in res['percentiles']['potencia_total_kw'].items():
+        print(f'  P{p:<3}               : {valor:.2f} kW')
+    print('Sensibilidad (SRC²):')
+    for nombre, fila in res['sensibilidad'].sort_values('src2', ascending=False).head(5).iterrows():
+        print(f'  {nombre:<8} {fila["src2"]:.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+bench_lote.py — Cálculo por lotes frente al ciclo de calcular_sistema_completo.
+
+Evalúa una malla de puntos de operación (Q, D, ρ, μ, ε) con un ciclo
+Python sobre `calcular_sistema_completo` y con `calcular_sistema_lote`,
+verifica que los resultados coincidan y reporta la aceleración. El
+ciclo se mide con la caché de fricción activa (como en la app) y sin
+ella (un Newton por tramo); la meta de 100× se verifica contra esta
+última, que es la ruta escalar original.
+
+Uso:
+    python benchmarks/bench_lote.py [--n-ciclo 300] [--n-lote 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.hidraulica import CACHE_FRICCION, calcular_sistema_completo, calcular_sistema_lote
+
+
+def _puntos(n: int, semilla: int = 0) -> dict:
+    """Puntos de operación aleatorios dentro de los rangos del sidebar."""
+    rng = np.random.default_rng(semilla)
+    return {
+        'Q': rng.uniform(0.005, 0.100, n),
+        'D': rng.uniform(0.05, 0.30, n),
+        'rho': rng.uniform(900.0, 1100.0, n),
+        'mu': rng.uniform(0.0005, 0.0020, n),
+        'epsilon': rng.uniform(0.00001, 0.001, n),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n-ciclo', type=int, default=300,
+                        help='puntos evaluados con el ciclo escalar')
+    parser.add_argument('--n-lote', type=int, default=100_000,
+                        help='puntos evaluados por lotes')
+    args = parser.parse_args()
+
+    puntos = _puntos(max(args.n_ciclo, args.n_lote))
+
+    # --- Ciclo escalar, con y sin caché de fricción ---
+    def ciclo():
+        t0 = time.perf_counter()
+        potencias = []
+        for i in range(args.n_ciclo):
+            res = calcular_sistema_completo(**{k: float(v[i]) for k, v in puntos.items()})
+            potencias.append([r['potencia_kw'] for r in res.values()])
+        return (time.perf_counter() - t0) / args.n_ciclo, potencias
+
+    tamano_cache = CACHE_FRICCION.tamano_max
+    CACHE_FRICCION.limpiar()
+    t_ciclo_cache, potencia_ciclo = ciclo()
+    CACHE_FRICCION.configurar(tamano_max=0)
+    t_ciclo, _ = ciclo()
+    CACHE_FRICCION.configurar(tamano_max=tamano_cache)
+
+    # --- Lote vectorizado ---
+    t0 = time.perf_counter()
+    df = calcular_sistema_lote(**{k: v[:args.n_lote] for k, v in puntos.items()})
+    t_lote = (time.perf_counter() - t0) / args.n_lote
+
+    n_tramos = df['tramo'].nunique()
+    potencia_lote = df['potencia_kw'].to_numpy()[:args.n_ciclo * n_tramos]
+    # Relativo: la caché resuelve en (Re, ε/D) redondeados a 12 cifras
+    potencia_ciclo = np.ravel(potencia_ciclo)
+    error_max = np.max(
+        np.abs(potencia_lote - potencia_ciclo) / np.maximum(np.abs(potencia_ciclo), 1.0)
+    )
+
+    aceleracion = t_ciclo / t_lote
+    print(f'Ciclo calcular_sistema_completo: {t_ciclo * 1e6:10.1f} µs/punto (sin caché)')
+    print(f'                                 {t_ciclo_cache * 1e6:10.1f} µs/punto (con caché)')
+    print(f'calcular_sistema_lote          : {t_lote * 1e6:10.3f} µs/punto '
+          f'({args.n_lote:,} puntos, {len(df):,} filas)')
+    print(f'Aceleración                    : {aceleracion:10.0f}×')
+    print(f'Error relativo máximo potencia : {error_max:.2e}')
+
+    if error_max > 1e-9:
+        raise SystemExit(f'ERROR: el lote difiere del ciclo ({error_max:.2e})')
+    if aceleracion < 100:
+        raise SystemExit(f'ERROR: aceleración {aceleracion:.0f}× < 100×')
+
+
+if __name__ == '__main__':
+    main()
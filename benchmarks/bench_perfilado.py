@@ -0,0 +1,75 @@
+"""
+bench_perfilado.py — Costo del perfilado por etapa.
+
+Mide cuánto agrega `PERFILADOR.etapa` a cada bloque medido, con y sin
+registro de memoria, y verifica que las etapas anidadas y repetidas se
+agreguen bien (suma por rerun, ruta 'padre/hija', percentiles y salida
+de Prometheus).
+
+Uso:
+    python benchmarks/bench_perfilado.py [--n 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.perfilado import Perfilador
+
+
+def _costo_por_etapa(perfilador: Perfilador, n: int) -> float:
+    etapa = perfilador.etapa
+    perfilador.iniciar_rerun()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        with etapa('vacia'):
+            pass
+    costo = (time.perf_counter() - t0) / n
+    perfilador.terminar_rerun()
+    return costo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=100_000, help='etapas medidas por caso')
+    args = parser.parse_args()
+    fallas = []
+
+    perfilador = Perfilador()
+    print(f'etapa sin memoria : {_costo_por_etapa(perfilador, args.n) * 1e6:6.2f} µs')
+    perfilador.configurar(memoria=True)
+    print(f'etapa con memoria : {_costo_por_etapa(perfilador, args.n // 10) * 1e6:6.2f} µs')
+    perfilador.configurar(memoria=False)
+
+    # Agregación: 'b' se repite dentro del rerun y 'a/c' está anidada
+    perfilador.limpiar()
+    for _ in range(20):
+        perfilador.iniciar_rerun()
+        with perfilador.etapa('a'):
+            time.sleep(0.002)
+            with perfilador.etapa('c'):
+                time.sleep(0.001)
+        for _ in range(3):
+            with perfilador.etapa('b'):
+                time.sleep(0.001)
+        tiempos = perfilador.terminar_rerun()
+    tabla = perfilador.percentiles()
+    print('\n' + tabla[['reruns', 'p50_ms', 'p90_ms', 'fraccion']].to_string(float_format=lambda x: f'{x:.2f}'))
+
+    if set(tabla.index) != {'rerun', 'a', 'a/c', 'b'} or (tabla['reruns'] != 20).any():
+        fallas.append('etapas')
+    if not (tabla.loc['b', 'p50_ms'] >= 3.0 and tabla.loc['a', 'p50_ms'] >= tabla.loc['a/c', 'p50_ms'] + 2.0):
+        fallas.append('tiempos')
+    if tiempos['rerun'] < tiempos['a'] + tiempos['b']:
+        fallas.append('total')
+    if 'hidraulica_etapa_segundos_count{etapa="a/c"} 20' not in perfilador.a_prometheus():
+        fallas.append('prometheus')
+
+    if fallas:
+        raise SystemExit(f'ERROR: verificaciones fallidas: {", ".join(fallas)}')
+
+
+if __name__ == '__main__':
+    main()
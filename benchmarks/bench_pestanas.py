@@ -0,0 +1,60 @@
+"""
+bench_pestanas.py — Latencia de rerun con pestañas diferidas vs. completas.
+
+Corre `app.py` con el `AppTest` de Streamlit, mueve el caudal varias
+veces con el renderizado diferido activo y luego desactivado, y compara
+el p50 de cada etapa registrado por `PERFILADOR`. Con el modo diferido
+solo la pestaña abierta (Inicio) construye sus figuras.
+
+Uso:
+    python benchmarks/bench_pestanas.py [--reruns 5]
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from core.perfilado import PERFILADOR
+
+APP = Path(__file__).parent.parent / 'app.py'
+
+
+def _medir(diferido: bool, reruns: int) -> tuple[pd.Series, int]:
+    """p50 (ms) por etapa y número de gráficos Plotly en el último rerun."""
+    at = AppTest.from_file(str(APP), default_timeout=600)
+    at.session_state['render_diferido'] = diferido
+    at.run()
+    PERFILADOR.limpiar()
+    # Valores distintos en cada rerun: sin aciertos en las cachés de vistas
+    for i in range(reruns):
+        at.slider[0].set_value(0.030 + 0.001 * i).run()
+        if at.exception:
+            raise SystemExit(f'ERROR: excepción en la app: {at.exception[0].value}')
+    return PERFILADOR.percentiles()['p50_ms'], len(at.get('plotly_chart'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--reruns', type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # avisos de obsolescencia de Streamlit
+
+    diferido, graficos_diferido = _medir(True, args.reruns)
+    completo, graficos_completo = _medir(False, args.reruns)
+    tabla = pd.DataFrame({'completo_ms': completo, 'diferido_ms': diferido}).fillna(0.0)
+    tabla = tabla.sort_values('completo_ms', ascending=False)
+    print(tabla.to_string(float_format=lambda x: f'{x:.1f}'))
+    print(f"\nrerun: {tabla.loc['rerun', 'completo_ms'] / tabla.loc['rerun', 'diferido_ms']:.1f}× más rápido "
+          f"({graficos_completo} gráficos Plotly → {graficos_diferido})")
+
+    if graficos_diferido >= graficos_completo:
+        raise SystemExit('ERROR: el modo diferido construyó las figuras de pestañas ocultas')
+
+
+if __name__ == '__main__':
+    main()
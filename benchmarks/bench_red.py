@@ -0,0 +1,130 @@
+"""
+bench_red.py — Gradiente global (Todini-Pilati) en redes de miles de enlaces.
+
+Verifica que la cadena de 8 tramos expresada como red (`red_desde_tramos`)
+reproduzca `calcular_sistema_completo` en varios puntos de operación y
+que sobreviva un viaje de ida y vuelta por JSON; luego resuelve una
+malla cuadrada con lazos (un tanque en una esquina, demanda en todas las
+uniones, tuberías de Darcy-Weisbach y de Hazen-Williams) y comprueba continuidad y energía en la solución.
+
+Uso:
+    python benchmarks/bench_red.py [--lado 50]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.hidraulica import calcular_sistema_completo
+from core.red import (
+    _perdidas, calcular_sistema_red, cargar_red, construir_red, guardar_red,
+    red_desde_tramos, resolver_red,
+)
+
+PUNTOS = (
+    {},
+    {'Q': 0.018, 'D': 0.2},
+    {'rho': 1000.0, 'mu': 0.0008, 'epsilon': 0.00015},
+)
+
+
+def _error_relativo(a, b) -> float:
+    """Máximo |a/b - 1| (|a - b| donde b = 0)."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    escala = np.where(b != 0, np.abs(b), 1.0)
+    return float(np.max(np.abs(a - b) / escala))
+
+
+def _malla(lado: int, semilla: int = 0):
+    """Malla lado × lado con un tanque en la esquina (mitad de las tuberías con Hazen-Williams)."""
+    rng = np.random.default_rng(semilla)
+    nombre = lambda i, j: f'N{i}_{j}'
+    nodos = [{'nombre': 'tanque', 'elevacion': 80.0, 'tipo': 'tanque'}]
+    for i in range(lado):
+        for j in range(lado):
+            nodos.append({'nombre': nombre(i, j), 'elevacion': float(rng.uniform(0, 20)),
+                          'demanda': float(rng.uniform(0.5, 1.5) * 1e-4)})
+    enlaces = [{'nombre': 'alimentacion', 'desde': 'tanque', 'hasta': nombre(0, 0),
+                'tipo': 'tuberia', 'longitud': 100.0, 'diametro': 0.6}]
+    for i in range(lado):
+        for j in range(lado):
+            for di, dj in ((0, 1), (1, 0)):
+                if i + di < lado and j + dj < lado:
+                    enlace = {
+                        'nombre': f'P{i}_{j}_{di}{dj}', 'desde': nombre(i, j),
+                        'hasta': nombre(i + di, j + dj), 'tipo': 'tuberia',
+                        'longitud': float(rng.uniform(50, 150)),
+                        'diametro': float(rng.choice([0.1, 0.15, 0.2])), 'K': 0.5,
+                    }
+                    if rng.random() < 0.5:
+                        enlace['hazen'] = 130.0
+                    enlaces.append(enlace)
+    return construir_red(nodos, enlaces)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lado', type=int, default=50, help='uniones por lado de la malla')
+    args = parser.parse_args()
+    fallas = []
+
+    print('Cadena de 8 tramos como red:')
+    for punto in PUNTOS:
+        red = calcular_sistema_red(**punto)
+        ref = calcular_sistema_completo(**punto).to_dataframe()
+        bomba = ~ref['es_bajada'].to_numpy()
+        error = max(
+            _error_relativo(red['potencia_kw'], ref['potencia_kw']),
+            _error_relativo(red['perdidas_friccion'], ref['perdidas_friccion_colebrook']),
+            _error_relativo(red['perdidas_menores'], ref['perdidas_menores']),
+            _error_relativo(red['carga_estacion'][bomba], ref['carga_estacion'][bomba]),
+        )
+        print(f'  {punto or "punto de diseño"}: error relativo máximo {error:.1e}')
+        if error > 1e-9:
+            fallas.append(f'cadena {punto}')
+
+    red = red_desde_tramos()
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = Path(carpeta) / 'red.json'
+        guardar_red(red, ruta)
+        leida = cargar_red(ruta)
+    a = resolver_red(red)['enlaces']['potencia_kw']
+    b = resolver_red(leida)['enlaces']['potencia_kw']
+    print(f'  JSON ida y vuelta: {"ok" if a.equals(b) else "FALLA"}')
+    if not a.equals(b):
+        fallas.append('JSON')
+
+    malla = _malla(args.lado)
+    t0 = time.perf_counter()
+    sol = resolver_red(malla)
+    t_resolver = time.perf_counter() - t0
+
+    nodos, enlaces = sol['nodos'], sol['enlaces']
+    Q = enlaces['caudal'].to_numpy()
+    balance = np.zeros(malla.n_nodos)
+    np.add.at(balance, malla.hasta, Q)
+    np.add.at(balance, malla.desde, -Q)
+    continuidad = np.max(np.abs(balance - malla.nodo_demanda)[~malla.nodo_tanque])
+    h, _ = _perdidas(malla, Q, 998.0, 0.001, 'colebrook')
+    H = nodos['carga'].to_numpy()
+    energia = np.max(np.abs(H[malla.desde] - H[malla.hasta] - h))
+
+    print(f'\nMalla {args.lado}×{args.lado}: {malla.n_nodos:,} nodos, {malla.n_enlaces:,} enlaces')
+    print(f'  {sol["iteraciones"]} iteraciones en {t_resolver * 1e3:.0f} ms')
+    print(f'  residuo de continuidad : {continuidad:.1e} m³/s')
+    print(f'  residuo de energía     : {energia:.1e} m')
+    print(f'  presión mínima         : {nodos["presion"][~malla.nodo_tanque].min():.2f} m.c.a.')
+    if continuidad > 1e-9 or energia > 1e-6:
+        fallas.append('malla')
+
+    if fallas:
+        raise SystemExit(f'ERROR: verificaciones fallidas: {", ".join(fallas)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+bench_regimen.py — Factor de fricción por régimen: límites y rendimiento.
+
+Verifica el comportamiento de `f_regimen` en los límites de régimen
+(64/Re exacto en laminar, continuidad en Re = 2300 y Re = 4000, igualdad
+con Colebrook en turbulento, que el lote coincida con la ruta escalar y
+que la curva de sistema de `core.bombas` use el mismo factor que
+`calcular_sistema_completo`) y mide un barrido de un millón de puntos
+que cruza los tres regímenes.
+
+Uso:
+    python benchmarks/bench_regimen.py [--n 1000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.bombas import curva_sistema
+from core.hidraulica import (
+    RE_LAMINAR, RE_TURBULENTO, calcular_sistema_completo, f_colebrook, f_regimen, regimen_flujo,
+)
+
+
+def _verificar_limites() -> list[str]:
+    """Retorna la lista de verificaciones fallidas (vacía si todo pasa)."""
+    fallas = []
+    epsilon, D = 0.000046, 0.1541
+    delta = 1e-9
+
+    def revisar(nombre, condicion):
+        print(f'  {"ok   " if condicion else "FALLA"} {nombre}')
+        if not condicion:
+            fallas.append(nombre)
+
+    Re_lam = np.array([1.0, 500.0, 2000.0, RE_LAMINAR])
+    revisar('laminar: f = 64/Re', np.allclose(f_regimen(Re_lam, epsilon, D), 64.0 / Re_lam, rtol=1e-15))
+    revisar('Re <= 0 → f = 0', np.all(f_regimen(np.array([0.0, -10.0]), epsilon, D) == 0.0))
+
+    izquierda = f_regimen(RE_LAMINAR, epsilon, D)
+    derecha = f_regimen(RE_LAMINAR * (1 + delta), epsilon, D)
+    revisar('continuidad en Re = 2300', abs(derecha - izquierda) / izquierda < 1e-6)
+
+    izquierda = f_regimen(RE_TURBULENTO, epsilon, D)
+    derecha = f_regimen(RE_TURBULENTO * (1 + delta), epsilon, D)
+    revisar('continuidad en Re = 4000', abs(derecha - izquierda) / izquierda < 1e-6)
+    revisar('Re = 4000 igual a Colebrook', np.isclose(izquierda, f_colebrook(RE_TURBULENTO, epsilon, D), rtol=1e-12))
+
+    Re_tur = np.logspace(np.log10(RE_TURBULENTO) + 1e-6, 8, 1000)
+    revisar('turbulento igual a Colebrook',
+            np.allclose(f_regimen(Re_tur, epsilon, D), f_colebrook(Re_tur, epsilon, D), rtol=1e-13))
+
+    Re_mix = np.array([0.0, 100.0, RE_LAMINAR, 3000.0, RE_TURBULENTO, 4000.5, 1e5])
+    eps_mix = np.linspace(1e-5, 1e-3, len(Re_mix))
+    lote = f_regimen(Re_mix, eps_mix, D)
+    escalar = np.array([f_regimen(float(r), float(e), D) for r, e in zip(Re_mix, eps_mix)])
+    revisar('lote igual a ruta escalar', np.allclose(lote, escalar, rtol=1e-12, atol=0))
+
+    revisar('regimen_flujo en los límites', list(regimen_flujo(np.array(
+        [RE_LAMINAR, RE_LAMINAR + 1, RE_TURBULENTO, RE_TURBULENTO + 1]
+    ))) == ['Laminar', 'Transición', 'Transición', 'Turbulento'])
+
+    # Q de 1e-4 a 5e-4 m³/s cruza laminar y transición con D = 0.1541 m
+    coinciden = []
+    for Q in (1e-4, 3e-4, 4e-4, 5e-4, 0.025):
+        sistema = calcular_sistema_completo(Q=Q, D=D, epsilon=epsilon, metodo_friccion='regimen')
+        curva = curva_sistema(Q, sistema.tramos, D=D, epsilon=epsilon, metodo_friccion='regimen')
+        coinciden.append(np.allclose(curva, sistema.columna('carga_estacion'), rtol=1e-9, atol=1e-9))
+    revisar('curva de sistema por régimen igual al motor', all(coinciden))
+    return fallas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print('Límites de régimen:')
+    fallas = _verificar_limites()
+
+    rng = np.random.default_rng(0)
+    Re = 10.0**rng.uniform(2, 7, args.n)
+    rr = 10.0**rng.uniform(-6, -2, args.n)
+    conteo = {r: int(np.sum(regimen_flujo(Re) == r)) for r in ('Laminar', 'Transición', 'Turbulento')}
+
+    t0 = time.perf_counter()
+    f_regimen(Re, rr, 1.0)
+    t_regimen = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    f_colebrook(Re, rr, 1.0)
+    t_colebrook = time.perf_counter() - t0
+
+    print(f'Barrido de {args.n:,} puntos: {conteo}')
+    print(f'  f_regimen   : {t_regimen / args.n * 1e9:6.1f} ns/punto')
+    print(f'  f_colebrook : {t_colebrook / args.n * 1e9:6.1f} ns/punto')
+
+    if fallas:
+        raise SystemExit(f'ERROR: {len(fallas)} verificación(es) fallida(s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+bench_simulacion.py — Tiempo de la simulación de periodo extendido.
+
+Simula un año completo con paso de 1 minuto (525 600 pasos) y reporta
+el tiempo total, los pasos por segundo y el balance de energía.
+Verifica que los niveles de todos los tanques queden en [0, 1], también
+con un paso grueso (48 h, paso de 60 min) donde Q·dt supera la banda de
+histéresis.
+
+Uso:
+    python benchmarks/bench_simulacion.py [--dias 365] [--paso-min 1]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.simulacion import simular_periodo_extendido
+
+
+def _fuera_de_rango(res) -> list[str]:
+    """Tanques cuyo nivel sale de [0, 1] en algún instante reportado."""
+    niveles = res['serie'][res['elementos']['elemento']]
+    return [c for c in niveles.columns
+            if not niveles[c].between(-1e-9, 1.0 + 1e-9).all()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--dias', type=float, default=365.0)
+    parser.add_argument('--paso-min', type=float, default=1.0)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    res = simular_periodo_extendido(duracion_h=args.dias * 24.0, paso_min=args.paso_min)
+    t = time.perf_counter() - t0
+
+    n_pasos = int(round(args.dias * 24 * 60 / args.paso_min))
+    print(f'Periodo simulado      : {args.dias:g} días, paso {args.paso_min:g} min ({n_pasos:,} pasos)')
+    print(f'Tiempo                : {t:.2f} s ({n_pasos / t:,.0f} pasos/s)')
+    print(f'Energía de bombeo     : {res["energia_kwh"]:,.0f} kWh')
+    print(f'Demanda atendida      : {res["demanda_m3"] - res["demanda_no_atendida_m3"]:,.0f} '
+          f'de {res["demanda_m3"]:,.0f} m³')
+    print(f'Volumen recortado     : {res["volumen_recortado_m3"]:,.0f} m³')
+
+    grueso = simular_periodo_extendido(duracion_h=48.0, paso_min=60.0, intervalo_reporte_min=60.0)
+    fuera = {f'{args.dias:g} días': _fuera_de_rango(res), '48 h / 60 min': _fuera_de_rango(grueso)}
+    fuera = {caso: tanques for caso, tanques in fuera.items() if tanques}
+    if fuera:
+        raise SystemExit('ERROR: niveles fuera de [0, 1] en '
+                         + '; '.join(f'{caso}: {", ".join(t)}' for caso, t in fuera.items()))
+    print('Niveles en [0, 1]     : sí (también con paso de 60 min)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+bench_tabla_moody.py — Consulta de la tabla de Moody frente a Colebrook.
+
+Verifica sobre puntos aleatorios del rango tabulado que el error
+relativo de `f_tabla` no supere la cota guardada en los metadatos, y
+compara el tiempo por consulta escalar y por lote con el solver exacto.
+
+Uso:
+    python benchmarks/bench_tabla_moody.py [--n 1000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.hidraulica import _colebrook_vectorizado
+from core.tabla_moody import cargar_tabla, f_tabla
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--n-escalar', type=int, default=20_000)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    tabla = cargar_tabla()
+    t_carga = time.perf_counter() - t0
+
+    rng = np.random.default_rng(0)
+    Re = 10.0**rng.uniform(tabla.log_re_min, tabla.log_re_max, args.n)
+    rr = 10.0**rng.uniform(tabla.log_rugosidad_min, tabla.log_rugosidad_max, args.n)
+
+    t0 = time.perf_counter()
+    exacto = _colebrook_vectorizado(Re, rr)
+    t_exacto = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    aprox = f_tabla(Re, rr, 1.0)
+    t_tabla = time.perf_counter() - t0
+    error = float(np.max(np.abs(aprox / exacto - 1.0)))
+
+    n = args.n_escalar
+    t0 = time.perf_counter()
+    for i in range(n):
+        f_tabla(float(Re[i]), float(rr[i]), 1.0)
+    t_tabla_esc = (time.perf_counter() - t0) / n
+    t0 = time.perf_counter()
+    for i in range(n // 10):
+        float(_colebrook_vectorizado(float(Re[i]), float(rr[i])))
+    t_exacto_esc = (time.perf_counter() - t0) / (n // 10)
+
+    print(f'Tabla                 : {tabla.valores.shape}, abierta en {t_carga * 1e3:.2f} ms (memmap)')
+    print(f'Error relativo máximo : {error:.2e} (cota de la tabla {tabla.error_rel_max:.2e})')
+    print(f'Escalar  — tabla      : {t_tabla_esc * 1e6:8.2f} µs/consulta')
+    print(f'Escalar  — Colebrook  : {t_exacto_esc * 1e6:8.2f} µs/consulta '
+          f'({t_exacto_esc / t_tabla_esc:.1f}×)')
+    print(f'Lote {args.n:,} — tabla : {t_tabla / args.n * 1e9:8.1f} ns/punto')
+    print(f'Lote {args.n:,} — Colebrook: {t_exacto / args.n * 1e9:5.1f} ns/punto')
+
+    if error > tabla.error_rel_max:
+        raise SystemExit(f'ERROR: error {error:.2e} supera la cota {tabla.error_rel_max:.2e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+bench_transitorios.py — Rendimiento del solver de golpe de ariete (MOC).
+
+Mide el costo por actualización nodo·paso de `simular_tramo` con una
+malla grande y compara la ejecución secuencial y en paralelo de los
+8 tramos con `simular_transitorios`.
+
+Uso:
+    python benchmarks/bench_transitorios.py [--nodos 100000] [--pasos 1000] [--procesos 4]
+                                          [--nodos-tramo 500]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.tramos import obtener_definicion_tramos
+from core.transitorios import CELERIDAD, simular_tramo, simular_transitorios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--nodos', type=int, default=100_000)
+    parser.add_argument('--pasos', type=int, default=1_000)
+    parser.add_argument('--procesos', type=int, default=4)
+    parser.add_argument('--nodos-tramo', type=int, default=500)
+    args = parser.parse_args()
+
+    # --- Malla grande en un tramo: costo por nodo·paso ---
+    L = obtener_definicion_tramos()[8]['longitud_tuberia']
+    dt = L / args.nodos / CELERIDAD
+    t0 = time.perf_counter()
+    salida = simular_tramo(8, n_tramos_malla=args.nodos, duracion=args.pasos * dt)
+    t = time.perf_counter() - t0
+    actualizaciones = (args.nodos + 1) * salida['pasos']
+    print(f'Tramo 8, {args.nodos:,} nodos × {salida["pasos"]:,} pasos: {t:.2f} s '
+          f'({t / actualizaciones * 1e9:.1f} ns/nodo·paso)')
+    print(f'  Estimado 10⁵ nodos × 10⁵ pasos: {t / actualizaciones * 1e10 / 60:.1f} min por proceso')
+
+    # --- 8 tramos: secuencial vs. paralelo ---
+    for procesos in (1, args.procesos):
+        t0 = time.perf_counter()
+        resumen, _ = simular_transitorios(procesos=procesos, n_tramos_malla=args.nodos_tramo)
+        print(f'8 tramos, {args.nodos_tramo:,} nodos c/u, {procesos} proceso(s): '
+              f'{time.perf_counter() - t0:.2f} s')
+    print(resumen[['tramo', 'escenario', 'p_max_mpa', 'p_min_mpa']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
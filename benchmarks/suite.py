@@ -0,0 +1,247 @@
+"""
+suite.py — Suite de rendimiento del motor con línea base y comparación.
+
+Mide las funciones principales del motor (factores de fricción,
+`calcular_tramo`, `calcular_sistema_completo`, el cálculo por lotes,
+las visualizaciones y `extraer_datos_completos` en frío, desde el
+.cache.npz y con el resultado memoizado) en tamaño escalar y de
+lote, guarda los tiempos en JSON y los compara contra la línea base
+versionada en `benchmarks/linea_base.json`, marcando como regresión
+todo caso cuyo tiempo supere la base en más del umbral.
+
+Cada caso se calibra para que una repetición dure ≥ 0.2 s y se toma
+el mínimo de varias repeticiones (el valor menos afectado por ruido).
+
+Uso:
+    python benchmarks/suite.py correr [-k filtro] [--salida tiempos.json]
+    python benchmarks/suite.py comparar [-k filtro] [--umbral 0.25] [--resultados tiempos.json]
+    python benchmarks/suite.py linea-base [-k filtro]
+"""
+import argparse
+import itertools
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+LINEA_BASE = Path(__file__).parent / 'linea_base.json'
+BASE = {'Q': 0.025, 'D': 0.1541, 'rho': 998.0, 'mu': 0.001, 'epsilon': 0.000046}
+
+
+def _friccion(nombre: str, n: int | None):
+    """Factor de fricción escalar (n=None) o sobre n puntos."""
+    from core import hidraulica
+    funcion = getattr(hidraulica, nombre)
+    eps, D = BASE['epsilon'], BASE['D']
+    if n is None:
+        return lambda: funcion(2.05e5, eps, D)
+    Re = np.random.default_rng(0).uniform(4e3, 1e7, n)
+    return lambda: funcion(Re, eps, D)
+
+
+def _colebrook_sin_cache():
+    """Colebrook escalar con un Re distinto en cada llamada (siempre falla la caché)."""
+    from core.hidraulica import f_colebrook
+    contador = itertools.count()
+    eps, D = BASE['epsilon'], BASE['D']
+    return lambda: f_colebrook(2.05e5 + 0.37 * next(contador), eps, D)
+
+
+def _calcular_tramo():
+    from core.hidraulica import calcular_tramo
+    from core.tramos import obtener_definicion_tramos
+    defn = obtener_definicion_tramos()[2]
+    return lambda: calcular_tramo(
+        Q=BASE['Q'], D=BASE['D'], L=defn['longitud_tuberia'], z=defn['z'],
+        K_total=defn['K_total'], num_estaciones=defn['num_estaciones'],
+    )
+
+
+def _sistema_completo():
+    from core.hidraulica import calcular_sistema_completo
+    return lambda: calcular_sistema_completo(**BASE)
+
+
+def _sistema_lote(n: int):
+    from core.hidraulica import calcular_sistema_lote
+    Q = np.random.default_rng(0).uniform(0.005, 0.100, n)
+    return lambda: calcular_sistema_lote(**{**BASE, 'Q': Q})
+
+
+def _mapa_piezometrico():
+    from core.hidraulica import calcular_sistema_completo
+    from visualizaciones.mapa_piezometrico import crear_mapa_piezometrico
+    resultados = calcular_sistema_completo(**BASE)
+    return lambda: crear_mapa_piezometrico(resultados, BASE['Q'], BASE['D'])
+
+
+def _modelo_tramo():
+    from core.hidraulica import calcular_sistema_completo
+    from visualizaciones.modelo_3d import generar_modelo_tramo
+    resultados = calcular_sistema_completo(**BASE)
+    return lambda: generar_modelo_tramo(2, resultados)
+
+
+def _datos_completos(cache: str):
+    """
+    `extraer_datos_completos` sobre una copia del CSV en un directorio temporal.
+
+    cache='memoria': resultado ya memoizado (solo el stat del archivo);
+    'disco': cachés en memoria vacías, cuadrícula desde el .cache.npz;
+    'ninguna': sin cachés ni .cache.npz (lectura y parseo completos).
+    """
+    from core import datos
+    carpeta = tempfile.TemporaryDirectory()
+    ruta = Path(carpeta.name) / Path(datos.RUTA_CSV).name
+    shutil.copyfile(datos.RUTA_CSV, ruta)
+    datos.extraer_datos_completos(ruta)  # escribe el .cache.npz
+
+    def llamar(carpeta=carpeta):  # la carpeta vive mientras viva el caso
+        if cache != 'memoria':
+            datos.limpiar_cache()
+        if cache == 'ninguna':
+            datos.ruta_cache(ruta).unlink(missing_ok=True)
+        return datos.extraer_datos_completos(ruta)
+    return llamar
+
+
+# nombre → función que prepara los datos y retorna el invocable a medir
+CASOS = {
+    'f_colebrook[escalar]': lambda: _friccion('f_colebrook', None),
+    'f_colebrook[escalar, sin caché]': _colebrook_sin_cache,
+    'f_colebrook[1e5]': lambda: _friccion('f_colebrook', 100_000),
+    'f_haaland[escalar]': lambda: _friccion('f_haaland', None),
+    'f_haaland[1e5]': lambda: _friccion('f_haaland', 100_000),
+    'f_swamee_jain[escalar]': lambda: _friccion('f_swamee_jain', None),
+    'f_swamee_jain[1e5]': lambda: _friccion('f_swamee_jain', 100_000),
+    'calcular_tramo[escalar]': _calcular_tramo,
+    'calcular_sistema_completo[escalar]': _sistema_completo,
+    'calcular_sistema_lote[1e4]': lambda: _sistema_lote(10_000),
+    'crear_mapa_piezometrico': _mapa_piezometrico,
+    'generar_modelo_tramo': _modelo_tramo,
+    'extraer_datos_completos[caliente]': lambda: _datos_completos('memoria'),
+    'extraer_datos_completos[.cache.npz]': lambda: _datos_completos('disco'),
+    'extraer_datos_completos[frío]': lambda: _datos_completos('ninguna'),
+}
+
+
+def medir(funcion, repeticiones: int = 5, tiempo_min: float = 0.2) -> dict:
+    """
+    Tiempo por llamada de `funcion` (s).
+
+    Calibra el número de llamadas por repetición para que dure al menos
+    `tiempo_min` y retorna 'min_s', 'mediana_s' y 'llamadas'.
+    """
+    temporizador = timeit.Timer(funcion)
+    llamadas, tiempo = temporizador.autorange()
+    if tiempo < tiempo_min:
+        llamadas = max(1, int(np.ceil(llamadas * tiempo_min / max(tiempo, 1e-9))))
+    tiempos = np.array(temporizador.repeat(repeat=repeticiones, number=llamadas)) / llamadas
+    return {'min_s': float(tiempos.min()), 'mediana_s': float(np.median(tiempos)), 'llamadas': llamadas}
+
+
+def _entorno() -> dict:
+    import pandas as pd
+    import scipy
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+    }
+
+
+def correr(filtro: str = '', repeticiones: int = 5) -> dict:
+    """Mide los casos cuyo nombre contiene `filtro` y los imprime a medida que avanzan."""
+    casos = {}
+    for nombre, preparar in CASOS.items():
+        if filtro not in nombre:
+            continue
+        casos[nombre] = medir(preparar(), repeticiones=repeticiones)
+        print(f"{nombre:<38}{_formato_tiempo(casos[nombre]['min_s']):>12}", flush=True)
+    return {'entorno': _entorno(), 'casos': casos}
+
+
+def comparar(actual: dict, base: dict, umbral: float) -> list[str]:
+    """
+    Imprime la comparación caso a caso y retorna los casos con regresión.
+
+    Es regresión si min_s actual > min_s base · (1 + umbral).
+    """
+    regresiones = []
+    print(f"\n{'caso':<38}{'base':>12}{'actual':>12}{'cambio':>10}")
+    for nombre, medida in actual['casos'].items():
+        referencia = base['casos'].get(nombre)
+        if referencia is None:
+            print(f"{nombre:<38}{'—':>12}{_formato_tiempo(medida['min_s']):>12}{'nuevo':>10}")
+            continue
+        razon = medida['min_s'] / referencia['min_s']
+        marca = ''
+        if razon > 1 + umbral:
+            marca = '  ← REGRESIÓN'
+            regresiones.append(nombre)
+        elif razon < 1 / (1 + umbral):
+            marca = '  (mejora)'
+        print(f"{nombre:<38}{_formato_tiempo(referencia['min_s']):>12}"
+              f"{_formato_tiempo(medida['min_s']):>12}{razon - 1:>+10.1%}{marca}")
+    if base.get('entorno') != actual.get('entorno'):
+        print('\nAviso: el entorno difiere del de la línea base; los tiempos pueden no ser comparables.')
+    return regresiones
+
+
+def _formato_tiempo(segundos: float) -> str:
+    for unidad, escala in (('s', 1.0), ('ms', 1e-3), ('µs', 1e-6)):
+        if segundos >= escala:
+            return f'{segundos / escala:.3g} {unidad}'
+    return f'{segundos / 1e-9:.3g} ns'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('accion', choices=['correr', 'comparar', 'linea-base'])
+    parser.add_argument('-k', dest='filtro', default='', help='solo casos cuyo nombre contenga este texto')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--salida', type=Path, help='guardar los tiempos medidos en este JSON')
+    parser.add_argument('--base', type=Path, default=LINEA_BASE, help='JSON de la línea base')
+    parser.add_argument('--resultados', type=Path,
+                        help='comparar este JSON (de `correr --salida`) en vez de medir de nuevo')
+    parser.add_argument('--umbral', type=float, default=0.25,
+                        help='aumento relativo tolerado antes de marcar regresión')
+    args = parser.parse_args()
+
+    if args.resultados is not None:
+        actual = json.loads(args.resultados.read_text(encoding='utf-8'))
+    else:
+        actual = correr(args.filtro, args.repeticiones)
+    if args.salida is not None:
+        args.salida.write_text(json.dumps(actual, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+    if args.accion == 'linea-base':
+        # Con -k solo se reemplazan los casos medidos
+        casos = {}
+        if args.filtro and args.base.exists():
+            casos = json.loads(args.base.read_text(encoding='utf-8'))['casos']
+        casos.update(actual['casos'])
+        base = {'entorno': actual['entorno'], 'casos': {n: casos[n] for n in CASOS if n in casos}}
+        args.base.write_text(json.dumps(base, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f'\nLínea base guardada en {args.base}')
+    elif args.accion == 'comparar':
+        if not args.base.exists():
+            raise SystemExit(f'ERROR: no existe la línea base {args.base} (genérela con `linea-base`)')
+        base = json.loads(args.base.read_text(encoding='utf-8'))
+        regresiones = comparar(actual, base, args.umbral)
+        if regresiones:
+            raise SystemExit(f'ERROR: regresión de más de {args.umbral:.0%} en: {", ".join(regresiones)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+bombas.py — Curvas de bomba, curvas de sistema y punto de operación.
+
+La curva de sistema de cada tramo se construye con la misma física que
+`calcular_tramo` (Darcy-Weisbach + factor de fricción del método elegido +
+accesorios + transferencia de gravedad), evaluada como función vectorizada de Q. El punto de
+operación de cada estación es la intersección H_bomba(Q) = H_sistema(Q),
+resuelta para todas las estaciones (o todas las bombas candidatas) a la
+vez con un método de falsa posición (Illinois) vectorizado.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.hidraulica import (
+    area_seccion, velocidad, carga_cinetica, reynolds,
+    factor_friccion, perdidas_darcy, perdidas_menores, potencia_bomba,
+)
+from core.tramos import obtener_geometria
+
+# Parámetros del solver de intersección
+INTERSECCION_MAX_ITER = 100
+INTERSECCION_TOL = 1e-10
+
+
+class CurvaBomba:
+    """
+    Curva característica H(Q) de una bomba como polinomio en Q.
+
+    H = c₀ + c₁·Q + c₂·Q² + …   (H en m, Q en m³/s)
+
+    Se crea directamente con los coeficientes (orden ascendente) o con
+    `desde_puntos` a partir de puntos tabulados del fabricante.
+    """
+
+    def __init__(self, coeficientes, nombre: str = ''):
+        self.coeficientes = np.asarray(coeficientes, dtype=float)
+        self.nombre = nombre
+
+    @classmethod
+    def desde_puntos(cls, Q, H, grado: int = 2, nombre: str = '') -> 'CurvaBomba':
+        """Ajusta por mínimos cuadrados un polinomio a puntos (Q, H) tabulados."""
+        Q = np.asarray(Q, dtype=float)
+        grado = min(grado, len(Q) - 1)
+        coefs = np.polynomial.polynomial.polyfit(Q, np.asarray(H, dtype=float), grado)
+        return cls(coefs, nombre=nombre)
+
+    def carga(self, Q):
+        """Carga entregada H(Q) (m). Acepta escalares o arreglos."""
+        return np.polynomial.polynomial.polyval(Q, self.coeficientes)
+
+    @property
+    def caudal_max(self) -> float:
+        """Caudal de carga nula: menor raíz real positiva del polinomio."""
+        raices = np.polynomial.polynomial.polyroots(self.coeficientes)
+        reales = raices.real[(np.abs(raices.imag) < 1e-12) & (raices.real > 0)]
+        return float(reales.min()) if len(reales) else np.inf
+
+    def __repr__(self):
+        return f'CurvaBomba({self.coeficientes.tolist()!r}, nombre={self.nombre!r})'
+
+
+def curva_sistema(
+    Q, tramos,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    metodo_friccion: str = 'colebrook',
+):
+    """
+    Carga requerida por estación H_sistema(Q) de uno o varios tramos.
+
+    Parámetros:
+        Q: caudal(es) (m³/s)
+        tramos: número(s) de tramo; se hace broadcasting con Q
+        metodo_friccion: ver `factor_friccion`; con 'regimen' la curva
+            usa 64/Re en el tramo laminar cerca de Q → 0
+
+    Equivale a `carga_estacion` de `calcular_sistema_completo` evaluado
+    en cada Q, incluida la cabeza recibida por gravedad (calculada con el
+    mismo caudal en el tramo fuente).
+    """
+    geometria = obtener_geometria()
+    posicion = np.full(geometria.numeros.max() + 1, -1)
+    posicion[geometria.numeros] = np.arange(len(geometria.numeros))
+
+    Q, tramos = np.broadcast_arrays(np.asarray(Q, dtype=float), np.asarray(tramos))
+    forma = Q.shape
+    Q = Q.ravel()
+    i = posicion[tramos.ravel()]
+
+    A = area_seccion(D)
+    v = velocidad(Q, A)
+    hv = carga_cinetica(v)
+    f = factor_friccion(reynolds(rho, v, D, mu), epsilon, D, metodo_friccion)
+
+    n = geometria.num_estaciones[i].astype(float)
+    n = np.where(n > 0, n, 1.0)
+    H = (
+        np.abs(geometria.z[i] / n)
+        + perdidas_darcy(f, geometria.longitud_tuberia[i] / n, D, v)
+        + perdidas_menores(geometria.K_total[i], v)
+    )
+
+    # Transferencia de gravedad desde el tramo fuente (mismo caudal)
+    j = geometria.fuente_gravedad[i]
+    recibe = j >= 0
+    if np.any(recibe):
+        jr = j[recibe]
+        perdidas_fuente = (
+            perdidas_darcy(f[recibe], geometria.longitud_tuberia[jr], D, v[recibe])
+            + perdidas_menores(geometria.K_total[jr], v[recibe]) * geometria.num_estaciones[jr]
+        )
+        cabeza = np.maximum(0.0, np.abs(geometria.altura[jr]) - perdidas_fuente)
+        H[recibe] = np.maximum(0.0, H[recibe] * n[recibe] - cabeza) / n[recibe]
+    return H.reshape(forma)
+
+
+def _intersectar(coeficientes, tramos, q_max, D, rho, mu, epsilon,
+                 metodo_friccion='colebrook',
+                 max_iter=INTERSECCION_MAX_ITER, tol=INTERSECCION_TOL):
+    """
+    Resuelve H_bomba(Q) - H_sistema(Q) = 0 para M pares (bomba, tramo).
+
+    coeficientes: (M, k) polinomios de bomba; tramos, q_max: (M,).
+    Usa falsa posición con modificación de Illinois sobre [0, q_max],
+    todos los pares a la vez. Retorna (Q, H, estado) donde estado es
+    'ok', 'sin_flujo' (la bomba no vence la carga estática) o
+    'fuera_de_curva' (la bomba supera al sistema en todo su rango).
+    """
+    def residuo(Q):
+        H_b = np.zeros_like(Q)
+        for c in coeficientes.T[::-1]:  # Horner
+            H_b = H_b * Q + c
+        return H_b - curva_sistema(Q, tramos, D, rho, mu, epsilon, metodo_friccion)
+
+    a = np.zeros(len(tramos))
+    b = q_max.copy()
+    ga, gb = residuo(a), residuo(b)
+
+    sin_flujo = ga <= 0
+    fuera = gb > 0
+    activo = ~(sin_flujo | fuera)
+
+    lado = np.zeros(len(tramos), dtype=int)
+    Q = np.where(sin_flujo, 0.0, b)
+    for _ in range(max_iter):
+        if not np.any(activo):
+            break
+        c = np.where(activo, b - gb * (b - a) / (gb - ga), Q)
+        gc = residuo(c)
+        Q = np.where(activo, c, Q)
+
+        mismo_que_a = activo & (np.sign(gc) == np.sign(ga))
+        mismo_que_b = activo & ~mismo_que_a
+        # Reemplaza el extremo del mismo signo; Illinois divide a la mitad
+        # el residuo del extremo retenido si se repite el mismo lado
+        a = np.where(mismo_que_a, c, a)
+        ga_nuevo = np.where(mismo_que_a, gc, ga)
+        gb = np.where(mismo_que_a & (lado == -1), gb / 2, gb)
+        b = np.where(mismo_que_b, c, b)
+        gb = np.where(mismo_que_b, gc, gb)
+        ga = np.where(mismo_que_b & (lado == 1), ga_nuevo / 2, ga_nuevo)
+        lado = np.where(mismo_que_a, -1, np.where(mismo_que_b, 1, lado))
+
+        activo &= (np.abs(b - a) > tol * np.maximum(b, 1e-12)) & (gc != 0)
+
+    H = curva_sistema(Q, tramos, D, rho, mu, epsilon, metodo_friccion)
+    estado = np.where(sin_flujo, 'sin_flujo', np.where(fuera, 'fuera_de_curva', 'ok'))
+    return Q, H, estado
+
+
+def _apilar_coeficientes(curvas) -> np.ndarray:
+    """Matriz (M, k) de coeficientes, rellenando con ceros."""
+    k = max(len(c.coeficientes) for c in curvas)
+    coefs = np.zeros((len(curvas), k))
+    for fila, curva in enumerate(curvas):
+        coefs[fila, :len(curva.coeficientes)] = curva.coeficientes
+    return coefs
+
+
+def punto_operacion(
+    bombas: dict,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    metodo_friccion: str = 'colebrook',
+) -> pd.DataFrame:
+    """
+    Punto de operación de cada estación de bombeo.
+
+    Parámetros:
+        bombas: {num_tramo: CurvaBomba} — todas las estaciones del tramo
+            usan la misma bomba
+        metodo_friccion: ver `factor_friccion`
+
+    Retorna DataFrame con una fila por estación: tramo, estacion, Q (m³/s),
+    H (m), potencia_kw (hidráulica) y estado del solver.
+    """
+    geometria = obtener_geometria()
+    filas_tramo, filas_estacion, curvas = [], [], []
+    for t, curva in bombas.items():
+        for e in range(int(geometria.num_estaciones[geometria.indice(t)])):
+            filas_tramo.append(t)
+            filas_estacion.append(e + 1)
+            curvas.append(curva)
+
+    tramos = np.array(filas_tramo)
+    q_max = np.array([c.caudal_max for c in curvas])
+    # Sin raíz positiva: acotar por una velocidad de 10 m/s
+    q_max = np.where(np.isfinite(q_max), q_max, 10.0 * area_seccion(D))
+    Q, H, estado = _intersectar(
+        _apilar_coeficientes(curvas), tramos, q_max, D, rho, mu, epsilon, metodo_friccion
+    )
+    return pd.DataFrame({
+        'tramo': tramos,
+        'estacion': filas_estacion,
+        'Q': Q,
+        'H': H,
+        'potencia_kw': potencia_bomba(rho, Q, H),
+        'estado': estado,
+    })
+
+
+def evaluar_bombas(
+    catalogo: dict,
+    tramos=None,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    Q_objetivo: float | None = None,
+    metodo_friccion: str = 'colebrook',
+) -> pd.DataFrame:
+    """
+    Evalúa en bloque todas las bombas de un catálogo en todos los tramos.
+
+    Parámetros:
+        catalogo: {nombre: CurvaBomba}
+        tramos: números de tramo a evaluar (por defecto, los que tienen bomba)
+        Q_objetivo: si se da, agrega la desviación relativa del caudal
+            de operación respecto al objetivo
+        metodo_friccion: ver `factor_friccion`
+
+    Retorna DataFrame con una fila por (bomba, tramo) y las columnas de
+    `punto_operacion` (sin 'estacion') más 'bomba'.
+    """
+    geometria = obtener_geometria()
+    if tramos is None:
+        tramos = geometria.numeros[~geometria.es_bajada]
+    nombres = list(catalogo)
+    curvas = [catalogo[n] for n in nombres]
+
+    tramo_par = np.tile(np.asarray(tramos), len(nombres))
+    curvas_par = [c for c in curvas for _ in tramos]
+    q_max = np.repeat([c.caudal_max for c in curvas], len(tramos))
+    q_max = np.where(np.isfinite(q_max), q_max, 10.0 * area_seccion(D))
+
+    Q, H, estado = _intersectar(
+        _apilar_coeficientes(curvas_par), tramo_par, q_max, D, rho, mu, epsilon, metodo_friccion
+    )
+    df = pd.DataFrame({
+        'bomba': np.repeat(nombres, len(tramos)),
+        'tramo': tramo_par,
+        'Q': Q,
+        'H': H,
+        'potencia_kw': potencia_bomba(rho, Q, H),
+        'estado': estado,
+    })
+    if Q_objetivo is not None:
+        df['desviacion_Q'] = (Q - Q_objetivo) / Q_objetivo
+    return df
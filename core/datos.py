@@ -3,12 +3,36 @@ datos.py — Parseo del CSV de cálculos hidráulicos.
 
 Lee CALCULOS_HIDRAULICOS.csv y extrae los datos organizados
 en DataFrames de pandas para cada sección del proyecto.
+
+El CSV se convierte una vez a una `TablaCSV` (celdas de texto más la
+cuadrícula numérica ya parseada). La cuadrícula se guarda junto al CSV
+en un archivo .cache.npz identificado por el hash SHA-256 del contenido,
+y en memoria por (mtime, tamaño): mientras el CSV no cambie no se vuelve
+a parsear, y al cambiar se invalida solo.
+
+Las secciones no se leen por número de fila o columna sino según un
+esquema declarativo (`CAMPOS_TRAMO`, `COLUMNAS_RESUMEN`, ...):
+`localizar_secciones` recorre la hoja una vez, indexa las etiquetas y
+ubica cada sección por su ancla ('TRAMOS', 'TRAMO n', ...), así que la
+hoja puede crecer o tener cualquier número de tramos.
 """
 
+import hashlib
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain, groupby
+from operator import itemgetter
+
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+RUTA_CSV = Path(__file__).parent.parent / "source" / "CALCULOS_HIDRAULICOS.csv"
+FORMATO_CACHE = 1  # se incrementa si cambia el parseo: invalida los .cache.npz
+
 
 def _limpiar_numero(valor: str) -> float:
     """Convierte un string con formato latino (1.030,49) a float (1030.49)."""
@@ -23,11 +47,96 @@ def _limpiar_numero(valor: str) -> float:
         return np.nan
 
 
+# Espacios ASCII que str.strip() también quita; cualquier otro carácter
+# raro deja la celda fuera del camino rápido y la resuelve _limpiar_numero
+_ESPACIOS_ASCII = ' \t\n\r\x0b\x0c'
+_PATRON_DECIMAL = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+# Letras y signos ASCII que float() nunca acepta (sí acepta 'inf',
+# 'infinity', 'nan', exponentes y '_'): esas celdas son NaN sin más
+_PATRON_NO_NUMERO = r'[b-dg-hj-mo-su-xzB-DG-HJ-MO-SU-XZ!-*/:-@\[-^`{-~]'
+# Por debajo de esto el costo fijo de pandas supera al ciclo por celda
+_CELDAS_VECTORIZADO = 20_000
+
+
+def parsear_numeros_latinos(valores) -> np.ndarray:
+    """
+    Versión vectorizada de `_limpiar_numero` para columnas completas.
+
+    Da exactamente el mismo resultado que aplicar `_limpiar_numero` a
+    cada celda (NaN para vacíos, faltantes y texto no numérico). Las
+    celdas con forma decimal simple ('1.030,49', '-0,5', '2,1e-3') se
+    convierten en bloque con operaciones de texto de pandas; las demás
+    ('inf', '1_000', espacios Unicode...) pasan una por una por
+    `_limpiar_numero`; el texto que no puede ser número (letras o signos
+    que float() rechaza) se descarta en bloque sin pasar por ahí.
+
+    Parámetros:
+        valores: secuencia, array o Series de strings (se admiten None/NaN)
+
+    Retorna ndarray float64 del mismo largo.
+    """
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores, copy=False)
+    serie = serie.reset_index(drop=True)
+    if not isinstance(serie.dtype, pd.StringDtype):
+        # Como _limpiar_numero: los valores no string se parsean vía str(valor)
+        serie = serie.map(lambda v: v if isinstance(v, str) or pd.isna(v) else str(v)).astype(pd.StringDtype())
+    faltantes = serie.isna().to_numpy()
+    limpio = (serie.str.strip(_ESPACIOS_ASCII)
+              .str.replace('.', '', regex=False)
+              .str.replace(',', '.', regex=False))
+    simple = limpio.str.fullmatch(_PATRON_DECIMAL).fillna(False).to_numpy(dtype=bool)
+
+    resultado = np.full(len(serie), np.nan)
+    # Con pyarrow el cast es nativo (y, como float(), correctamente redondeado)
+    destino = 'float64[pyarrow]' if serie.dtype.storage == 'pyarrow' else 'float64'
+    resultado[simple] = limpio[simple].astype(destino).to_numpy(dtype=np.float64)
+    resto = ~(simple | faltantes | (limpio == '').fillna(False).to_numpy(dtype=bool))
+    if resto.any():
+        dudosas = limpio[resto]
+        posibles = np.flatnonzero(resto)[
+            ~dudosas.str.contains(_PATRON_NO_NUMERO).fillna(False).to_numpy(dtype=bool)]
+        resultado[posibles] = [_limpiar_numero(celda) for celda in serie.iloc[posibles].tolist()]
+    return resultado
+
+
+def _motor_csv() -> str:
+    """'pyarrow' si está instalado (lectura varias veces más rápida), si no 'c'."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'c'
+    return 'pyarrow'
+
+
+def leer_csv_latino(ruta: str | Path, encabezado: bool = True) -> pd.DataFrame:
+    """
+    Lee un CSV grande separado por ';' con números en formato latino.
+
+    Pensado para exportaciones de cientos de miles de filas: las columnas
+    se leen como texto (con el lector de pyarrow si está instalado) y se
+    convierten con `parsear_numeros_latinos`. Una columna con texto pero
+    sin ningún número (p. ej. nombres) se deja como texto. A diferencia
+    de `cargar_csv`, un campo entre comillas puede contener ';'.
+
+    Parámetros:
+        ruta: archivo CSV (UTF-8)
+        encabezado: si la primera fila trae los nombres de las columnas
+
+    Retorna DataFrame con columnas float64 (o str para las de texto).
+    """
+    texto = pd.read_csv(ruta, sep=';', header=0 if encabezado else None, dtype='str',
+                        na_filter=False, encoding='utf-8', engine=_motor_csv())
+    columnas = {}
+    for nombre, columna in texto.items():
+        numeros = parsear_numeros_latinos(columna)
+        solo_texto = np.isnan(numeros).all() and (columna.str.strip() != '').any()
+        columnas[nombre] = columna if solo_texto else numeros
+    return pd.DataFrame(columnas, index=texto.index)
+
+
 def cargar_csv(ruta: str | Path | None = None) -> list[list[str]]:
     """Lee el CSV crudo y devuelve una lista de filas (cada fila es lista de strings)."""
-    if ruta is None:
-        ruta = Path(__file__).parent.parent / "source" / "CALCULOS_HIDRAULICOS.csv"
-    ruta = Path(ruta)
+    ruta = Path(RUTA_CSV if ruta is None else ruta)
 
     filas = []
     with open(ruta, 'r', encoding='utf-8') as f:
@@ -38,242 +147,471 @@ def cargar_csv(ruta: str | Path | None = None) -> list[list[str]]:
     return filas
 
 
-def extraer_perfil_terreno(filas: list[list[str]]) -> pd.DataFrame:
+@dataclass(frozen=True)
+class TablaCSV:
     """
-    Extrae el perfil topográfico del terreno (filas 1-8 del CSV, índice 1-8).
-    Retorna DataFrame con: altura_mapa, largo_mapa, hipotenusa_mapa,
-    altura_real, distancia_acumulada, distancia, altitud.
+    CSV parseado: filas de texto y cuadrícula numérica (R × C).
+
+    `numeros[i, j]` es `_limpiar_numero(filas[i][j])`, o NaN si la
+    celda no existe; `huella` es el SHA-256 del contenido del archivo.
     """
-    datos = []
-    for i in range(1, 9):  # filas 1-8 (después del encabezado)
-        fila = filas[i]
-        datos.append({
-            'altura_mapa': _limpiar_numero(fila[0]),
-            'largo_mapa': _limpiar_numero(fila[1]),
-            'hipotenusa_mapa': _limpiar_numero(fila[2]),
-            'altura_real': _limpiar_numero(fila[3]),
-            'distancia_acumulada': _limpiar_numero(fila[4]),
-            'distancia': _limpiar_numero(fila[5]),
-            'altitud': _limpiar_numero(fila[6]),
-        })
-    return pd.DataFrame(datos)
-
-
-def extraer_parametros_globales(filas: list[list[str]]) -> dict:
-    """Extrae parámetros globales: escala, distancia río, etc."""
-    return {
-        'escala': _limpiar_numero(filas[15][1]),  # fila "Escala"
-        'distancia_rio_mapa': _limpiar_numero(filas[11][2]),  # 7.75
-        'montaña_a_tierra': _limpiar_numero(filas[12][2]),  # 0.46
-        'total_montaña': _limpiar_numero(filas[13][2]),  # 7.29
-        'espacio_tierra_rio': _limpiar_numero(filas[17][2]),  # 87.50 m
-        'distancia_total': _limpiar_numero(filas[34][2]),  # 3433.93 m
-        'num_bombeos': _limpiar_numero(filas[35][2]),  # 7
-        'num_depositos': _limpiar_numero(filas[36][2]),  # 12
-    }
+    filas: list
+    numeros: np.ndarray
+    huella: str
+
+
+def _parsear_numeros(filas: list[list[str]]) -> np.ndarray:
+    """Cuadrícula R × C con el valor numérico de cada celda (NaN si no lo hay)."""
+    largos = np.fromiter(map(len, filas), dtype=int, count=len(filas))
+    numeros = np.full((len(filas), largos.max(initial=0)), np.nan)
+    if largos.sum() < _CELDAS_VECTORIZADO:
+        for i, fila in enumerate(filas):
+            numeros[i, :len(fila)] = [_limpiar_numero(celda) for celda in fila]
+    else:
+        existe = np.arange(numeros.shape[1]) < largos[:, None]
+        numeros[existe] = parsear_numeros_latinos(list(chain.from_iterable(filas)))
+    return numeros
+
+
+def ruta_cache(ruta: str | Path) -> Path:
+    """Archivo binario que acompaña al CSV ('X.csv' → 'X.cache.npz')."""
+    ruta = Path(ruta)
+    return ruta.with_name(ruta.stem + '.cache.npz')
+
+
+def _leer_cache(ruta: Path, huella: str, forma: tuple) -> np.ndarray | None:
+    """Cuadrícula del .cache.npz si corresponde a este contenido, o None."""
+    try:
+        with np.load(ruta_cache(ruta), allow_pickle=False) as npz:
+            if (str(npz['huella']) == huella and int(npz['formato']) == FORMATO_CACHE
+                    and npz['numeros'].shape == forma):
+                return npz['numeros']
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _escribir_cache(ruta: Path, huella: str, numeros: np.ndarray) -> None:
+    """Guarda la cuadrícula (reemplazo atómico); sin permisos de escritura se omite."""
+    destino = ruta_cache(ruta)
+    temporal = destino.with_name(f'.{destino.name}.{os.getpid()}.tmp')
+    try:
+        with open(temporal, 'wb') as archivo:
+            np.savez(archivo, huella=np.array(huella), formato=np.array(FORMATO_CACHE), numeros=numeros)
+        os.replace(temporal, destino)
+    except OSError:
+        temporal.unlink(missing_ok=True)
+
+
+# Caché en memoria: ruta → ((mtime_ns, tamaño), TablaCSV) y huella → resultado
+_TABLAS = {}
+_RESULTADOS = {}
+
+
+def leer_tabla(ruta: str | Path | None = None) -> TablaCSV:
+    """
+    Lee y parsea el CSV, reutilizando el parseo mientras no cambie.
+
+    Si el mtime y el tamaño coinciden con la última lectura se retorna la
+    misma tabla sin abrir el archivo. Si no, se lee, se calcula el hash y
+    la cuadrícula numérica se toma del .cache.npz cuando su hash coincide;
+    en otro caso se parsea y se reescribe el .cache.npz.
+    """
+    ruta = Path(RUTA_CSV if ruta is None else ruta).resolve()
+    estado = os.stat(ruta)
+    firma = (estado.st_mtime_ns, estado.st_size)
+    previo = _TABLAS.get(ruta)
+    if previo is not None and previo[0] == firma:
+        return previo[1]
+
+    contenido = ruta.read_bytes()
+    huella = hashlib.sha256(contenido).hexdigest()
+    if previo is not None and previo[1].huella == huella:
+        _TABLAS[ruta] = (firma, previo[1])  # solo cambió el mtime
+        return previo[1]
+
+    filas = [linea.split(';') for linea in contenido.decode('utf-8').splitlines()]
+    forma = (len(filas), max(map(len, filas), default=0))
+    numeros = _leer_cache(ruta, huella, forma)
+    if numeros is None:
+        numeros = _parsear_numeros(filas)
+        _escribir_cache(ruta, huella, numeros)
+    numeros.flags.writeable = False
+    tabla = TablaCSV(filas=filas, numeros=numeros, huella=huella)
+    _TABLAS[ruta] = (firma, tabla)
+    return tabla
+
+
+def limpiar_cache() -> None:
+    """Vacía las cachés en memoria (los .cache.npz quedan en disco)."""
+    _TABLAS.clear()
+    _RESULTADOS.clear()
+
+
+# --- Esquema del CSV ---
+#
+# Las secciones se ubican por sus etiquetas, no por número de fila o
+# columna. Las etiquetas se comparan normalizadas (minúsculas, sin tildes
+# ni espacios repetidos). Un valor escalar es el primer número a la
+# derecha de su etiqueta dentro del bloque de la sección.
+
+@dataclass(frozen=True)
+class Campo:
+    """Valor escalar: `clave` en el resultado y etiquetas que lo anteceden."""
+    clave: str
+    etiquetas: tuple          # alternativas, en orden de preferencia
+    ocurrencia: int = 0       # n-ésima aparición en el bloque (etiquetas repetidas)
+
+
+ENCABEZADO_PERFIL = ('altura', 'largo', 'hipotenusa')
+COLUMNAS_PERFIL = ('altura_mapa', 'largo_mapa', 'hipotenusa_mapa', 'altura_real',
+                   'distancia_acumulada', 'distancia', 'altitud')
+
+CAMPOS_PARAMETROS = (
+    Campo('escala', ('escala',)),
+    Campo('distancia_rio_mapa', ('distancia del rio',)),
+    Campo('montaña_a_tierra', ('de montana a tierra',)),
+    Campo('total_montaña', ('total montana',)),
+    Campo('espacio_tierra_rio', ('espacio entre tierra y rio',)),
+    Campo('distancia_total', ('distancia total',)),
+    Campo('num_bombeos', ('numero de bombeos',)),
+    Campo('num_depositos', ('numero de depositos',)),
+)
+
+# Tabla resumen: ancla 'TRAMOS' y encabezado → columna
+ANCLA_RESUMEN = 'tramos'
+COLUMNAS_RESUMEN = {
+    'distancia de tuberias': 'distancia',
+    'altura': 'altura',
+    'pendiente': 'pendiente',
+    'longitud tuberia': 'longitud_tuberia',
+}
+
+# 'TRAMO n' es el ancla del detalle si debajo dice 'PENDIENTE', y de la
+# tabla de sub-distancias si a la derecha dice 'DISTANCIA EN METROS'
+PATRON_TRAMO = re.compile(r'tramo (\d+)')
+ETIQUETA_DETALLE = 'pendiente'
+ETIQUETA_SUBTRAMOS = 'distancia en metros'
+COLUMNAS_SUBTRAMOS = {
+    'distancia en metros': 'distancia',
+    'total metros': 'acumulado',
+    'altura': 'altura',
+}
+CAMPOS_TRAMO = (
+    Campo('pendiente', ('pendiente',)),
+    Campo('densidad', ('densidad',)),
+    Campo('caudal', ('caudal',)),
+    Campo('viscosidad', ('viscosidad',)),
+    Campo('longitud_tuberia', ('longitud de tuberia',)),
+    Campo('rugosidad', ('eta',)),
+    Campo('diametro', ('diametro',)),
+    Campo('area', ('area',)),
+    Campo('velocidad', ('velocidad',)),
+    Campo('carga_cinetica', ('carga c',)),
+    Campo('reynolds', ('re',)),
+    Campo('f_colebrook', ('factor friccion colebrok',)),
+    Campo('f_haaland', ('factor friccion halland',)),
+    Campo('perdidas_darcy_crane', ('perdidas darcy',)),
+    Campo('perdidas_darcy_haaland', ('perdidas darcy',), ocurrencia=1),
+    Campo('z', ('altura',)),                       # fila 'z | altura | valor'
+    Campo('carga_total_estacion', ('carga total por estacion',)),
+    Campo('carga_total', ('carga total', 'total')),
+    Campo('potencia_kw', ('potencia',)),
+    Campo('potencia_hp', ('potencia en hp',)),
+)
+ENCABEZADOS_ACCESORIOS = ('accesorios', 'accesorios por estacion')
+COLUMNAS_ACCESORIOS = ['nombre', 'cantidad', 'K', 'carga_m']
+
+
+@dataclass(frozen=True)
+class Bloque:
+    """Rectángulo de celdas: filas [fila_inicio, fila_fin) × columnas [col_inicio, col_fin)."""
+    fila_inicio: int
+    fila_fin: int
+    col_inicio: int
+    col_fin: int
+
 
+@dataclass(frozen=True)
+class Secciones:
+    """
+    Índice de la hoja: dónde está cada sección.
+
+    `etiquetas` lleva cada etiqueta normalizada a sus posiciones (fila,
+    columna) en orden de lectura. `perfil`, `resumen` y `subtramos` son
+    la celda del encabezado de cada tabla (None o ausente si no está);
+    `tramos` es el bloque de detalle de cada tramo, de cualquier número,
+    y `etiquetas_tramo` el índice de etiquetas de cada bloque.
+    """
+    etiquetas: dict
+    perfil: tuple | None
+    resumen: tuple | None
+    tramos: dict
+    subtramos: dict
+    etiquetas_tramo: dict
+
+
+@lru_cache(maxsize=4096)
+def _normalizar(texto: str) -> str:
+    """'  Accesorios por estación ' → 'accesorios por estacion'."""
+    sin_tildes = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sin_tildes.casefold().split())
+
+
+def localizar_secciones(tabla: TablaCSV) -> Secciones:
+    """
+    Recorre las celdas de texto una sola vez y ubica todas las secciones.
 
-def extraer_resumen_tramos(filas: list[list[str]]) -> pd.DataFrame:
+    Cada bloque de detalle va desde su 'TRAMO n' hasta el siguiente
+    'TRAMO' de la misma fila (a la derecha) y el siguiente 'TRAMO' que
+    caiga en sus columnas (hacia abajo), o hasta el borde de la hoja.
     """
-    Extrae tabla resumen de tramos 1-7 (filas 21-27).
+    alto, ancho = tabla.numeros.shape
+    vacias = np.isnan(tabla.numeros)
+    etiquetas, en_celda = {}, {}
+    for i, fila in enumerate(tabla.filas):
+        for j, celda in enumerate(fila):
+            if celda and not celda.isspace() and vacias[i, j]:
+                etiqueta = en_celda[i, j] = _normalizar(celda)
+                etiquetas.setdefault(etiqueta, []).append((i, j))
+
+    perfil = next((
+        (i, j) for i, j in etiquetas.get(ENCABEZADO_PERFIL[0], ())
+        if all(en_celda.get((i, j + k)) == e for k, e in enumerate(ENCABEZADO_PERFIL))
+    ), None)
+    resumen = next((
+        (i, j) for i, j in etiquetas.get(ANCLA_RESUMEN, ())
+        if en_celda.get((i, j + 1)) in COLUMNAS_RESUMEN
+    ), None)
+
+    anclas = sorted((i, j, int(m[1])) for etiqueta, posiciones in etiquetas.items()
+                    if (m := PATRON_TRAMO.fullmatch(etiqueta)) for i, j in posiciones)
+    detalles = [(i, j, n) for i, j, n in anclas if en_celda.get((i + 1, j)) == ETIQUETA_DETALLE]
+    subtramos = {}
+    for i, j, n in anclas:
+        if en_celda.get((i, j + 1)) == ETIQUETA_SUBTRAMOS:
+            subtramos.setdefault(n, (i, j))
+
+    # Bordes de cada bloque: a la derecha, el siguiente detalle de la misma
+    # fila; abajo, el 'TRAMO' más cercano en sus columnas (barrido de abajo
+    # hacia arriba guardando por columna la fila del último 'TRAMO' visto)
+    col_fin = {(i, j): siguiente[1] if siguiente and siguiente[0] == i else ancho
+               for (i, j, _), siguiente in zip(detalles, [*detalles[1:], None])}
+    debajo = np.full(ancho, alto)
+    bloques = {}
+    for i, en_fila in groupby(reversed(anclas), key=itemgetter(0)):
+        en_fila = list(en_fila)
+        for _, j, _ in en_fila:
+            if (i, j) in col_fin:
+                bloques[i, j] = Bloque(i + 1, int(debajo[j:col_fin[i, j]].min()), j, col_fin[i, j])
+        for _, j, _ in en_fila:
+            debajo[j] = i
+
+    # Cada etiqueta pertenece al bloque de cuyo 'TRAMO' está más cerca
+    # hacia arriba: se pintan los bloques en orden de lectura sobre una
+    # cuadrícula de dueños y los posteriores pisan a los anteriores
+    tramos = {}
+    duenos = np.full((alto, ancho), -1, dtype=np.int32)
+    for i, j, n in detalles:
+        if n not in tramos:
+            bloque = tramos[n] = bloques[i, j]
+            duenos[bloque.fila_inicio:bloque.fila_fin, bloque.col_inicio:bloque.col_fin] = n
+    etiquetas_tramo = {n: {} for n in tramos}
+    for (i, j), etiqueta in en_celda.items():
+        if (n := int(duenos[i, j])) >= 0:
+            etiquetas_tramo[n].setdefault(etiqueta, []).append((i, j))
+
+    return Secciones(etiquetas=etiquetas, perfil=perfil, resumen=resumen,
+                     tramos=dict(sorted(tramos.items())), subtramos=dict(sorted(subtramos.items())),
+                     etiquetas_tramo=etiquetas_tramo)
+
+
+def _numero_a_la_derecha(tabla: TablaCSV, fila: int, col: int, col_fin: int) -> float:
+    """Primer número a la derecha de (fila, col) sin pasar otra etiqueta, o NaN."""
+    celdas = tabla.filas[fila]
+    for k in range(col + 1, min(col_fin, len(celdas))):
+        valor = tabla.numeros[fila, k]
+        if not np.isnan(valor):
+            return float(valor)
+        if celdas[k].strip():
+            break
+    return np.nan
+
+
+def _leer_campos(tabla: TablaCSV, etiquetas: dict, campos, col_fin: int) -> dict:
+    """{clave: valor} de cada `Campo` según el índice `etiquetas` (NaN si falta la etiqueta)."""
+    valores = {}
+    for campo in campos:
+        valores[campo.clave] = np.nan
+        for etiqueta in campo.etiquetas:
+            posiciones = etiquetas.get(etiqueta, ())
+            if len(posiciones) > campo.ocurrencia:
+                i, j = posiciones[campo.ocurrencia]
+                valores[campo.clave] = _numero_a_la_derecha(tabla, i, j, col_fin)
+                break
+    return valores
+
+
+def _leer_columnas(tabla: TablaCSV, fila: int, col: int, columnas: dict) -> dict:
+    """{nombre: columna de la hoja} de los encabezados seguidos a la derecha de (fila, col)."""
+    ubicadas = {}
+    for k in range(col + 1, tabla.numeros.shape[1]):
+        etiqueta = _normalizar(tabla.filas[fila][k]) if k < len(tabla.filas[fila]) else ''
+        if etiqueta not in columnas:
+            break
+        ubicadas.setdefault(columnas[etiqueta], k)
+    return ubicadas
+
+
+def _tabla_numerica(tabla: TablaCSV, filas: list, ubicadas: dict, nombres) -> pd.DataFrame:
+    """DataFrame con las columnas `nombres` (NaN si no se ubicó el encabezado)."""
+    n = tabla.numeros
+    return pd.DataFrame({
+        nombre: n[filas, ubicadas[nombre]] if nombre in ubicadas else np.full(len(filas), np.nan)
+        for nombre in nombres
+    })
+
+
+def _filas_con_numero(tabla: TablaCSV, desde: int, col: int) -> list:
+    """Filas consecutivas desde `desde` con un número en la columna `col`."""
+    columna = tabla.numeros[desde:, col]
+    vacias = np.flatnonzero(np.isnan(columna))
+    return list(range(desde, desde + (vacias[0] if len(vacias) else len(columna))))
+
+
+def extraer_perfil_terreno(tabla: TablaCSV, secciones: Secciones) -> pd.DataFrame:
+    """
+    Perfil topográfico: filas numéricas bajo el encabezado 'Altura | largo | hipotenusa'.
+    Columnas: altura_mapa, largo_mapa, hipotenusa_mapa, altura_real,
+    distancia_acumulada, distancia, altitud.
+    """
+    if secciones.perfil is None:
+        return pd.DataFrame(columns=list(COLUMNAS_PERFIL), dtype=float)
+    i, j = secciones.perfil
+    filas = _filas_con_numero(tabla, i + 1, j)
+    return pd.DataFrame(tabla.numeros[filas, j:j + len(COLUMNAS_PERFIL)], columns=list(COLUMNAS_PERFIL))
+
+
+def extraer_resumen_tramos(tabla: TablaCSV, secciones: Secciones) -> pd.DataFrame:
+    """
+    Tabla resumen bajo 'TRAMOS' (una fila por tramo, tantas como haya).
     Columnas: tramo, distancia, altura, pendiente, longitud_tuberia.
     """
-    datos = []
-    for i in range(21, 28):
-        fila = filas[i]
-        datos.append({
-            'tramo': int(_limpiar_numero(fila[0])),
-            'distancia': _limpiar_numero(fila[1]),
-            'altura': _limpiar_numero(fila[2]),
-            'pendiente': _limpiar_numero(fila[3]),
-            'longitud_tuberia': _limpiar_numero(fila[4]),
-        })
-    return pd.DataFrame(datos)
-
-
-def extraer_tramo_8_distancias(filas: list[list[str]]) -> pd.DataFrame:
-    """Extrae las sub-distancias del tramo 8 (filas 85-92)."""
-    nombres = []
-    for i in range(85, 92):
-        fila = filas[i]
-        nombres.append({
-            'segmento': fila[0].strip() if fila[0].strip() else '',
-            'distancia': _limpiar_numero(fila[1]),
-            'acumulado': _limpiar_numero(fila[2]),
-            'altura': _limpiar_numero(fila[3]),
-        })
-    return pd.DataFrame(nombres)
-
-
-def extraer_accesorios_tramo(filas: list[list[str]], col_inicio: int,
-                              fila_inicio: int, fila_fin: int) -> pd.DataFrame:
+    nombres = list(COLUMNAS_RESUMEN.values())
+    if secciones.resumen is None:
+        return pd.DataFrame(columns=['tramo', *nombres])
+    i, j = secciones.resumen
+    filas = _filas_con_numero(tabla, i + 1, j)
+    resumen = _tabla_numerica(tabla, filas, _leer_columnas(tabla, i, j, COLUMNAS_RESUMEN), nombres)
+    resumen.insert(0, 'tramo', tabla.numeros[filas, j].astype(int))
+    return resumen
+
+
+def extraer_subtramos(tabla: TablaCSV, secciones: Secciones, tramo: int) -> pd.DataFrame:
+    """
+    Sub-distancias de un tramo: filas bajo 'TRAMO n | DISTANCIA EN METROS'
+    hasta la fila 'TOTAL...' o una fila vacía.
+    Columnas: segmento, distancia, acumulado, altura.
     """
-    Extrae la tabla de accesorios de un tramo dado el rango de columnas y filas.
+    nombres = list(COLUMNAS_SUBTRAMOS.values())
+    if tramo not in secciones.subtramos:
+        return pd.DataFrame(columns=['segmento', *nombres])
+    i, j = secciones.subtramos[tramo]
+    ubicadas = _leer_columnas(tabla, i, j, COLUMNAS_SUBTRAMOS)
+    cols = [j, *ubicadas.values()]
+    filas = []
+    for r in range(i + 1, len(tabla.filas)):
+        nombre = tabla.filas[r][j].strip() if j < len(tabla.filas[r]) else ''
+        vacia = not nombre and np.isnan(tabla.numeros[r, cols]).all()
+        if vacia or _normalizar(nombre).startswith('total'):
+            break
+        filas.append(r)
+    distancias = _tabla_numerica(tabla, filas, ubicadas, nombres)
+    distancias.insert(0, 'segmento', [tabla.filas[r][j].strip() for r in filas])
+    return distancias
+
+
+def extraer_accesorios_tramo(tabla: TablaCSV, secciones: Secciones, tramo: int) -> tuple[pd.DataFrame, float]:
     """
-    datos = []
-    for i in range(fila_inicio, fila_fin):
-        fila = filas[i]
-        if col_inicio + 3 < len(fila):
-            nombre = fila[col_inicio].strip() if fila[col_inicio].strip() else None
-            if nombre and nombre not in ('Accesorios', 'Accesorios por estación'):
-                cantidad = _limpiar_numero(fila[col_inicio + 1])
-                k_valor = _limpiar_numero(fila[col_inicio + 2])
-                carga = _limpiar_numero(fila[col_inicio + 3])
-                if not np.isnan(cantidad):
-                    datos.append({
-                        'nombre': nombre,
-                        'cantidad': int(cantidad),
-                        'K': k_valor,
-                        'carga_m': carga,
-                    })
-    return pd.DataFrame(datos) if datos else pd.DataFrame(
-        columns=['nombre', 'cantidad', 'K', 'carga_m']
-    )
-
-
-def extraer_accesorios_tramo_8(filas: list[list[str]]) -> pd.DataFrame:
-    """Extrae accesorios del tramo 8 (filas 98-103, columnas 5-8)."""
-    return extraer_accesorios_tramo(filas, col_inicio=5, fila_inicio=98, fila_fin=104)
-
-
-def extraer_datos_completos() -> dict:
+    Tabla de accesorios de un tramo (bajo 'Accesorios' en su bloque).
+
+    Lee 'nombre | cantidad | K | carga' hasta la fila de totales (sin
+    nombre) o hasta una fila con nombre pero sin cantidad. Retorna
+    (DataFrame, K total de la fila de totales o NaN).
+    """
+    bloque, etiquetas = secciones.tramos[tramo], secciones.etiquetas_tramo[tramo]
+    encabezado = min((p for e in ENCABEZADOS_ACCESORIOS for p in etiquetas.get(e, ())), default=None)
+    filas, K_total = [], np.nan
+    if encabezado is not None:
+        i, j = encabezado
+        for r in range(i + 1, bloque.fila_fin):
+            fila = tabla.filas[r]
+            if j + 3 >= len(fila):
+                continue
+            nombre = fila[j].strip()
+            cantidad, k_valor, carga = tabla.numeros[r, j + 1:j + 4].tolist()
+            if nombre:
+                if np.isnan(cantidad):
+                    break
+                filas.append((nombre, int(cantidad), k_valor, carga))
+            elif not (np.isnan(k_valor) and np.isnan(carga)):
+                K_total = k_valor  # fila de totales
+                break
+    if not filas:
+        return pd.DataFrame(columns=COLUMNAS_ACCESORIOS), K_total
+    return pd.DataFrame(dict(zip(COLUMNAS_ACCESORIOS, map(list, zip(*filas))))), K_total
+
+
+def extraer_tramo(tabla: TablaCSV, secciones: Secciones, tramo: int) -> dict:
+    """
+    Datos de un tramo desde su bloque de detalle.
+
+    Además de los `CAMPOS_TRAMO` incluye 'accesorios', 'K_total',
+    'num_estaciones' (carga total / carga por estación, 1 si no hay
+    estaciones) y 'tipo' ('bomba' si tiene potencia, si no
+    'valvula_estrangulamiento').
+    """
+    bloque = secciones.tramos[tramo]
+    detalle = _leer_campos(tabla, secciones.etiquetas_tramo[tramo], CAMPOS_TRAMO, bloque.col_fin)
+    detalle['accesorios'], detalle['K_total'] = extraer_accesorios_tramo(tabla, secciones, tramo)
+    estaciones = detalle['carga_total'] / detalle['carga_total_estacion']
+    detalle['num_estaciones'] = int(round(estaciones)) if np.isfinite(estaciones) else 1
+    detalle['tipo'] = 'bomba' if detalle['potencia_kw'] > 0 else 'valvula_estrangulamiento'
+    return detalle
+
+
+def extraer_datos_completos(ruta: str | Path | None = None) -> dict:
     """
     Función principal: carga y organiza todos los datos del CSV.
     
     Retorna un diccionario con:
     - 'perfil_terreno': DataFrame del perfil topográfico
     - 'parametros': dict con parámetros globales
-    - 'resumen_tramos': DataFrame resumen de 7 tramos
-    - 'tramo_8_distancias': DataFrame sub-distancias tramo 8
-    - 'tramos_detalle': dict con datos detallados por tramo (1-8)
-    """
-    filas = cargar_csv()
-    
-    perfil = extraer_perfil_terreno(filas)
-    parametros = extraer_parametros_globales(filas)
-    resumen = extraer_resumen_tramos(filas)
-    tramo8_dist = extraer_tramo_8_distancias(filas)
-    
-    # Extraer datos detallados por tramo (columnas del CSV en bloques de 5)
-    tramos_detalle = {}
-    
-    # Tramos 1-7: cada uno ocupa 5 columnas (cols 0-4, 5-9, 10-14, 15-19, 20-24, 25-29, 30-33)
-    for t in range(1, 8):
-        col_base = (t - 1) * 5
-        detalle = {
-            'pendiente': _limpiar_numero(filas[43][col_base + 1]),
-            'densidad': _limpiar_numero(filas[43][col_base + 3]),
-            'caudal': _limpiar_numero(filas[44][col_base + 1]),
-            'viscosidad': _limpiar_numero(filas[44][col_base + 3]),
-            'longitud_tuberia': _limpiar_numero(filas[45][col_base + 1]),
-            'rugosidad': _limpiar_numero(filas[45][col_base + 3]),
-            'diametro': _limpiar_numero(filas[46][col_base + 1]),
-            'area': _limpiar_numero(filas[48][col_base + 1]),
-            'velocidad': _limpiar_numero(filas[49][col_base + 1]),
-            'carga_cinetica': _limpiar_numero(filas[50][col_base + 1]),
-            'reynolds': _limpiar_numero(filas[51][col_base + 1]),
-            'f_colebrook': _limpiar_numero(filas[52][col_base + 1]),
-            'f_haaland': _limpiar_numero(filas[53][col_base + 1]),
-            'perdidas_darcy_crane': _limpiar_numero(filas[54][col_base + 1]),
-            'perdidas_darcy_haaland': _limpiar_numero(filas[55][col_base + 1]),
-        }
-        # Accesorios
-        detalle['accesorios'] = extraer_accesorios_tramo(
-            filas, col_inicio=col_base, fila_inicio=58, fila_fin=63
-        )
-        tramos_detalle[t] = detalle
-    
-    # Datos de potencia y carga por tramo (extraídos manualmente del CSV)
-    # Tramo 1
-    tramos_detalle[1]['z'] = 100.0
-    tramos_detalle[1]['carga_total'] = 102.35
-    tramos_detalle[1]['potencia_kw'] = 25.05
-    tramos_detalle[1]['potencia_hp'] = 33.59
-    tramos_detalle[1]['num_estaciones'] = 1
-    tramos_detalle[1]['tipo'] = 'bomba'
-    
-    # Tramo 2
-    tramos_detalle[2]['z'] = 100.0
-    tramos_detalle[2]['carga_total_estacion'] = 101.65
-    tramos_detalle[2]['carga_total'] = 203.30
-    tramos_detalle[2]['potencia_kw'] = 24.88
-    tramos_detalle[2]['potencia_hp'] = 33.36
-    tramos_detalle[2]['num_estaciones'] = 2
-    tramos_detalle[2]['tipo'] = 'bomba'
-    
-    # Tramo 3
-    tramos_detalle[3]['z'] = 100.0
-    tramos_detalle[3]['carga_total_estacion'] = 101.58
-    tramos_detalle[3]['carga_total'] = 203.15
-    tramos_detalle[3]['potencia_kw'] = 31.08
-    tramos_detalle[3]['potencia_hp'] = 41.68
-    tramos_detalle[3]['num_estaciones'] = 2
-    tramos_detalle[3]['tipo'] = 'bomba'
-    
-    # Tramo 4
-    tramos_detalle[4]['z'] = 0.0
-    tramos_detalle[4]['carga_total'] = 2.89
-    tramos_detalle[4]['potencia_kw'] = 0.88
-    tramos_detalle[4]['potencia_hp'] = 1.19
-    tramos_detalle[4]['num_estaciones'] = 1
-    tramos_detalle[4]['tipo'] = 'bomba'
-    
-    # Tramo 5
-    tramos_detalle[5]['z'] = 0.0
-    tramos_detalle[5]['carga_total_estacion'] = 1.43
-    tramos_detalle[5]['carga_total'] = 2.87
-    tramos_detalle[5]['potencia_kw'] = 0.0
-    tramos_detalle[5]['potencia_hp'] = 0.0
-    tramos_detalle[5]['num_estaciones'] = 1
-    tramos_detalle[5]['tipo'] = 'valvula_estrangulamiento'
-    
-    # Tramo 6
-    tramos_detalle[6]['z'] = 0.0
-    tramos_detalle[6]['carga_total_estacion'] = 1.33
-    tramos_detalle[6]['carga_total'] = 2.66
-    tramos_detalle[6]['potencia_kw'] = 0.0
-    tramos_detalle[6]['potencia_hp'] = 0.0
-    tramos_detalle[6]['num_estaciones'] = 1
-    tramos_detalle[6]['tipo'] = 'valvula_estrangulamiento'
-    
-    # Tramo 7
-    tramos_detalle[7]['z'] = 0.0
-    tramos_detalle[7]['carga_total'] = 1.38
-    tramos_detalle[7]['potencia_kw'] = 0.0
-    tramos_detalle[7]['potencia_hp'] = 0.0
-    tramos_detalle[7]['num_estaciones'] = 1
-    tramos_detalle[7]['tipo'] = 'valvula_estrangulamiento'
-    
-    # Tramo 8
-    tramos_detalle[8] = {
-        'pendiente': 0,
-        'densidad': 998,
-        'caudal': 0.025,
-        'viscosidad': 0.001,
-        'longitud_tuberia': 1911.52,
-        'rugosidad': 0.000046,
-        'diametro': 0.1541,
-        'area': 0.01865,
-        'velocidad': 1.34,
-        'carga_cinetica': 0.0916,
-        'reynolds': 206147.48,
-        'f_colebrook': 0.017649,
-        'f_haaland': 0.017438,
-        'perdidas_darcy_crane': 2.2144,
-        'perdidas_darcy_haaland': 2.1879,
-        'z': 100.0,
-        'carga_total': 120.57,
-        'potencia_kw': 36.89,
-        'potencia_hp': 49.47,
-        'num_estaciones': 1,
-        'tipo': 'bomba',
-        'accesorios': extraer_accesorios_tramo_8(filas),
-    }
+    - 'resumen_tramos': DataFrame resumen (una fila por tramo)
+    - 'subtramos': dict tramo → DataFrame de sub-distancias
+    - 'tramo_8_distancias': sub-distancias del tramo 8 (vacío si no hay)
+    - 'tramos_detalle': dict con datos detallados por tramo (todos los
+      que tenga la hoja)
     
+    El resultado se guarda en memoria por hash del contenido del CSV y
+    se comparte entre llamadas: no lo modifique (copie antes si hace falta).
+    """
+    tabla = leer_tabla(ruta)
+    resultado = _RESULTADOS.get(tabla.huella)
+    if resultado is None:
+        resultado = _RESULTADOS[tabla.huella] = _extraer(tabla)
+    return resultado
+
+
+def _extraer(tabla: TablaCSV) -> dict:
+    """Construye el resultado de `extraer_datos_completos` desde la tabla parseada."""
+    secciones = localizar_secciones(tabla)
+    subtramos = {n: extraer_subtramos(tabla, secciones, n) for n in secciones.subtramos}
     return {
-        'perfil_terreno': perfil,
-        'parametros': parametros,
-        'resumen_tramos': resumen,
-        'tramo_8_distancias': tramo8_dist,
-        'tramos_detalle': tramos_detalle,
+        'perfil_terreno': extraer_perfil_terreno(tabla, secciones),
+        'parametros': _leer_campos(tabla, secciones.etiquetas, CAMPOS_PARAMETROS, tabla.numeros.shape[1]),
+        'resumen_tramos': extraer_resumen_tramos(tabla, secciones),
+        'subtramos': subtramos,
+        'tramo_8_distancias': subtramos[8] if 8 in subtramos else extraer_subtramos(tabla, secciones, 8),
+        'tramos_detalle': {n: extraer_tramo(tabla, secciones, n) for n in secciones.tramos},
     }
@@ -0,0 +1,350 @@
+"""
+epanet.py — Lectura y escritura de modelos EPANET (.inp).
+
+`leer_inp` convierte un archivo .inp en una `Red` (ver `core.red`)
+leyendo línea por línea, sin cargar el archivo completo; `escribir_inp`
+hace lo inverso escribiendo sección por sección. `definiciones_desde_red`
+recupera la estructura de `obtener_definicion_tramos` de una cadena de
+tramos exportada (los enlaces llevan el tramo en la sección [TAGS]).
+
+Equivalencias:
+    [JUNCTIONS], [DEMANDS]   uniones con demanda (base o suma de [DEMANDS])
+    [RESERVOIRS], [TANKS]    tanques (carga fija; en TANKS, nivel inicial)
+    [PIPES]                  tuberías (D-W: rugosidad; H-W: coeficiente C)
+    [PUMPS] HEAD curva       bomba H = H₀ - r·Qⁿ (curva de 1 punto o de
+                             3 puntos con Q = 0; otras se ajustan a n = 2)
+    [VALVES] FCV / TCV       válvula de caudal fijo / pérdida K
+Al escribir, las bombas de caudal fijo se exportan con una curva de un
+punto en (Q, carga calculada por `resolver_red`), de modo que EPANET
+reproduce el mismo punto de operación.
+
+No se modelan: simulación en periodo extendido (patrones, controles),
+bombas de potencia constante, válvulas PRV/PSV/PBV/GPV (error, o
+abiertas con `valvulas_abiertas=True`), válvulas de retención ni la
+fórmula de Chezy-Manning.
+"""
+
+import math
+
+import numpy as np
+
+from core.red import Red, construir_red, resolver_red
+
+# m³/s por unidad de caudal de EPANET
+UNIDADES_CAUDAL = {
+    'CFS': 0.028316846592, 'GPM': 6.30901964e-05, 'MGD': 0.0438126364,
+    'IMGD': 0.0526167, 'AFD': 0.01427641,
+    'LPS': 1e-3, 'LPM': 1e-3 / 60, 'MLD': 1e3 / 86400, 'CMH': 1 / 3600, 'CMD': 1 / 86400,
+}
+_UNIDADES_EEUU = ('CFS', 'GPM', 'MGD', 'IMGD', 'AFD')
+VISCOSIDAD_REFERENCIA = 1.0e-6  # m²/s (1 cSt), base de VISCOSITY en EPANET
+DENSIDAD_REFERENCIA = 998.0     # kg/m³, base de SPECIFIC GRAVITY (agua a 20 °C)
+
+
+def _escalas(unidades: str) -> dict:
+    """Factores a SI de cada magnitud según las unidades de caudal."""
+    if unidades not in UNIDADES_CAUDAL:
+        raise ValueError(f"Unidades de caudal desconocidas: {unidades!r} "
+                         f"(opciones: {', '.join(UNIDADES_CAUDAL)})")
+    eeuu = unidades in _UNIDADES_EEUU
+    return {
+        'caudal': UNIDADES_CAUDAL[unidades],
+        'longitud': 0.3048 if eeuu else 1.0,        # ft | m
+        'diametro': 0.0254 if eeuu else 1e-3,       # in | mm
+        'rugosidad': 0.3048e-3 if eeuu else 1e-3,   # milipies | mm (D-W)
+    }
+
+
+def _registros(archivo):
+    """Genera (sección, campos) por cada línea con datos, sin comentarios."""
+    seccion = None
+    for linea in archivo:
+        linea = linea.split(';', 1)[0].strip()
+        if not linea:
+            continue
+        if linea.startswith('['):
+            seccion = linea.strip('[]').strip().upper()
+            continue
+        if seccion != 'TITLE':
+            yield seccion, linea.split()
+
+
+def _ajustar_curva(puntos) -> list[float]:
+    """Parámetros (H₀, r, n) de H = H₀ - r·Qⁿ para los puntos de una curva."""
+    Q, H = np.array(puntos, dtype=float).T
+    if len(Q) == 1:
+        # Convención de EPANET: cierre a 4/3 de la carga y caudal máximo 2Q
+        return [4.0 / 3.0 * H[0], H[0] / (3.0 * Q[0]**2), 2.0]
+    if len(Q) == 3 and Q[0] == 0:
+        n = math.log((H[0] - H[2]) / (H[0] - H[1])) / math.log(Q[2] / Q[1])
+        return [H[0], (H[0] - H[1]) / Q[1]**n, n]
+    # Curva de varios puntos: mínimos cuadrados con n = 2
+    A = np.column_stack([np.ones_like(Q), -Q**2])
+    H0, r = np.linalg.lstsq(A, H, rcond=None)[0]
+    return [H0, r, 2.0]
+
+
+def leer_inp(ruta, valvulas_abiertas: bool = False) -> tuple[Red, dict]:
+    """
+    Lee un modelo EPANET .inp línea por línea.
+
+    Parámetros:
+        valvulas_abiertas: las válvulas PRV/PSV/PBV/GPV se modelan como
+            abiertas (pérdida K = su pérdida menor) en vez de lanzar error
+
+    Retorna (red, opciones); opciones tiene 'unidades', 'perdidas'
+    ('D-W' o 'H-W'), 'rho' y 'mu' (de SPECIFIC GRAVITY y VISCOSITY).
+
+    Lanza ValueError con los elementos no soportados.
+    """
+    uniones, demandas, tanques = [], {}, []
+    tuberias, bombas, valvulas = [], [], []
+    curvas, etiquetas, cerrados = {}, {}, set()
+    opciones = {'UNITS': 'GPM', 'HEADLOSS': 'H-W', 'VISCOSITY': '1.0', 'SPECIFIC': '1.0'}
+
+    with open(ruta, encoding='utf-8', errors='replace') as archivo:
+        for seccion, c in _registros(archivo):
+            if seccion == 'JUNCTIONS':
+                uniones.append((c[0], float(c[1]), float(c[2]) if len(c) > 2 else 0.0))
+            elif seccion == 'DEMANDS':
+                demandas[c[0]] = demandas.get(c[0], 0.0) + float(c[1])
+            elif seccion == 'RESERVOIRS':
+                tanques.append((c[0], float(c[1]), 0.0))
+            elif seccion == 'TANKS':
+                tanques.append((c[0], float(c[1]), float(c[2])))
+            elif seccion == 'PIPES':
+                if len(c) > 7 and c[7].upper() == 'CLOSED':
+                    cerrados.add(c[0])
+                tuberias.append((c[0], c[1], c[2], float(c[3]), float(c[4]), float(c[5]),
+                                 float(c[6]) if len(c) > 6 else 0.0))
+            elif seccion == 'PUMPS':
+                parametros = {c[i].upper(): c[i + 1] for i in range(3, len(c) - 1, 2)}
+                if 'HEAD' not in parametros:
+                    raise ValueError(f"Bomba {c[0]!r}: solo se soportan bombas con curva (HEAD)")
+                bombas.append((c[0], c[1], c[2], parametros['HEAD'], float(parametros.get('SPEED', 1.0))))
+            elif seccion == 'VALVES':
+                valvulas.append((c[0], c[1], c[2], float(c[3]), c[4].upper(), float(c[5]),
+                                 float(c[6]) if len(c) > 6 else 0.0))
+            elif seccion == 'CURVES':
+                curvas.setdefault(c[0], []).append((float(c[1]), float(c[2])))
+            elif seccion == 'TAGS' and c[0].upper() == 'LINK' and len(c) > 2:
+                etiquetas[c[1]] = c[2]
+            elif seccion == 'STATUS' and c[1].upper() == 'CLOSED':
+                cerrados.add(c[0])
+            elif seccion == 'OPTIONS':
+                opciones[c[0].upper()] = c[-1].upper()
+
+    unidades, perdidas = opciones['UNITS'], opciones['HEADLOSS']
+    if perdidas not in ('D-W', 'H-W'):
+        raise ValueError(f"Fórmula de pérdidas no soportada: {perdidas!r} (se soportan D-W y H-W)")
+    e = _escalas(unidades)
+
+    def tramo(nombre):
+        etiqueta = etiquetas.get(nombre, '')
+        return int(etiqueta[1:]) if etiqueta[:1] == 'T' and etiqueta[1:].isdigit() else 0
+
+    nodos = [
+        {'nombre': n, 'elevacion': z * e['longitud'],
+         'demanda': demandas.get(n, q) * e['caudal']}
+        for n, z, q in uniones
+    ] + [
+        {'nombre': n, 'elevacion': z * e['longitud'], 'nivel': nivel * e['longitud'], 'tipo': 'tanque'}
+        for n, z, nivel in tanques
+    ]
+    enlaces = []
+    for nombre, a, b, L, D, rugosidad, K in tuberias:
+        if nombre in cerrados:
+            continue
+        enlace = {'nombre': nombre, 'desde': a, 'hasta': b, 'tipo': 'tuberia',
+                  'longitud': L * e['longitud'], 'diametro': D * e['diametro'], 'K': K,
+                  'tramo': tramo(nombre)}
+        if perdidas == 'H-W':
+            enlace['hazen'] = rugosidad
+        else:
+            enlace['rugosidad'] = rugosidad * e['rugosidad']
+        enlaces.append(enlace)
+    for nombre, a, b, id_curva, velocidad_rel in bombas:
+        if nombre in cerrados:
+            continue
+        if id_curva not in curvas:
+            raise ValueError(f"Bomba {nombre!r}: curva desconocida {id_curva!r}")
+        puntos = [(q * e['caudal'], h * e['longitud']) for q, h in curvas[id_curva]]
+        H0, r, n = _ajustar_curva(puntos)
+        # Leyes de afinidad: H₀·s², r·s^(2-n)
+        curva = [H0 * velocidad_rel**2, r * velocidad_rel**(2 - n), n]
+        enlaces.append({'nombre': nombre, 'desde': a, 'hasta': b, 'tipo': 'bomba',
+                        'curva': curva, 'tramo': tramo(nombre)})
+    for nombre, a, b, D, tipo, ajuste, K in valvulas:
+        if nombre in cerrados:
+            continue
+        enlace = {'nombre': nombre, 'desde': a, 'hasta': b, 'tipo': 'valvula',
+                  'diametro': D * e['diametro'], 'tramo': tramo(nombre)}
+        if tipo == 'FCV':
+            enlace['caudal'] = ajuste * e['caudal']
+        elif tipo == 'TCV':
+            enlace['K'] = ajuste
+        elif valvulas_abiertas:
+            enlace['K'] = max(K, 1e-3)
+        else:
+            raise ValueError(f"Válvula {nombre!r}: tipo {tipo} no soportado "
+                             "(use valvulas_abiertas=True para tratarla como abierta)")
+        enlaces.append(enlace)
+
+    nu = float(opciones['VISCOSITY']) * VISCOSIDAD_REFERENCIA
+    rho = float(opciones['SPECIFIC']) * DENSIDAD_REFERENCIA
+    return construir_red(nodos, enlaces), {
+        'unidades': unidades, 'perdidas': perdidas, 'rho': rho, 'mu': nu * rho,
+    }
+
+
+def escribir_inp(
+    red: Red,
+    ruta,
+    unidades: str = 'LPS',
+    rho: float = 998.0,
+    mu: float = 0.001,
+    metodo_friccion: str = 'colebrook',
+    titulo: str = 'Exportado desde el motor hidraulico del proyecto',
+) -> None:
+    """
+    Escribe la red como modelo EPANET .inp (sección por sección).
+
+    Todas las tuberías deben usar la misma fórmula (D-W o H-W). Las
+    bombas de caudal fijo se exportan con una curva de un punto en su
+    punto de operación, calculado con `resolver_red(red, rho, mu,
+    metodo_friccion)`; lanza ValueError si alguna necesita carga ≤ 0.
+    """
+    e = _escalas(unidades)
+    tuberia = red.enlace_tipo == 'tuberia'
+    hazen = ~np.isnan(red.hazen[tuberia])
+    if hazen.any() and not hazen.all():
+        raise ValueError("EPANET usa una sola fórmula de pérdidas: la red mezcla D-W y H-W")
+    perdidas = 'H-W' if hazen.any() else 'D-W'
+
+    bomba_fija = (red.enlace_tipo == 'bomba') & ~np.isnan(red.caudal_fijo)
+    carga = None
+    if bomba_fija.any():
+        carga = resolver_red(red, rho=rho, mu=mu, metodo_friccion=metodo_friccion)['enlaces']['carga'].to_numpy()
+        sin_carga = bomba_fija & (carga <= 0)
+        if sin_carga.any():
+            raise ValueError("Bombas de caudal fijo sin carga positiva: "
+                             + ', '.join(map(str, red.enlace_nombre[sin_carga])))
+
+    nombre_nodo = red.nodo_nombre
+    q = e['caudal']
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        escribir = archivo.write
+        escribir(f"[TITLE]\n{titulo}\n\n[JUNCTIONS]\n;ID\tElev\tDemand\n")
+        for i in np.flatnonzero(~red.nodo_tanque):
+            escribir(f"{nombre_nodo[i]}\t{red.nodo_elevacion[i] / e['longitud']:.6g}\t"
+                     f"{red.nodo_demanda[i] / q:.9g}\n")
+        escribir("\n[RESERVOIRS]\n;ID\tHead\n")
+        for i in np.flatnonzero(red.nodo_tanque):
+            escribir(f"{nombre_nodo[i]}\t{(red.nodo_elevacion[i] + red.nodo_nivel[i]) / e['longitud']:.9g}\n")
+
+        escribir("\n[PIPES]\n;ID\tNode1\tNode2\tLength\tDiameter\tRoughness\tMinorLoss\tStatus\n")
+        resistivas = []
+        for i in range(red.n_enlaces):
+            if red.enlace_tipo[i] != 'tuberia':
+                continue
+            if red.longitud[i] <= 0:
+                resistivas.append(i)  # solo pérdida K: se escribe como TCV
+                continue
+            rugosidad = red.hazen[i] if perdidas == 'H-W' else red.rugosidad[i] / e['rugosidad']
+            escribir(f"{red.enlace_nombre[i]}\t{nombre_nodo[red.desde[i]]}\t{nombre_nodo[red.hasta[i]]}\t"
+                     f"{red.longitud[i] / e['longitud']:.9g}\t{red.diametro[i] / e['diametro']:.9g}\t"
+                     f"{rugosidad:.9g}\t{red.K[i]:.9g}\tOpen\n")
+
+        escribir("\n[PUMPS]\n;ID\tNode1\tNode2\tParameters\n")
+        curvas = []
+        for i in np.flatnonzero(red.enlace_tipo == 'bomba'):
+            nombre = red.enlace_nombre[i]
+            if bomba_fija[i]:
+                puntos = [(red.caudal_fijo[i], carga[i])]
+            else:
+                # Tres puntos de H₀ - r·Qⁿ: cierre, medio y caudal máximo
+                H0, r, n = red.curva[i]
+                Qmax = (H0 / r)**(1 / n)
+                puntos = [(0.0, H0), (Qmax / 2, H0 - r * (Qmax / 2)**n), (Qmax, 0.0)]
+            curvas.append((f"C_{nombre}", puntos))
+            escribir(f"{nombre}\t{nombre_nodo[red.desde[i]]}\t{nombre_nodo[red.hasta[i]]}\tHEAD C_{nombre}\n")
+
+        escribir("\n[VALVES]\n;ID\tNode1\tNode2\tDiameter\tType\tSetting\tMinorLoss\n")
+        for i in np.flatnonzero(red.enlace_tipo == 'valvula').tolist() + resistivas:
+            fijo = not np.isnan(red.caudal_fijo[i])
+            tipo, ajuste = ('FCV', red.caudal_fijo[i] / q) if fijo else ('TCV', red.K[i])
+            escribir(f"{red.enlace_nombre[i]}\t{nombre_nodo[red.desde[i]]}\t{nombre_nodo[red.hasta[i]]}\t"
+                     f"{red.diametro[i] / e['diametro']:.9g}\t{tipo}\t{ajuste:.9g}\t0\n")
+
+        escribir("\n[CURVES]\n;ID\tX-Value\tY-Value\n")
+        for nombre, puntos in curvas:
+            for Q, H in puntos:
+                escribir(f"{nombre}\t{Q / q:.12g}\t{H / e['longitud']:.12g}\n")
+
+        escribir("\n[TAGS]\n")
+        for i in np.flatnonzero(red.tramo > 0):
+            escribir(f"LINK\t{red.enlace_nombre[i]}\tT{red.tramo[i]}\n")
+
+        escribir(
+            "\n[OPTIONS]\n"
+            f"Units\t{unidades}\n"
+            f"Headloss\t{perdidas}\n"
+            f"Specific Gravity\t{rho / DENSIDAD_REFERENCIA:.9g}\n"
+            f"Viscosity\t{mu / rho / VISCOSIDAD_REFERENCIA:.9g}\n"
+            "Trials\t200\n"
+            "Accuracy\t0.000001\n"
+            "\n[END]\n"
+        )
+
+
+def definiciones_desde_red(red: Red) -> dict:
+    """
+    Reconstruye las definiciones de tramos de una cadena exportada.
+
+    Usa la etiqueta de tramo de cada enlace (tramos en orden numérico;
+    los enlaces de cada uno forman una cadena): las tuberías dan `num_estaciones`, `longitud_tuberia` y `K_total`;
+    las cotas de los extremos, `altura`; una bajada es la que desciende,
+    y si termina en una unión (sin tanque) cede su gravedad al tramo
+    siguiente. `distancia` y `pendiente` se derivan de L y la altura; los
+    accesorios se reducen a uno con el K total.
+
+    Lanza ValueError si ningún enlace tiene tramo o si los enlaces de un
+    tramo no forman una cadena.
+    """
+    numeros = sorted({int(t) for t in red.tramo if t > 0})
+    if not numeros:
+        raise ValueError("La red no tiene enlaces etiquetados por tramo")
+    definiciones = {}
+    anterior = None
+    for t in numeros:
+        enlaces = np.flatnonzero(red.tramo == t)
+        tuberias = enlaces[red.enlace_tipo[enlaces] == 'tuberia']
+        # Extremos de la cadena del tramo: el nodo que solo sale y el que solo llega
+        desde, hasta = set(red.desde[enlaces].tolist()), set(red.hasta[enlaces].tolist())
+        if len(desde - hasta) != 1 or len(hasta - desde) != 1:
+            raise ValueError(f"Los enlaces del tramo {t} no forman una cadena")
+        (inicio,), (fin,) = desde - hasta, hasta - desde
+        altura = float(red.nodo_elevacion[fin] - red.nodo_elevacion[inicio])
+        L = float(red.longitud[tuberias].sum())
+        bajada = altura < 0
+        distancia = math.sqrt(max(L**2 - altura**2, 0.0))
+        definicion = {
+            'distancia': distancia,
+            'altura': altura,
+            'pendiente': math.degrees(math.atan2(altura, distancia)),
+            'longitud_tuberia': L,
+            'z': 0.0 if bajada else altura,
+            'num_estaciones': len(tuberias),
+            'es_bajada': bajada,
+            'tipo': ('tanque rompe-presión' if red.nodo_tanque[fin] else 'gravedad') if bajada else 'bomba',
+            'accesorios': [{'nombre': 'K total (importado)', 'cantidad': 1, 'K': float(red.K[tuberias[0]])}],
+            'K_total': float(red.K[tuberias[0]]),
+            'notas': 'Importado de EPANET.',
+        }
+        if bajada:
+            definicion['tanque_rompe_presion'] = bool(red.nodo_tanque[fin])
+        if anterior is not None and not red.nodo_tanque[inicio]:
+            definicion['recibe_gravedad_de'] = anterior
+        definiciones[t] = definicion
+        anterior = t
+    return definiciones
@@ -0,0 +1,348 @@
+"""
+escenarios.py — Corrida masiva de escenarios en paralelo.
+
+Lee un archivo de escenarios (CSV o YAML), los reparte en bloques entre
+los procesos de un `ProcessPoolExecutor`; cada trabajador escribe los
+resultados de su bloque en un archivo propio (CSV o Parquet) dentro de
+un directorio de salida. Si la corrida se interrumpe, volver a ejecutarla
+sobre el mismo directorio solo calcula los escenarios que faltan.
+
+Cada bloque se evalúa con `calcular_sistema_lote` (el núcleo
+vectorizado, con los mismos resultados que `calcular_sistema_completo`
+punto a punto).
+
+Formato de escenarios:
+    CSV: una fila por escenario. Columnas 'Q', 'D', 'rho', 'mu',
+    'epsilon' (las que falten toman el valor por defecto de
+    `calcular_sistema_completo`), opcionales 'escenario' (identificador
+    único; por defecto el número de fila) y 'metodo_friccion', y
+    reemplazos por tramo 'num_estaciones_T<n>' / 'K_total_T<n>' (vacío
+    = valor de la geometría).
+
+    YAML: lista de escenarios (o {'escenarios': [...]}) con las mismas
+    claves; los reemplazos por tramo van anidados:
+        - escenario: caso_a
+          Q: 0.030
+          tramos: {3: {num_estaciones: 3}, 5: {K_total: 12.0}}
+
+Uso:
+    python -m core.escenarios escenarios.csv salida/ [--trabajadores 4]
+        [--bloque 500] [--formato parquet]
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PARAMETROS = {'Q': 0.025, 'D': 0.1541, 'rho': 998.0, 'mu': 0.001, 'epsilon': 0.000046}
+REEMPLAZOS = ('num_estaciones', 'K_total')
+FORMATOS = ('csv', 'parquet')
+_ESTADISTICAS = ('bloques', 'escenarios', 'calculo_s', 'escritura_s')
+
+
+def _leer_yaml(ruta: Path) -> pd.DataFrame:
+    """Aplana la lista YAML de escenarios a una fila por escenario."""
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("Para leer escenarios YAML instale PyYAML: pip install pyyaml") from None
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = yaml.safe_load(archivo) or []
+    if isinstance(datos, dict):
+        datos = datos.get('escenarios', [])
+    filas = []
+    for escenario in datos:
+        fila = {k: v for k, v in escenario.items() if k != 'tramos'}
+        for num_tramo, valores in (escenario.get('tramos') or {}).items():
+            for campo, valor in valores.items():
+                fila[f'{campo}_T{num_tramo}'] = valor
+        filas.append(fila)
+    return pd.DataFrame(filas)
+
+
+def leer_escenarios(ruta) -> pd.DataFrame:
+    """
+    Lee y valida un archivo de escenarios (.csv, .yaml o .yml).
+
+    Retorna un DataFrame con una fila por escenario: 'escenario',
+    'metodo_friccion', los cinco parámetros y las columnas de reemplazo
+    por tramo presentes en el archivo.
+
+    Lanza ValueError si hay columnas desconocidas, tramos inexistentes,
+    identificadores repetidos o parámetros no positivos.
+    """
+    from core.hidraulica import METODOS_FRICCION
+    from core.tramos import obtener_geometria
+
+    ruta = Path(ruta)
+    if ruta.suffix.lower() in ('.yaml', '.yml'):
+        tabla = _leer_yaml(ruta)
+    else:
+        tabla = pd.read_csv(ruta)
+
+    tramos = set(obtener_geometria().numeros.tolist())
+    desconocidas = []
+    for columna in tabla.columns:
+        if columna in PARAMETROS or columna in ('escenario', 'metodo_friccion'):
+            continue
+        campo, _, tramo = columna.rpartition('_T')
+        if campo not in REEMPLAZOS or not tramo.isdigit() or int(tramo) not in tramos:
+            desconocidas.append(columna)
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas en {ruta.name}: {', '.join(desconocidas)} "
+                         f"(se aceptan {', '.join(PARAMETROS)}, escenario, metodo_friccion "
+                         f"y {'/'.join(REEMPLAZOS)}_T<n> con n en {sorted(tramos)})")
+
+    if 'escenario' not in tabla:
+        tabla.insert(0, 'escenario', np.arange(len(tabla)))
+    if tabla['escenario'].duplicated().any():
+        repetidos = tabla.loc[tabla['escenario'].duplicated(), 'escenario'].unique()
+        raise ValueError(f"Escenarios repetidos: {', '.join(map(str, repetidos[:10]))}")
+    if 'metodo_friccion' not in tabla:
+        tabla['metodo_friccion'] = 'colebrook'
+    tabla['metodo_friccion'] = tabla['metodo_friccion'].fillna('colebrook')
+    metodos = set(tabla['metodo_friccion']) - set(METODOS_FRICCION)
+    if metodos:
+        raise ValueError(f"Métodos de fricción desconocidos: {', '.join(sorted(map(str, metodos)))}")
+
+    for nombre, defecto in PARAMETROS.items():
+        tabla[nombre] = tabla[nombre].fillna(defecto).astype(float) if nombre in tabla else defecto
+        if (tabla[nombre] <= 0).any():
+            raise ValueError(f"'{nombre}' debe ser positivo en todos los escenarios")
+    return tabla
+
+
+def _reemplazos(bloque: pd.DataFrame, campo: str, base: np.ndarray, numeros: np.ndarray):
+    """Arreglo (N, T) con la geometría base y los reemplazos del bloque, o None."""
+    columnas = [(j, f'{campo}_T{t}') for j, t in enumerate(numeros) if f'{campo}_T{t}' in bloque]
+    if not columnas:
+        return None
+    valores = np.tile(np.asarray(base, dtype=float), (len(bloque), 1))
+    for j, columna in columnas:
+        dato = bloque[columna].to_numpy(dtype=float)
+        valores[:, j] = np.where(np.isnan(dato), valores[:, j], dato)
+    return valores
+
+
+def evaluar_bloque(bloque: pd.DataFrame) -> pd.DataFrame:
+    """
+    Evalúa un bloque de escenarios con el cálculo por lotes.
+
+    Retorna una fila por (escenario, tramo) con 'escenario',
+    'metodo_friccion' y las columnas de `calcular_sistema_lote`.
+    """
+    from core.hidraulica import calcular_sistema_lote
+    from core.tramos import obtener_geometria
+
+    geometria = obtener_geometria()
+    T = len(geometria.numeros)
+    partes = []
+    for metodo, grupo in bloque.groupby('metodo_friccion', sort=False):
+        tabla = calcular_sistema_lote(
+            puntos=grupo,
+            metodo_friccion=metodo,
+            num_estaciones=_reemplazos(grupo, 'num_estaciones', geometria.num_estaciones, geometria.numeros),
+            K_total=_reemplazos(grupo, 'K_total', geometria.K_total, geometria.numeros),
+        )
+        tabla.insert(0, 'escenario', np.repeat(grupo['escenario'].to_numpy(), T))
+        tabla.insert(2, 'metodo_friccion', metodo)
+        partes.append(tabla.drop(columns='punto'))
+    return pd.concat(partes, ignore_index=True)
+
+
+def _correr_bloque(bloque: pd.DataFrame, ruta: Path, formato: str) -> tuple[int, float, float]:
+    """
+    Tarea de un trabajador: evalúa el bloque y escribe su parte.
+
+    Retorna (pid, segundos de cálculo, segundos de escritura).
+    """
+    t0 = time.perf_counter()
+    tabla = evaluar_bloque(bloque)
+    t1 = time.perf_counter()
+    _escribir_parte(tabla, ruta, formato)
+    return os.getpid(), t1 - t0, time.perf_counter() - t1
+
+
+def _partes(salida: Path, formato: str) -> list[Path]:
+    return sorted(salida.glob(f'bloque-*.{formato}'))
+
+
+def escenarios_completos(salida, formato: str = 'csv') -> set:
+    """Identificadores (como texto) de los escenarios ya escritos en `salida`."""
+    hechos = set()
+    for parte in _partes(Path(salida), formato):
+        if formato == 'parquet':
+            ids = pd.read_parquet(parte, columns=['escenario'])['escenario']
+        else:
+            ids = pd.read_csv(parte, usecols=['escenario'], dtype={'escenario': str})['escenario']
+        hechos.update(ids.astype(str).unique().tolist())
+    return hechos
+
+
+def _escribir_parte(tabla: pd.DataFrame, ruta: Path, formato: str) -> None:
+    """Escribe el bloque de forma atómica: una interrupción no deja partes a medias."""
+    temporal = ruta.with_name(ruta.name + '.tmp')
+    if formato == 'parquet':
+        tabla.to_parquet(temporal, index=False)
+    else:
+        tabla.to_csv(temporal, index=False)
+    os.replace(temporal, ruta)
+
+
+def ejecutar_escenarios(
+    escenarios,
+    salida,
+    trabajadores: int | None = None,
+    tamano_bloque: int = 500,
+    formato: str = 'csv',
+    reanudar: bool = True,
+    progreso=None,
+) -> dict:
+    """
+    Corre todos los escenarios y escribe los resultados por bloques.
+
+    Parámetros:
+        escenarios: ruta al archivo de escenarios o DataFrame de
+            `leer_escenarios`
+        salida: directorio de resultados (se crea si no existe)
+        trabajadores: procesos del pool (por defecto, os.cpu_count());
+            0 evalúa en el proceso actual
+        tamano_bloque: escenarios por tarea enviada a un trabajador
+        formato: 'csv' o 'parquet' (requiere pyarrow)
+        reanudar: omitir los escenarios que ya están en `salida`; con
+            False se borran las partes existentes
+        progreso: función opcional progreso(hechos, total, segundos),
+            llamada al terminar cada bloque
+
+    Retorna un dict con:
+        'calculados', 'omitidos': número de escenarios
+        'segundos': tiempo total
+        'trabajadores': DataFrame por proceso con 'bloques',
+            'escenarios', 'calculo_s', 'escritura_s' y 'escenarios_por_s'
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r} (opciones: {', '.join(FORMATOS)})")
+    if tamano_bloque < 1:
+        raise ValueError("tamano_bloque debe ser al menos 1")
+    tabla = escenarios if isinstance(escenarios, pd.DataFrame) else leer_escenarios(escenarios)
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    for temporal in salida.glob('bloque-*.tmp'):
+        temporal.unlink()
+
+    if reanudar:
+        hechos = escenarios_completos(salida, formato)
+    else:
+        for parte in _partes(salida, formato):
+            parte.unlink()
+        hechos = set()
+    pendientes = tabla[~tabla['escenario'].astype(str).isin(hechos)]
+    total = len(pendientes)
+    bloques = [pendientes.iloc[i:i + tamano_bloque] for i in range(0, total, tamano_bloque)]
+    # Numeración de partes a continuación de las de una corrida anterior
+    inicio = max((int(p.stem.split('-')[1]) for p in _partes(salida, formato)), default=-1) + 1
+
+    estadisticas = {}
+    hechos_ahora = 0
+    t0 = time.perf_counter()
+
+    def tarea(indice):
+        return bloques[indice], salida / f'bloque-{inicio + indice:06d}.{formato}', formato
+
+    def registrar(indice, resultado):
+        nonlocal hechos_ahora
+        pid, calculo, escritura = resultado
+        n = len(bloques[indice])
+        fila = estadisticas.setdefault(pid, dict.fromkeys(_ESTADISTICAS, 0))
+        fila['bloques'] += 1
+        fila['escenarios'] += n
+        fila['calculo_s'] += calculo
+        fila['escritura_s'] += escritura
+        hechos_ahora += n
+        if progreso is not None:
+            progreso(hechos_ahora, total, time.perf_counter() - t0)
+
+    if trabajadores == 0:
+        for i in range(len(bloques)):
+            registrar(i, _correr_bloque(*tarea(i)))
+    else:
+        pool = ProcessPoolExecutor(max_workers=trabajadores)
+        try:
+            # Como mucho dos bloques en vuelo por trabajador: la memoria no
+            # crece con el número de escenarios
+            en_vuelo, siguiente = {}, 0
+            limite = 2 * (trabajadores or os.cpu_count() or 1)
+            while siguiente < len(bloques) or en_vuelo:
+                while siguiente < len(bloques) and len(en_vuelo) < limite:
+                    en_vuelo[pool.submit(_correr_bloque, *tarea(siguiente))] = siguiente
+                    siguiente += 1
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    registrar(en_vuelo.pop(futuro), futuro.result())
+        except BaseException:
+            # Interrupción: lo escrito queda y se retoma en la próxima corrida
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+    resumen = pd.DataFrame.from_dict(
+        estadisticas, orient='index', columns=list(_ESTADISTICAS),
+    ).rename_axis('trabajador')
+    resumen['escenarios_por_s'] = resumen['escenarios'] / (resumen['calculo_s'] + resumen['escritura_s'])
+    return {
+        'calculados': total,
+        'omitidos': len(tabla) - total,
+        'segundos': time.perf_counter() - t0,
+        'trabajadores': resumen,
+    }
+
+
+def leer_resultados(salida, formato: str = 'csv') -> pd.DataFrame:
+    """Une todas las partes de `salida` en un DataFrame ordenado por escenario y tramo."""
+    partes = _partes(Path(salida), formato)
+    if not partes:
+        return pd.DataFrame()
+    leer = pd.read_parquet if formato == 'parquet' else pd.read_csv
+    tabla = pd.concat([leer(p) for p in partes], ignore_index=True)
+    return tabla.sort_values(['escenario', 'tramo'], kind='stable', ignore_index=True)
+
+
+def main():
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='Corrida masiva de escenarios en paralelo.')
+    parser.add_argument('escenarios', help='archivo de escenarios (.csv, .yaml o .yml)')
+    parser.add_argument('salida', help='directorio de resultados')
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help='procesos del pool (por defecto, uno por núcleo; 0 = sin pool)')
+    parser.add_argument('--bloque', type=int, default=500, help='escenarios por tarea')
+    parser.add_argument('--formato', choices=FORMATOS, default='csv')
+    parser.add_argument('--desde-cero', action='store_true',
+                        help='borrar los resultados existentes en vez de reanudar')
+    args = parser.parse_args()
+
+    def progreso(hechos, total, segundos):
+        tasa = hechos / segundos if segundos > 0 else 0.0
+        restante = (total - hechos) / tasa if tasa > 0 else 0.0
+        print(f'\r{hechos:,}/{total:,} escenarios ({100 * hechos / total:5.1f} %) '
+              f'{tasa:,.0f}/s, faltan {restante:,.0f} s', end='', file=sys.stderr, flush=True)
+
+    resumen = ejecutar_escenarios(
+        args.escenarios, args.salida,
+        trabajadores=args.trabajadores, tamano_bloque=args.bloque,
+        formato=args.formato, reanudar=not args.desde_cero, progreso=progreso,
+    )
+    print(file=sys.stderr)
+    print(f"{resumen['calculados']:,} escenarios calculados, {resumen['omitidos']:,} ya estaban "
+          f"({resumen['segundos']:.1f} s)")
+    if len(resumen['trabajadores']):
+        print(resumen['trabajadores'].to_string(float_format=lambda x: f'{x:,.2f}'))
+
+
+if __name__ == '__main__':
+    main()
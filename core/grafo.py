@@ -0,0 +1,307 @@
+"""
+grafo.py — Recálculo incremental del sistema hidráulico.
+
+`GrafoCalculo` es un grafo de dependencias entre valores: las entradas
+se fijan con `fijar()` y cada nodo calculado declara de qué entradas o
+nodos depende. Al cambiar una entrada solo se marcan como pendientes los
+nodos aguas abajo; se recalculan (perezosamente) la próxima vez que se
+piden. Cada nodo lleva su tiempo de cálculo para ver cuánto cuesta cada
+cambio de entrada.
+
+`GrafoHidraulico` arma sobre él la cadena de `calcular_sistema_completo`
+(área → velocidad → Re → f → hf → H → P, más la transferencia de cabeza
+gravitacional) con los 8 tramos como arreglos, de modo que mover solo ρ
+no recalcula área ni velocidad, y mover solo ε no recalcula las
+pérdidas menores. `resultado()` retorna el mismo `ResultadoSistema`.
+"""
+
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from core.hidraulica import (
+    area_seccion, carga_cinetica, carga_total, f_haaland, f_swamee_jain,
+    factor_friccion, kw_a_hp, perdidas_darcy, perdidas_menores,
+    potencia_bomba, reynolds, velocidad,
+)
+from core.resultados import ResultadoSistema, _columna
+from core.tramos import construir_geometria, obtener_definicion_tramos, obtener_geometria
+
+
+def _iguales(a, b) -> bool:
+    """True si dos valores de entrada son idénticos (escalares o arreglos)."""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    return type(a) is type(b) and a == b
+
+
+class GrafoCalculo:
+    """
+    Grafo de dependencias con invalidación aguas abajo y evaluación perezosa.
+
+    Los nodos se declaran en orden (las dependencias deben existir antes),
+    así que el grafo es acíclico por construcción.
+    """
+
+    def __init__(self):
+        self._funciones = {}           # nodo calculado -> (función, dependencias)
+        self._dependientes = defaultdict(list)
+        self._valores = {}
+        self._pendientes = set()
+        self._evaluaciones = defaultdict(int)
+        self._tiempo_total = defaultdict(float)
+        self._tiempo_ultimo = {}
+        self.ultimo_recalculo = {}     # {nodo: s} desde el último `fijar`
+
+    def entrada(self, nombre: str, valor) -> None:
+        """Declara una entrada con su valor inicial."""
+        if nombre in self._valores or nombre in self._funciones:
+            raise ValueError(f"Nodo repetido: {nombre!r}")
+        self._valores[nombre] = valor
+
+    def nodo(self, nombre: str, funcion, *dependencias: str) -> None:
+        """Declara un nodo calculado como `funcion(*valores de dependencias)`."""
+        if nombre in self._valores or nombre in self._funciones:
+            raise ValueError(f"Nodo repetido: {nombre!r}")
+        for dep in dependencias:
+            if dep not in self._valores and dep not in self._funciones:
+                raise ValueError(f"Dependencia desconocida de {nombre!r}: {dep!r}")
+            self._dependientes[dep].append(nombre)
+        self._funciones[nombre] = (funcion, dependencias)
+        self._pendientes.add(nombre)
+
+    @property
+    def entradas(self) -> list[str]:
+        return [n for n in self._valores if n not in self._funciones]
+
+    @property
+    def nodos(self) -> list[str]:
+        return list(self._funciones)
+
+    def aguas_abajo(self, nombre: str) -> list[str]:
+        """Nodos calculados que dependen (directa o indirectamente) de `nombre`."""
+        vistos = {}
+        pila = list(self._dependientes[nombre])
+        while pila:
+            n = pila.pop()
+            if n not in vistos:
+                vistos[n] = None
+                pila.extend(self._dependientes[n])
+        return [n for n in self._funciones if n in vistos]  # en orden topológico
+
+    def fijar(self, **valores) -> set:
+        """
+        Cambia entradas e invalida los nodos afectados.
+
+        Los valores iguales a los actuales no invalidan nada. Retorna el
+        conjunto de nodos invalidados.
+        """
+        self.ultimo_recalculo = {}
+        invalidados = set()
+        for nombre, valor in valores.items():
+            if nombre in self._funciones or nombre not in self._valores:
+                raise ValueError(f"Entrada desconocida: {nombre!r}")
+            if _iguales(self._valores[nombre], valor):
+                continue
+            self._valores[nombre] = valor
+            invalidados.update(self.aguas_abajo(nombre))
+        self._pendientes |= invalidados
+        return invalidados
+
+    def obtener(self, nombre: str):
+        """Valor actual de un nodo (lo recalcula si está pendiente)."""
+        if nombre in self._pendientes:
+            funcion, dependencias = self._funciones[nombre]
+            argumentos = [self.obtener(dep) for dep in dependencias]
+            inicio = time.perf_counter()
+            self._valores[nombre] = funcion(*argumentos)
+            duracion = time.perf_counter() - inicio
+            self._pendientes.discard(nombre)
+            self._evaluaciones[nombre] += 1
+            self._tiempo_total[nombre] += duracion
+            self._tiempo_ultimo[nombre] = duracion
+            self.ultimo_recalculo[nombre] = duracion
+        return self._valores[nombre]
+
+    def tiempos(self) -> pd.DataFrame:
+        """
+        Costo por nodo calculado.
+
+        Retorna DataFrame indexado por nodo con 'evaluaciones',
+        'ultimo_ms', 'total_ms', 'en_ultimo_recalculo' (si se evaluó
+        desde el último `fijar`) y 'pendiente'.
+        """
+        nombres = self.nodos
+        return pd.DataFrame({
+            'evaluaciones': [self._evaluaciones[n] for n in nombres],
+            'ultimo_ms': [1e3 * self._tiempo_ultimo.get(n, np.nan) for n in nombres],
+            'total_ms': [1e3 * self._tiempo_total[n] for n in nombres],
+            'en_ultimo_recalculo': [n in self.ultimo_recalculo for n in nombres],
+            'pendiente': [n in self._pendientes for n in nombres],
+        }, index=pd.Index(nombres, name='nodo'))
+
+
+# Columnas de `calcular_tramo` en su orden, luego las de la definición
+# del tramo y las de la transferencia de gravedad
+_COLUMNAS_CALCULADAS = (
+    'area', 'velocidad', 'carga_cinetica', 'reynolds',
+    'f_colebrook', 'f_haaland', 'f_swamee_jain',
+    'longitud_estacion', 'perdidas_friccion_colebrook',
+    'perdidas_friccion_haaland', 'perdidas_menores', 'z_estacion',
+    'carga_estacion', 'carga_total', 'potencia_kw', 'potencia_hp',
+)
+_COLUMNAS_GRAVEDAD = ('cabeza_gravedad_recibida', 'carga_estacion_original')
+
+
+class GrafoHidraulico(GrafoCalculo):
+    """
+    Cálculo incremental de `calcular_sistema_completo`.
+
+    Entradas: Q, D, rho, mu, epsilon, metodo_friccion y, por tramo
+    (arreglos de largo T), longitud_tuberia, z, altura, K_total y
+    num_estaciones. Las magnitudes comunes a todos los tramos (área,
+    velocidad, Re, factores de fricción) son escalares; el resto,
+    arreglos (T,).
+
+    Uso:
+        grafo = GrafoHidraulico()
+        grafo.fijar(rho=1000.0)
+        resultados = grafo.resultado()
+        grafo.tiempos()   # qué nodos se recalcularon y cuánto costaron
+    """
+
+    def __init__(
+        self,
+        Q: float = 0.025,
+        D: float = 0.1541,
+        rho: float = 998.0,
+        mu: float = 0.001,
+        epsilon: float = 0.000046,
+        metodo_friccion: str = 'colebrook',
+        definiciones=None,
+    ):
+        """
+        Parámetros:
+            Q, D, rho, mu, epsilon, metodo_friccion: como en
+                `calcular_sistema_completo`
+            definiciones: dict de tramos (por defecto, los de
+                `obtener_definicion_tramos`)
+        """
+        super().__init__()
+        if definiciones is None:
+            definiciones = obtener_definicion_tramos()
+            geometria = obtener_geometria()
+        else:
+            geometria = construir_geometria(definiciones)
+        self.geometria = geometria
+        self._resultado = None
+        bajada = geometria.es_bajada
+        fuente = geometria.fuente_gravedad
+        receptores = np.flatnonzero(fuente >= 0)
+        self._receptor = fuente >= 0
+
+        # Columnas del resultado que no dependen de las entradas
+        filas = list(definiciones.values())
+        self._estaticas = {
+            'distancia': geometria.distancia,
+            'altura': geometria.altura,
+            'pendiente': geometria.pendiente,
+            'tipo': _columna([d['tipo'] for d in filas]),
+            'accesorios': _columna([[dict(a) for a in d['accesorios']] for d in filas]),
+            'notas': _columna([d.get('notas', '') for d in filas]),
+            'tanque_rompe_presion': geometria.tanque_rompe_presion,
+            'recibe_gravedad_de': _columna([d.get('recibe_gravedad_de', None) for d in filas]),
+        }
+
+        for nombre, valor in (
+            ('Q', Q), ('D', D), ('rho', rho), ('mu', mu), ('epsilon', epsilon),
+            ('metodo_friccion', metodo_friccion),
+            ('longitud_tuberia', geometria.longitud_tuberia),
+            ('z', geometria.z),
+            ('altura', geometria.altura),
+            ('K_total', geometria.K_total),
+            ('num_estaciones', geometria.num_estaciones),
+        ):
+            self.entrada(nombre, valor)
+
+        # Comunes a todos los tramos
+        self.nodo('area', area_seccion, 'D')
+        self.nodo('velocidad', velocidad, 'Q', 'area')
+        self.nodo('carga_cinetica', carga_cinetica, 'velocidad')
+        self.nodo('reynolds', reynolds, 'rho', 'velocidad', 'D', 'mu')
+        self.nodo('f_colebrook', factor_friccion, 'reynolds', 'epsilon', 'D', 'metodo_friccion')
+        self.nodo('f_haaland', f_haaland, 'reynolds', 'epsilon', 'D')
+        self.nodo('f_swamee_jain', f_swamee_jain, 'reynolds', 'epsilon', 'D')
+
+        # Por tramo (sin estaciones se usa el tramo completo)
+        self.nodo('divisor', lambda n: np.where(n > 0, n, 1).astype(float), 'num_estaciones')
+        self.nodo('longitud_estacion', np.divide, 'longitud_tuberia', 'divisor')
+        self.nodo('z_estacion', np.divide, 'z', 'divisor')
+        self.nodo('perdidas_friccion_colebrook', perdidas_darcy,
+                  'f_colebrook', 'longitud_estacion', 'D', 'velocidad')
+        self.nodo('perdidas_friccion_haaland', perdidas_darcy,
+                  'f_haaland', 'longitud_estacion', 'D', 'velocidad')
+        self.nodo('perdidas_menores', perdidas_menores, 'K_total', 'velocidad')
+        self.nodo('carga_estacion_original',
+                  lambda z_est, hf, hm: carga_total(np.abs(z_est), hf, hm),
+                  'z_estacion', 'perdidas_friccion_colebrook', 'perdidas_menores')
+
+        # Transferencia de energía gravitacional entre tramos
+        def cabeza_recibida(altura, hf, hm, n):
+            cabeza = np.zeros(len(altura))
+            j = fuente[receptores]
+            cabeza[receptores] = np.maximum(0.0, np.abs(altura[j]) - hf[j] * n[j] - hm[j] * n[j])
+            return cabeza
+
+        def carga_reducida(H, cabeza, divisor):
+            H = H.copy()
+            i = receptores
+            # Se recibe una sola vez por tramo y se reparte entre sus estaciones
+            H[i] = np.maximum(0.0, H[i] * divisor[i] - cabeza[i]) / divisor[i]
+            return H
+
+        self.nodo('cabeza_gravedad_recibida', cabeza_recibida,
+                  'altura', 'perdidas_friccion_colebrook', 'perdidas_menores', 'num_estaciones')
+        self.nodo('carga_estacion', carga_reducida,
+                  'carga_estacion_original', 'cabeza_gravedad_recibida', 'divisor')
+        self.nodo('carga_total', np.multiply, 'carga_estacion', 'num_estaciones')
+
+        # Los tramos receptores de gravedad siempre se calculan con bomba
+        sin_bomba = bajada & ~self._receptor
+        self.nodo('potencia_kw',
+                  lambda rho, Q, H: np.where(sin_bomba, 0.0, potencia_bomba(rho, Q, H)),
+                  'rho', 'Q', 'carga_estacion')
+        self.nodo('potencia_hp', kw_a_hp, 'potencia_kw')
+
+    def resultado(self) -> ResultadoSistema:
+        """
+        Recalcula lo pendiente y retorna el `ResultadoSistema` (mismos
+        valores y columnas que `calcular_sistema_completo`). Si no cambió
+        ninguna entrada, retorna el mismo objeto que la vez anterior.
+        """
+        if self._resultado is not None and not self._pendientes:
+            return self._resultado
+        g = self.geometria
+        T = len(g.numeros)
+        columnas = {}
+        for nombre in _COLUMNAS_CALCULADAS:
+            valor = self.obtener(nombre)
+            columnas[nombre] = valor if np.ndim(valor) else np.full(T, valor)
+        columnas['num_estaciones'] = self._valores['num_estaciones']
+        columnas['es_bajada'] = g.es_bajada
+        columnas.update(self._estaticas)
+        columnas['longitud_tuberia'] = self._valores['longitud_tuberia']
+        # Orden de columnas de `calcular_sistema_completo`
+        orden = list(columnas)
+        orden.insert(orden.index('pendiente') + 1, orden.pop())
+
+        # Solo existen en los tramos que reciben gravedad
+        ausente = ~self._receptor
+        for nombre in _COLUMNAS_GRAVEDAD:
+            columnas[nombre] = np.where(ausente, np.nan, self.obtener(nombre))
+            orden.append(nombre)
+        ausentes = {nombre: ausente for nombre in _COLUMNAS_GRAVEDAD} if ausente.any() else {}
+        self._resultado = ResultadoSistema(g.numeros, {k: columnas[k] for k in orden}, ausentes)
+        return self._resultado
@@ -6,7 +6,11 @@ Reynolds, Colebrook-White, Haaland, Darcy-Weisbach,
 pérdidas menores y potencia de bombas.
 """
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
+import pandas as pd
 from scipy.optimize import fsolve
 
 # Constante gravitacional
@@ -42,27 +46,182 @@ def reynolds(rho: float, v: float, D: float, mu: float) -> float:
     return rho * v * D / mu
 
 
-def f_haaland(Re: float, epsilon: float, D: float) -> float:
+# Parámetros del solver vectorizado de Colebrook-White
+COLEBROOK_MAX_ITER = 50
+COLEBROOK_TOL = 1e-13
+
+_LN10 = np.log(10.0)
+
+
+def _es_escalar(*valores) -> bool:
+    """True si todos los argumentos son escalares (no arreglos)."""
+    # isinstance primero: np.ndim es lento para floats de Python
+    return all(isinstance(x, (int, float)) or np.ndim(x) == 0 for x in valores)
+
+
+def _colebrook_vectorizado(
+    Re, rugosidad_relativa,
+    max_iter: int = COLEBROOK_MAX_ITER,
+    tol: float = COLEBROOK_TOL,
+) -> np.ndarray:
+    """
+    Resuelve Colebrook-White para arreglos completos a la vez.
+    
+    Itera Newton-Raphson sobre x = 1/√f:
+        F(x) = x + 2·log₁₀(a + b·x),  a = (ε/D)/3.7,  b = 2.51/Re
+    
+    F es creciente y cóncava, por lo que desde la semilla de Haaland
+    converge en 3–5 iteraciones para todo el rango turbulento. Todos los
+    elementos avanzan juntos; el ciclo termina cuando el mayor paso
+    relativo es menor que `tol` o al agotar `max_iter`.
+    
+    Los elementos con Re <= 0 devuelven 0.0 (igual que la ruta escalar).
+    """
+    Re, rr = np.broadcast_arrays(
+        np.asarray(Re, dtype=float), np.asarray(rugosidad_relativa, dtype=float)
+    )
+    f = np.zeros(Re.shape)
+    activo = Re > 0
+    if not np.any(activo):
+        return f
+    
+    a = rr[activo] / 3.7
+    b = 2.51 / Re[activo]
+    
+    # Semilla: Haaland (acotada a valores positivos para Re muy bajos)
+    x = -1.8 * np.log10(a**1.11 + 6.9 / Re[activo])
+    x = np.maximum(x, 1.0)
+    
+    for _ in range(max_iter):
+        arg = a + b * x
+        F = x + 2.0 * np.log10(arg)
+        dF = 1.0 + 2.0 * b / (arg * _LN10)
+        paso = F / dF
+        x = np.maximum(x - paso, 1e-6)
+        if np.max(np.abs(paso) / x) < tol:
+            break
+    
+    f[activo] = 1.0 / x**2
+    return f
+
+
+# Parámetros de la caché de factores de fricción
+FRICCION_CACHE_TAMANO = 4096
+FRICCION_CACHE_CIFRAS = 12  # cifras significativas de la clave (Re, ε/D)
+
+
+def _cuantizar(x: float, cifras: int) -> float:
+    """Redondea x a `cifras` cifras significativas."""
+    return float('%.*g' % (cifras, x))
+
+
+class CacheFriccion:
+    """
+    Caché LRU de factores de fricción de Colebrook, compartida por proceso.
+    
+    La clave es (Re, ε/D) redondeados a `cifras` cifras significativas, y
+    el factor se calcula en el punto redondeado: el resultado no depende
+    del orden de las consultas. Al superar `tamano_max` entradas se
+    descarta la menos usada recientemente. Es segura entre hilos (varias
+    sesiones de Streamlit comparten el proceso); el cálculo en un fallo se
+    hace fuera del candado.
+    """
+    
+    def __init__(self, tamano_max: int = FRICCION_CACHE_TAMANO,
+                 cifras: int = FRICCION_CACHE_CIFRAS):
+        self._datos = OrderedDict()
+        self._candado = threading.Lock()
+        self.tamano_max = tamano_max
+        self.cifras = cifras
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, Re: float, rugosidad_relativa: float) -> float:
+        """Factor de fricción para (Re, ε/D), desde la caché si existe."""
+        clave = (_cuantizar(float(Re), self.cifras),
+                 _cuantizar(float(rugosidad_relativa), self.cifras))
+        with self._candado:
+            f = self._datos.get(clave)
+            if f is not None:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return f
+            self.fallos += 1
+        
+        f = float(_colebrook_vectorizado(*clave))
+        with self._candado:
+            self._datos[clave] = f
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.tamano_max:
+                self._datos.popitem(last=False)
+        return f
+    
+    def configurar(self, tamano_max: int | None = None, cifras: int | None = None):
+        """Cambia el tamaño o la precisión (un cambio de precisión la vacía)."""
+        with self._candado:
+            if cifras is not None and cifras != self.cifras:
+                self.cifras = cifras
+                self._datos.clear()
+            if tamano_max is not None:
+                self.tamano_max = tamano_max
+                while len(self._datos) > self.tamano_max:
+                    self._datos.popitem(last=False)
+    
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self._candado:
+            self._datos.clear()
+            self.aciertos = 0
+            self.fallos = 0
+    
+    def estadisticas(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos y ocupación."""
+        with self._candado:
+            total = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / total if total else 0.0,
+                'entradas': len(self._datos),
+                'tamano_max': self.tamano_max,
+                'cifras': self.cifras,
+            }
+
+
+# Instancia única del proceso, usada por la ruta escalar de `f_colebrook`
+CACHE_FRICCION = CacheFriccion()
+
+
+def f_haaland(Re, epsilon, D):
     """
     Factor de fricción por la correlación de Haaland (explícita).
     
     1/√f = -1.8·log₁₀[(ε/D / 3.7)^1.11 + 6.9/Re]
+    
+    Acepta escalares o arreglos de NumPy (con broadcasting).
     """
-    if Re <= 0:
-        return 0.0
-    termino = (epsilon / D / 3.7)**1.11 + 6.9 / Re
-    inv_sqrt_f = -1.8 * np.log10(termino)
-    return 1.0 / inv_sqrt_f**2
+    if _es_escalar(Re, epsilon, D):
+        if Re <= 0:
+            return 0.0
+        termino = (epsilon / D / 3.7)**1.11 + 6.9 / Re
+        inv_sqrt_f = -1.8 * np.log10(termino)
+        return 1.0 / inv_sqrt_f**2
+    
+    Re, rr = np.broadcast_arrays(
+        np.asarray(Re, dtype=float), np.asarray(epsilon, dtype=float) / D
+    )
+    f = np.zeros(Re.shape)
+    activo = Re > 0
+    termino = (rr[activo] / 3.7)**1.11 + 6.9 / Re[activo]
+    f[activo] = 1.0 / (-1.8 * np.log10(termino))**2
+    return f
 
 
-def f_colebrook(Re: float, epsilon: float, D: float) -> float:
+def _f_colebrook_fsolve(Re: float, epsilon: float, D: float) -> float:
     """
-    Factor de fricción por la ecuación de Colebrook-White (implícita).
-    
-    1/√f = -2·log₁₀(ε/D / 3.7 + 2.51/(Re·√f))
+    Ruta escalar de referencia con scipy.optimize.fsolve.
     
-    Resuelve iterativamente usando scipy.optimize.fsolve,
-    con la solución de Haaland como semilla inicial.
+    Se conserva para validar el solver vectorizado y para los benchmarks.
     """
     if Re <= 0:
         return 0.0
@@ -80,16 +239,300 @@ def f_colebrook(Re: float, epsilon: float, D: float) -> float:
     return float(sol[0])
 
 
-def f_swamee_jain(Re: float, epsilon: float, D: float) -> float:
+def f_colebrook(Re, epsilon, D):
+    """
+    Factor de fricción por la ecuación de Colebrook-White (implícita).
+    
+    1/√f = -2·log₁₀(ε/D / 3.7 + 2.51/(Re·√f))
+    
+    Resuelve con Newton-Raphson vectorizado (ver `_colebrook_vectorizado`),
+    con la solución de Haaland como semilla inicial. Acepta escalares
+    (retorna float) o arreglos de NumPy para Re, ε y D (con broadcasting).
+    
+    La ruta escalar consulta `CACHE_FRICCION`: los 8 tramos comparten Re
+    y ε/D, así que en cada recálculo del sistema solo el primero resuelve.
+    """
+    if _es_escalar(Re, epsilon, D):
+        if Re <= 0:
+            return 0.0
+        return CACHE_FRICCION.obtener(Re, epsilon / D)
+    return _colebrook_vectorizado(Re, np.asarray(epsilon, dtype=float) / D)
+
+
+def f_swamee_jain(Re, epsilon, D):
     """
     Factor de fricción por la ecuación de Swamee-Jain (explícita).
     
     f = 0.25 / [log₁₀(ε/(3.7·D) + 5.74/Re^0.9)]²
+    
+    Acepta escalares o arreglos de NumPy (con broadcasting).
     """
-    if Re <= 0:
-        return 0.0
-    termino = epsilon / (3.7 * D) + 5.74 / Re**0.9
-    return 0.25 / (np.log10(termino))**2
+    if _es_escalar(Re, epsilon, D):
+        if Re <= 0:
+            return 0.0
+        termino = epsilon / (3.7 * D) + 5.74 / Re**0.9
+        return 0.25 / (np.log10(termino))**2
+    
+    Re, rr = np.broadcast_arrays(
+        np.asarray(Re, dtype=float), np.asarray(epsilon, dtype=float) / D
+    )
+    f = np.zeros(Re.shape)
+    activo = Re > 0
+    termino = rr[activo] / 3.7 + 5.74 / Re[activo]**0.9
+    f[activo] = 0.25 / (np.log10(termino))**2
+    return f
+
+
+def _explicita(formula, Re, epsilon, D):
+    """
+    Evalúa una correlación explícita `formula(Re, ε/D)` con la misma
+    convención que las demás: escalar → float, arreglos con broadcasting,
+    Re <= 0 → 0.0.
+    """
+    if _es_escalar(Re, epsilon, D):
+        if Re <= 0:
+            return 0.0
+        return float(formula(float(Re), epsilon / D))
+    
+    Re, rr = np.broadcast_arrays(
+        np.asarray(Re, dtype=float), np.asarray(epsilon, dtype=float) / D
+    )
+    f = np.zeros(Re.shape)
+    activo = Re > 0
+    f[activo] = formula(Re[activo], rr[activo])
+    return f
+
+
+def _churchill(Re, rr):
+    A = (2.457 * np.log(1.0 / ((7.0 / Re)**0.9 + 0.27 * rr)))**16
+    B = (37530.0 / Re)**16
+    return 8.0 * ((8.0 / Re)**12 + 1.0 / (A + B)**1.5)**(1.0 / 12.0)
+
+
+def f_churchill(Re, epsilon, D):
+    """
+    Factor de fricción por la correlación de Churchill (1977), explícita
+    y válida en todos los regímenes (laminar, transición y turbulento).
+    
+    f = 8·[(8/Re)¹² + 1/(A + B)^1.5]^(1/12)
+    A = [2.457·ln(1/((7/Re)^0.9 + 0.27·ε/D))]¹⁶,  B = (37530/Re)¹⁶
+    
+    Acepta escalares o arreglos de NumPy (con broadcasting).
+    """
+    return _explicita(_churchill, Re, epsilon, D)
+
+
+def _serghides(Re, rr):
+    a = rr / 3.7
+    A = -2.0 * np.log10(a + 12.0 / Re)
+    B = -2.0 * np.log10(a + 2.51 * A / Re)
+    C = -2.0 * np.log10(a + 2.51 * B / Re)
+    return (A - (B - A)**2 / (C - 2.0 * B + A))**-2
+
+
+def f_serghides(Re, epsilon, D):
+    """
+    Factor de fricción por la correlación de Serghides (1984): tres
+    sustituciones de Colebrook aceleradas con Steffensen (explícita).
+    
+    A = -2·log₁₀(ε/D/3.7 + 12/Re)
+    B = -2·log₁₀(ε/D/3.7 + 2.51·A/Re)
+    C = -2·log₁₀(ε/D/3.7 + 2.51·B/Re)
+    f = [A - (B - A)²/(C - 2B + A)]⁻²
+    
+    Acepta escalares o arreglos de NumPy (con broadcasting).
+    """
+    return _explicita(_serghides, Re, epsilon, D)
+
+
+def _goudar_sonnad(Re, rr):
+    b = rr / 3.7
+    d = _LN10 * Re / 5.02
+    s = b * d + np.log(d)
+    q = s**(s / (s + 1.0))
+    g_ = b * d + np.log(d / q)
+    z = np.log(q / g_)
+    delta_la = z * g_ / (g_ + 1.0)
+    delta_cfa = delta_la * (1.0 + (z / 2.0) / ((g_ + 1.0)**2 + (z / 3.0) * (2.0 * g_ - 1.0)))
+    return ((2.0 / _LN10) * (np.log(d / q) + delta_cfa))**-2
+
+
+def f_goudar_sonnad(Re, epsilon, D):
+    """
+    Factor de fricción por la aproximación de Goudar-Sonnad (2008) de la
+    solución exacta de Colebrook con la función W de Lambert (explícita;
+    error relativo del orden de 1e-12 en régimen turbulento).
+    
+    Acepta escalares o arreglos de NumPy (con broadcasting).
+    """
+    return _explicita(_goudar_sonnad, Re, epsilon, D)
+
+
+# Límites de régimen (número de Reynolds)
+RE_LAMINAR = 2300.0     # Re <= RE_LAMINAR: laminar
+RE_TURBULENTO = 4000.0  # Re > RE_TURBULENTO: turbulento; entre ambos, transición
+
+
+def regimen_flujo(Re):
+    """
+    Régimen de flujo: 'Laminar', 'Transición' o 'Turbulento'.
+    
+    Acepta un escalar (retorna str) o un arreglo (retorna arreglo de str).
+    """
+    if _es_escalar(Re):
+        if Re > RE_TURBULENTO:
+            return 'Turbulento'
+        return 'Transición' if Re > RE_LAMINAR else 'Laminar'
+    Re = np.asarray(Re, dtype=float)
+    return np.select(
+        [Re > RE_TURBULENTO, Re > RE_LAMINAR],
+        ['Turbulento', 'Transición'],
+        default='Laminar',
+    )
+
+
+def f_regimen(Re, epsilon, D):
+    """
+    Factor de fricción según el régimen de flujo.
+    
+    - Laminar (Re <= 2300): f = 64/Re
+    - Turbulento (Re > 4000): Colebrook-White
+    - Transición: interpolación lineal en Re entre 64/2300 y el valor de
+      Colebrook en Re = 4000 (continua en ambos límites)
+    
+    Con arreglos, cada régimen se evalúa solo sobre su máscara (sin
+    ciclos ni condicionales por elemento). Re <= 0 devuelve 0.0.
+    """
+    f_laminar_limite = 64.0 / RE_LAMINAR
+    ancho = RE_TURBULENTO - RE_LAMINAR
+    if _es_escalar(Re, epsilon, D):
+        if Re <= 0:
+            return 0.0
+        if Re <= RE_LAMINAR:
+            return 64.0 / Re
+        if Re > RE_TURBULENTO:
+            return f_colebrook(Re, epsilon, D)
+        f_turbulento_limite = f_colebrook(RE_TURBULENTO, epsilon, D)
+        peso = (Re - RE_LAMINAR) / ancho
+        return f_laminar_limite + peso * (f_turbulento_limite - f_laminar_limite)
+    
+    Re, rr = np.broadcast_arrays(
+        np.asarray(Re, dtype=float), np.asarray(epsilon, dtype=float) / D
+    )
+    f = np.zeros(Re.shape)
+    laminar = (Re > 0) & (Re <= RE_LAMINAR)
+    turbulento = Re > RE_TURBULENTO
+    transicion = (Re > RE_LAMINAR) & ~turbulento
+    
+    f[laminar] = 64.0 / Re[laminar]
+    f[turbulento] = _colebrook_vectorizado(Re[turbulento], rr[turbulento])
+    if np.any(transicion):
+        f_turbulento_limite = _colebrook_vectorizado(RE_TURBULENTO, rr[transicion])
+        peso = (Re[transicion] - RE_LAMINAR) / ancho
+        f[transicion] = f_laminar_limite + peso * (f_turbulento_limite - f_laminar_limite)
+    return f
+
+
+def _f_tabla(Re, epsilon, D):
+    """Colebrook interpolado de la tabla de Moody (ver `core.tabla_moody`)."""
+    from core.tabla_moody import f_tabla
+    return f_tabla(Re, epsilon, D)
+
+
+# Métodos de cálculo del factor de fricción usados en las pérdidas
+METODOS_FRICCION = {
+    'colebrook': f_colebrook,
+    'tabla': _f_tabla,
+    'regimen': f_regimen,
+    'haaland': f_haaland,
+    'swamee_jain': f_swamee_jain,
+    'churchill': f_churchill,
+    'serghides': f_serghides,
+    'goudar_sonnad': f_goudar_sonnad,
+}
+
+
+def factor_friccion(Re, epsilon, D, metodo: str = 'colebrook'):
+    """
+    Factor de fricción con el método elegido de `METODOS_FRICCION`.
+    
+    'colebrook' resuelve la ecuación implícita; 'tabla' interpola la tabla
+    precalculada del diagrama de Moody (error relativo < 1e-6 frente a
+    'colebrook'); 'regimen' usa 64/Re en laminar, interpola en transición
+    y Colebrook en turbulento (`f_regimen`). Las demás son correlaciones
+    explícitas; `comparar_correlaciones` mide su error y su costo.
+    Acepta escalares o arreglos.
+    """
+    try:
+        funcion = METODOS_FRICCION[metodo]
+    except KeyError:
+        raise ValueError(
+            f"Método de fricción desconocido: {metodo!r} "
+            f"(opciones: {', '.join(METODOS_FRICCION)})"
+        ) from None
+    return funcion(Re, epsilon, D)
+
+
+def comparar_correlaciones(
+    n_re: int = 500,
+    n_rugosidad: int = 200,
+    log_re=(np.log10(RE_TURBULENTO), 8.0),
+    log_rugosidad=(-6.0, -1.5),
+    repeticiones: int = 3,
+    metodos=None,
+) -> pd.DataFrame:
+    """
+    Precisión y costo de cada método de `METODOS_FRICCION`.
+    
+    Evalúa todos los métodos sobre una malla densa log-uniforme de
+    Re × ε/D (por defecto, el régimen turbulento del diagrama de Moody) y
+    los compara con la solución de Colebrook con el solver vectorizado.
+    
+    Retorna DataFrame indexado por método, ordenado por costo, con
+    'error_rel_max', 'error_rel_medio' y 'ns_por_evaluacion' (mejor de
+    `repeticiones`).
+    """
+    import time
+    
+    if metodos is None:
+        metodos = list(METODOS_FRICCION)
+    Re, rr = np.meshgrid(
+        np.logspace(*log_re, n_re), np.logspace(*log_rugosidad, n_rugosidad),
+        indexing='ij',
+    )
+    Re, rr = Re.ravel(), rr.ravel()
+    exacto = _colebrook_vectorizado(Re, rr)
+    
+    filas = []
+    for metodo in metodos:
+        funcion = METODOS_FRICCION[metodo]
+        tiempos = []
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            f = funcion(Re, rr, 1.0)
+            tiempos.append(time.perf_counter() - t0)
+        error = np.abs(f / exacto - 1.0)
+        filas.append({
+            'metodo': metodo,
+            'error_rel_max': float(error.max()),
+            'error_rel_medio': float(error.mean()),
+            'ns_por_evaluacion': min(tiempos) / len(Re) * 1e9,
+        })
+    return pd.DataFrame(filas).set_index('metodo').sort_values('ns_por_evaluacion')
+
+
+def elegir_metodo_friccion(tolerancia: float = 1e-3, comparacion: pd.DataFrame | None = None) -> str:
+    """
+    Método más rápido cuyo error relativo máximo frente a Colebrook no
+    supera `tolerancia` (según `comparar_correlaciones`, que se ejecuta
+    si no se da `comparacion`).
+    """
+    if comparacion is None:
+        comparacion = comparar_correlaciones()
+    candidatos = comparacion[comparacion['error_rel_max'] <= tolerancia]
+    if candidatos.empty:
+        return 'colebrook'
+    return candidatos['ns_por_evaluacion'].idxmin()
 
 
 def perdidas_darcy(f: float, L: float, D: float, v: float) -> float:
@@ -150,6 +593,16 @@ def kw_a_hp(P_kw: float) -> float:
     return P_kw / 0.7457
 
 
+def potencia_instalada(potencia_kw, num_estaciones):
+    """
+    Potencia total del sistema (kW): la potencia por estación de cada
+    tramo por su número de estaciones, sumada sobre los tramos.
+
+    Acepta arreglos (..., T); la suma es sobre el último eje.
+    """
+    return (np.asarray(potencia_kw) * num_estaciones).sum(axis=-1)
+
+
 def calcular_tramo(
     Q: float, D: float, L: float, z: float,
     rho: float = 998.0, mu: float = 0.001,
@@ -157,6 +610,7 @@ def calcular_tramo(
     K_total: float = 0.0,
     num_estaciones: int = 1,
     es_bajada: bool = False,
+    metodo_friccion: str = 'colebrook',
 ) -> dict:
     """
     Calcula todos los parámetros hidráulicos para un tramo de tubería.
@@ -172,6 +626,8 @@ def calcular_tramo(
         K_total: suma de coeficientes K de accesorios
         num_estaciones: número de estaciones de bombeo en el tramo
         es_bajada: si True, el tramo es descendente (usa válvula en vez de bomba)
+        metodo_friccion: método de `METODOS_FRICCION` para el factor de
+            las pérdidas ('f_colebrook' en el resultado)
     
     Retorna dict con todos los valores calculados.
     """
@@ -180,7 +636,7 @@ def calcular_tramo(
     hv = carga_cinetica(v)
     Re = reynolds(rho, v, D, mu)
     
-    f_col = f_colebrook(Re, epsilon, D)
+    f_col = factor_friccion(Re, epsilon, D, metodo_friccion)
     f_haa = f_haaland(Re, epsilon, D)
     f_swa = f_swamee_jain(Re, epsilon, D)
     
@@ -239,15 +695,19 @@ def calcular_sistema_completo(
     rho: float = 998.0,
     mu: float = 0.001,
     epsilon: float = 0.000046,
-) -> dict:
+    metodo_friccion: str = 'colebrook',
+) -> 'ResultadoSistema':
     """
     Recalcula todo el sistema hidráulico con los parámetros dados.
     
     Usa las geometrías fijas de los 8 tramos (distancias, alturas, accesorios)
     pero permite cambiar los parámetros del fluido y la tubería.
+    `metodo_friccion` se pasa a `calcular_tramo`.
     
-    Retorna dict con resultados para cada tramo.
+    Retorna un `ResultadoSistema` columnar; `resultados[num_tramo]` sigue
+    dando los valores del tramo como un mapeo de solo lectura.
     """
+    from core.resultados import ResultadoSistema
     from core.tramos import obtener_definicion_tramos
     
     definiciones = obtener_definicion_tramos()
@@ -262,13 +722,14 @@ def calcular_sistema_completo(
             K_total=defn['K_total'],
             num_estaciones=defn['num_estaciones'],
             es_bajada=defn['es_bajada'],
+            metodo_friccion=metodo_friccion,
         )
         resultado['distancia'] = defn['distancia']
         resultado['altura'] = defn['altura']
         resultado['pendiente'] = defn['pendiente']
         resultado['longitud_tuberia'] = defn['longitud_tuberia']
         resultado['tipo'] = defn['tipo']
-        resultado['accesorios'] = defn['accesorios']
+        resultado['accesorios'] = [dict(a) for a in defn['accesorios']]
         resultado['notas'] = defn.get('notas', '')
         resultado['tanque_rompe_presion'] = defn.get('tanque_rompe_presion', True)
         resultado['recibe_gravedad_de'] = defn.get('recibe_gravedad_de', None)
@@ -292,10 +753,12 @@ def calcular_sistema_completo(
             )
             cabeza_gravedad = max(0.0, cabeza_gravedad)
             
-            # Recalcular carga de la bomba reducida
+            # Recalcular carga de la bomba reducida. La cabeza se recibe una
+            # sola vez por tramo y se reparte entre sus estaciones.
             r = resultados[num_tramo]
             H_original = r['carga_estacion']
-            H_reducida = max(0.0, H_original - cabeza_gravedad)
+            n_est = max(r['num_estaciones'], 1)
+            H_reducida = max(0.0, H_original * n_est - cabeza_gravedad) / n_est
             
             r['cabeza_gravedad_recibida'] = cabeza_gravedad
             r['carga_estacion_original'] = H_original
@@ -304,4 +767,183 @@ def calcular_sistema_completo(
             r['potencia_kw'] = potencia_bomba(rho, Q, H_reducida)
             r['potencia_hp'] = kw_a_hp(r['potencia_kw'])
     
-    return resultados
+    return ResultadoSistema.desde_filas(resultados)
+
+
+# Columnas numéricas por tramo que produce el cálculo por lotes
+# (mismas claves que `calcular_tramo`, más la transferencia de gravedad).
+COLUMNAS_LOTE = (
+    'area', 'velocidad', 'carga_cinetica', 'reynolds',
+    'f_colebrook', 'f_haaland', 'f_swamee_jain',
+    'longitud_estacion', 'perdidas_friccion_colebrook',
+    'perdidas_friccion_haaland', 'perdidas_menores', 'z_estacion',
+    'carga_estacion', 'carga_total', 'potencia_kw', 'potencia_hp',
+    'num_estaciones', 'es_bajada',
+    'cabeza_gravedad_recibida', 'carga_estacion_original',
+)
+
+
+def _calcular_sistema_arrays(
+    Q, D, rho, mu, epsilon, geometria=None, num_estaciones=None, K_total=None,
+    metodo_friccion: str = 'colebrook',
+) -> dict:
+    """
+    Núcleo vectorizado de `calcular_sistema_completo`.
+    
+    Q, D, rho, mu y epsilon son arreglos 1D del mismo largo N (un punto
+    de operación por elemento); `geometria` es una `GeometriaTramos`
+    (por defecto, la de `core.tramos.obtener_geometria()`).
+    `num_estaciones`, si se da, reemplaza el número de estaciones de la
+    geometría: arreglo (T,) o (N, T) con una configuración por punto.
+    `K_total`, igual, reemplaza la suma de coeficientes de accesorios.
+    `metodo_friccion` elige el factor de las pérdidas (ver `factor_friccion`).
+    Retorna un dict con:
+        'tramos': arreglo (T,) con los números de tramo
+        'area', 'velocidad', 'carga_cinetica', 'reynolds', factores de
+        fricción: arreglos (N,), comunes a todos los tramos
+        el resto de `COLUMNAS_LOTE`: arreglos (N, T)
+    
+    Aplica las mismas fórmulas que `calcular_tramo` y la misma
+    transferencia de cabeza gravitacional entre tramos.
+    """
+    if geometria is None:
+        from core.tramos import obtener_geometria
+        geometria = obtener_geometria()
+    
+    L = geometria.longitud_tuberia
+    z = geometria.z
+    K = geometria.K_total if K_total is None else np.asarray(K_total, dtype=float)
+    if num_estaciones is None:
+        num_estaciones = geometria.num_estaciones
+    n = np.broadcast_to(num_estaciones, (len(Q), len(L))).astype(float)
+    bajada = geometria.es_bajada
+    fuente = geometria.fuente_gravedad
+    
+    # Magnitudes comunes a todos los tramos (mismo Q y D por punto)
+    A = area_seccion(D)
+    v = velocidad(Q, A)
+    hv = carga_cinetica(v)
+    Re = reynolds(rho, v, D, mu)
+    f_col = factor_friccion(Re, epsilon, D, metodo_friccion)
+    f_haa = f_haaland(Re, epsilon, D)
+    f_swa = f_swamee_jain(Re, epsilon, D)
+    
+    # Por estación (sin estaciones se usa el tramo completo)
+    divisor = np.where(n > 0, n, 1.0)
+    L_est = L / divisor
+    z_est = z / divisor
+    
+    col = (slice(None), None)  # (N,) -> (N, 1) para operar contra (T,)
+    hf_crane = perdidas_darcy(f_col[col], L_est, D[col], v[col])
+    hf_haaland = perdidas_darcy(f_haa[col], L_est, D[col], v[col])
+    hm = perdidas_menores(K, v[col])
+    H_est = carga_total(np.abs(z_est), hf_crane, hm)
+    H_original = H_est.copy()
+    
+    # Transferencia de energía gravitacional entre tramos
+    cabeza_recibida = np.zeros_like(H_est)
+    for i in np.flatnonzero(fuente >= 0):
+        j = fuente[i]
+        cabeza = np.maximum(
+            0.0,
+            abs(geometria.altura[j])
+            - hf_crane[:, j] * n[:, j]
+            - hm[:, j] * n[:, j],
+        )
+        cabeza_recibida[:, i] = cabeza
+        # Se recibe una sola vez por tramo y se reparte entre sus estaciones
+        H_est[:, i] = np.maximum(0.0, H_est[:, i] * divisor[:, i] - cabeza) / divisor[:, i]
+    
+    # Los tramos receptores de gravedad siempre se calculan con bomba
+    receptor = fuente >= 0
+    P_kw = np.where(bajada & ~receptor, 0.0, potencia_bomba(rho[col], Q[col], H_est))
+    
+    forma = H_est.shape
+    return {
+        'tramos': geometria.numeros,
+        'area': A,
+        'velocidad': v,
+        'carga_cinetica': hv,
+        'reynolds': Re,
+        'f_colebrook': f_col,
+        'f_haaland': f_haa,
+        'f_swamee_jain': f_swa,
+        'longitud_estacion': L_est,
+        'perdidas_friccion_colebrook': hf_crane,
+        'perdidas_friccion_haaland': hf_haaland,
+        'perdidas_menores': hm,
+        'z_estacion': z_est,
+        'carga_estacion': H_est,
+        'carga_total': H_est * n,
+        'potencia_kw': P_kw,
+        'potencia_hp': kw_a_hp(P_kw),
+        'num_estaciones': n.astype(int),
+        'es_bajada': np.broadcast_to(bajada, forma),
+        'cabeza_gravedad_recibida': cabeza_recibida,
+        'carga_estacion_original': H_original,
+    }
+
+
+def calcular_sistema_lote(
+    Q=0.025,
+    D=0.1541,
+    rho=998.0,
+    mu=0.001,
+    epsilon=0.000046,
+    puntos: pd.DataFrame | None = None,
+    metodo_friccion: str = 'colebrook',
+    num_estaciones=None,
+    K_total=None,
+) -> pd.DataFrame:
+    """
+    Evalúa el sistema completo para muchos puntos de operación a la vez.
+    
+    Parámetros:
+        Q, D, rho, mu, epsilon: escalares o arreglos (se hace broadcasting
+            entre ellos); cada elemento es un punto de operación
+        puntos: alternativa a los anteriores; DataFrame con columnas
+            'Q', 'D', 'rho', 'mu', 'epsilon' (las faltantes toman el
+            valor del argumento correspondiente)
+        metodo_friccion: ver `factor_friccion`
+        num_estaciones, K_total: reemplazos por tramo, arreglos (T,) o
+            (N, T) (ver `_calcular_sistema_arrays`)
+    
+    Retorna un DataFrame columnar con una fila por (punto, tramo): las
+    columnas 'punto' y 'tramo', los parámetros de entrada y las
+    magnitudes de `COLUMNAS_LOTE`. Los valores coinciden con los de
+    `calcular_sistema_completo` evaluado punto a punto.
+    """
+    if puntos is not None:
+        Q = puntos['Q'].to_numpy() if 'Q' in puntos else Q
+        D = puntos['D'].to_numpy() if 'D' in puntos else D
+        rho = puntos['rho'].to_numpy() if 'rho' in puntos else rho
+        mu = puntos['mu'].to_numpy() if 'mu' in puntos else mu
+        epsilon = puntos['epsilon'].to_numpy() if 'epsilon' in puntos else epsilon
+    
+    Q, D, rho, mu, epsilon = (
+        np.ravel(x).astype(float)
+        for x in np.broadcast_arrays(Q, D, rho, mu, epsilon)
+    )
+    arr = _calcular_sistema_arrays(
+        Q, D, rho, mu, epsilon,
+        num_estaciones=num_estaciones, K_total=K_total,
+        metodo_friccion=metodo_friccion,
+    )
+    N, T = len(Q), len(arr['tramos'])
+    
+    columnas = {
+        'punto': np.repeat(np.arange(N), T),
+        'tramo': np.tile(arr['tramos'], N),
+        'Q': np.repeat(Q, T),
+        'D': np.repeat(D, T),
+        'rho': np.repeat(rho, T),
+        'mu': np.repeat(mu, T),
+        'epsilon': np.repeat(epsilon, T),
+    }
+    for nombre in COLUMNAS_LOTE:
+        valores = arr[nombre]
+        if valores.ndim == 1:
+            columnas[nombre] = np.repeat(valores, T)
+        else:
+            columnas[nombre] = valores.reshape(-1)
+    return pd.DataFrame(columnas)
@@ -0,0 +1,258 @@
+"""
+incertidumbre.py — Análisis de incertidumbre por Monte Carlo.
+
+Propaga la incertidumbre de Q, ρ, μ, ε y de los coeficientes K de los
+accesorios de cada tramo hasta la potencia de bombeo, para dimensionar
+motores con un percentil alto (P95) en vez del valor puntual.
+
+Las muestras se evalúan por bloques con el núcleo vectorizado
+`_calcular_sistema_arrays` (los 8 tramos a la vez); los bloques pueden
+repartirse en un `ProcessPoolExecutor`. Cada bloque tiene su propia
+semilla derivada con `SeedSequence.spawn`, de modo que el resultado no
+depende del número de procesos.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.hidraulica import _calcular_sistema_arrays, potencia_instalada
+from core.tramos import obtener_geometria
+
+TAMANO_BLOQUE = 100_000
+PERCENTILES = (5, 50, 95, 99)
+BARRAS_HISTOGRAMA = 80
+# Los índices de sensibilidad convergen mucho antes que las colas de la
+# distribución: se estiman sobre una submuestra de este tamaño
+MUESTRAS_SENSIBILIDAD = 100_000
+# Desviación relativa por debajo de la cual una variable se considera fija
+# (errores de redondeo del cálculo, no incertidumbre)
+_RUIDO_RELATIVO = 1e-9
+
+
+def distribuciones_por_defecto(
+    Q: float = 0.025,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+) -> dict:
+    """
+    Distribuciones centradas en los valores puntuales de diseño.
+
+    Cada entrada es (tipo, a, b):
+        'normal': media, desviación estándar
+        'lognormal': mediana, sigma del logaritmo
+        'uniforme': mínimo, máximo
+    """
+    return {
+        'Q': ('normal', Q, 0.05 * Q),
+        'rho': ('normal', rho, 0.002 * rho),
+        # La viscosidad depende de la temperatura del agua (≈ ±15 %)
+        'mu': ('lognormal', mu, 0.15),
+        # La rugosidad crece con la edad de la tubería y es la más incierta
+        'epsilon': ('lognormal', epsilon, 0.5),
+    }
+
+
+def _muestrear(distribucion, n: int, rng) -> np.ndarray:
+    """Genera n muestras de una distribución (tipo, a, b)."""
+    tipo, a, b = distribucion
+    if tipo == 'normal':
+        # Truncada en valores positivos (todas las entradas son físicas > 0)
+        return np.maximum(rng.normal(a, b, n), 1e-12 * abs(a))
+    if tipo == 'lognormal':
+        return a * np.exp(rng.normal(0.0, b, n))
+    if tipo == 'uniforme':
+        return rng.uniform(a, b, n)
+    raise ValueError(f"Distribución desconocida: {tipo!r}")
+
+
+def _evaluar_bloque(args: tuple) -> dict:
+    """
+    Muestrea y evalúa un bloque de n puntos.
+
+    Los K de cada accesorio se muestrean con una lognormal de mediana K
+    y se suman por tramo; la diferencia entre `K_total` y la suma de los
+    accesorios (pérdidas no desglosadas) se mantiene fija.
+    """
+    semilla, n, D, distribuciones, incertidumbre_K = args
+    rng = np.random.default_rng(semilla)
+    geometria = obtener_geometria()
+
+    muestras = {
+        nombre: _muestrear(dist, n, rng) for nombre, dist in distribuciones.items()
+    }
+
+    # Matriz de incidencia accesorio → tramo, ponderada por la cantidad
+    # (solo accesorios presentes: los de cantidad o K nulos no aportan)
+    T = len(geometria.numeros)
+    posicion = np.full(geometria.numeros.max() + 1, -1)
+    posicion[geometria.numeros] = np.arange(T)
+    presentes = np.flatnonzero((geometria.acc_cantidad > 0) & (geometria.acc_K > 0))
+    K_nominal = geometria.acc_K[presentes]
+    incidencia = np.zeros((len(presentes), T))
+    incidencia[np.arange(len(presentes)), posicion[geometria.acc_tramo[presentes]]] = (
+        geometria.acc_cantidad[presentes]
+    )
+    dK = K_nominal * np.expm1(rng.normal(0.0, incertidumbre_K, (n, len(presentes))))
+    K_total = geometria.K_total + dK @ incidencia
+
+    r = _calcular_sistema_arrays(
+        muestras['Q'], np.full(n, D), muestras['rho'], muestras['mu'], muestras['epsilon'],
+        geometria=geometria, K_total=K_total,
+    )
+    muestras['K_total'] = K_total
+    muestras['potencia_kw'] = r['potencia_kw']
+    muestras['potencia_total_kw'] = potencia_instalada(r['potencia_kw'], r['num_estaciones'])
+    return muestras
+
+
+def _rangos(x: np.ndarray) -> np.ndarray:
+    """Rangos por columna (sin corrección de empates, datos continuos)."""
+    r = np.empty_like(x)
+    filas = np.arange(x.shape[0], dtype=float)
+    for j in range(x.shape[1]):
+        r[np.argsort(x[:, j]), j] = filas
+    return r
+
+
+def indices_sensibilidad(X: np.ndarray, y: np.ndarray, nombres) -> pd.DataFrame:
+    """
+    Índices de sensibilidad basados en muestreo.
+
+    Retorna DataFrame indexado por variable con:
+        'src': coeficiente de regresión estandarizado (signo y magnitud)
+        'src2': SRC², fracción de la varianza explicada por la variable
+                (suma ≈ R² si el modelo es casi lineal)
+        'spearman': correlación de rangos con la salida
+    Las variables (o la salida) que no varían más allá del redondeo
+    tienen índices 0: sin incertidumbre no hay nada que repartir.
+    """
+    src = np.zeros(X.shape[1])
+    spearman = np.zeros(X.shape[1])
+    desv_y = y.std()
+    if not desv_y > _RUIDO_RELATIVO * np.abs(y).max(initial=0.0):
+        return pd.DataFrame(
+            {'src': src, 'src2': src, 'spearman': spearman},
+            index=pd.Index(list(nombres), name='variable'),
+        )
+    desv = X.std(axis=0)
+    variable = desv > _RUIDO_RELATIVO * np.abs(X).max(axis=0, initial=0.0)
+    Xs = (X[:, variable] - X[:, variable].mean(axis=0)) / desv[variable]
+    ys = (y - y.mean()) / desv_y
+    src[variable] = np.linalg.lstsq(Xs, ys, rcond=None)[0]
+
+    rX = _rangos(X[:, variable])
+    ry = _rangos(y[:, None])[:, 0]
+    rX -= rX.mean(axis=0)
+    ry -= ry.mean()
+    spearman[variable] = (rX * ry[:, None]).sum(axis=0) / np.sqrt(
+        (rX**2).sum(axis=0) * (ry**2).sum()
+    )
+    return pd.DataFrame(
+        {'src': src, 'src2': src**2, 'spearman': spearman},
+        index=pd.Index(list(nombres), name='variable'),
+    )
+
+
+def monte_carlo_potencia(
+    n_muestras: int = 100_000,
+    Q: float = 0.025,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    distribuciones: dict | None = None,
+    incertidumbre_K: float = 0.20,
+    percentiles=PERCENTILES,
+    barras_histograma: int = BARRAS_HISTOGRAMA,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    procesos: int | None = 1,
+    semilla: int | None = None,
+) -> dict:
+    """
+    Distribución de la potencia de bombeo por Monte Carlo.
+
+    Parámetros:
+        n_muestras: número de evaluaciones del sistema completo
+        distribuciones: {'Q'|'rho'|'mu'|'epsilon': (tipo, a, b)}; las
+            variables omitidas quedan fijas en su valor puntual. Por
+            defecto, `distribuciones_por_defecto` centradas en Q, ρ, μ, ε.
+        incertidumbre_K: sigma logarítmica de cada K de accesorio
+        tamano_bloque: muestras evaluadas por lote vectorizado (acota
+            la memoria: ~20 arreglos de tamano_bloque × 8 tramos)
+        procesos: con más de 1 los bloques se evalúan en paralelo;
+            None usa todos los núcleos
+        semilla: semilla reproducible
+
+    Retorna dict con:
+        'muestras': DataFrame con las entradas muestreadas, K_total y
+                    potencia por estación de cada tramo (K_Tn, P_Tn) y
+                    'potencia_total_kw'
+        'percentiles': DataFrame (percentil × potencia total y por
+                       estación de cada tramo, kW)
+        'sensibilidad': DataFrame de `indices_sensibilidad` respecto a
+                        la potencia total (sobre las primeras
+                        `MUESTRAS_SENSIBILIDAD` muestras)
+        'histograma': (conteo, bordes) de la potencia total con
+                      `barras_histograma` barras
+        'media', 'desviacion': de la potencia total (kW)
+
+    Todo salvo 'muestras' es un resumen de tamaño fijo: basta para
+    graficar y tabular sin conservar las muestras.
+    """
+    if distribuciones is None:
+        distribuciones = distribuciones_por_defecto(Q, rho, mu, epsilon)
+    puntuales = {'Q': Q, 'rho': rho, 'mu': mu, 'epsilon': epsilon}
+    distribuciones = {
+        nombre: distribuciones.get(nombre, ('uniforme', valor, valor))
+        for nombre, valor in puntuales.items()
+    }
+
+    n_bloques = -(-n_muestras // tamano_bloque)
+    tamanos = [tamano_bloque] * (n_bloques - 1) + [n_muestras - tamano_bloque * (n_bloques - 1)]
+    semillas = np.random.SeedSequence(semilla).spawn(n_bloques)
+    tareas = [(s, n, D, distribuciones, incertidumbre_K) for s, n in zip(semillas, tamanos)]
+    if procesos == 1:
+        bloques = [_evaluar_bloque(t) for t in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            bloques = list(ejecutor.map(_evaluar_bloque, tareas))
+
+    def unir(clave):
+        return np.concatenate([b[clave] for b in bloques])
+
+    numeros = obtener_geometria().numeros
+    columnas = {nombre: unir(nombre) for nombre in puntuales}
+    K_total = unir('K_total')
+    potencia = unir('potencia_kw')
+    for i, t in enumerate(numeros):
+        columnas[f'K_T{t}'] = K_total[:, i]
+    for i, t in enumerate(numeros):
+        columnas[f'P_T{t}'] = potencia[:, i]
+    total = unir('potencia_total_kw')
+    columnas['potencia_total_kw'] = total
+    muestras = pd.DataFrame(columnas)
+
+    salidas = ['potencia_total_kw'] + [f'P_T{t}' for t in numeros]
+    tabla = pd.DataFrame(
+        np.percentile(muestras[salidas].to_numpy(), percentiles, axis=0),
+        index=pd.Index(percentiles, name='percentil'),
+        columns=salidas,
+    )
+
+    entradas = list(puntuales) + [f'K_T{t}' for t in numeros]
+    sub = slice(0, MUESTRAS_SENSIBILIDAD)  # las muestras son i.i.d.
+    sensibilidad = indices_sensibilidad(
+        muestras[entradas].to_numpy()[sub], total[sub], entradas
+    )
+
+    return {
+        'muestras': muestras,
+        'percentiles': tabla,
+        'sensibilidad': sensibilidad,
+        'histograma': np.histogram(total, bins=barras_histograma),
+        'media': float(total.mean()),
+        'desviacion': float(total.std()),
+    }
@@ -0,0 +1,283 @@
+"""
+optimizacion.py — Optimización del diseño del sistema hidráulico.
+
+Búsquedas exhaustivas evaluadas por lotes sobre el núcleo vectorizado
+de `calcular_sistema_completo`:
+- Número de estaciones de bombeo por tramo ascendente, con restricción
+  de presión máxima de descarga.
+- Diámetro económico de la tubería sobre un catálogo comercial, con
+  frente de Pareto costo de capital vs. costo de energía.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from core.hidraulica import _calcular_sistema_arrays, g, potencia_instalada
+from core.tramos import obtener_geometria
+
+# Presión máxima admisible de la tubería (notas del proyecto: 1.6 MPa)
+PRESION_MAX_MPA = 1.6
+
+# Parámetros económicos por defecto
+COSTO_ESTACION = 25_000.0     # USD por estación (obra civil + tanque receptor)
+COSTO_KW_INSTALADO = 600.0    # USD por kW de bomba instalada
+COSTO_ENERGIA = 0.12          # USD/kWh
+HORAS_OPERACION = 8_000.0     # h/año
+VIDA_UTIL = 20                # años
+TASA_DESCUENTO = 0.08         # anual
+
+# Costo de tubería instalada por metro: C = COEF · D^EXP (D en m, USD/m)
+COSTO_TUBERIA_COEF = 1_500.0
+COSTO_TUBERIA_EXP = 1.4
+
+# Diámetros internos comerciales, acero cédula 40 (tablas Crane, apéndice B)
+DIAMETROS_COMERCIALES = {
+    'DN50 (2")': 0.0525,
+    'DN65 (2½")': 0.0627,
+    'DN80 (3")': 0.0779,
+    'DN90 (3½")': 0.0901,
+    'DN100 (4")': 0.1023,
+    'DN125 (5")': 0.1282,
+    'DN150 (6")': 0.1541,
+    'DN200 (8")': 0.2027,
+    'DN250 (10")': 0.2545,
+    'DN300 (12")': 0.3032,
+    'DN350 (14")': 0.3334,
+    'DN400 (16")': 0.3810,
+    'DN450 (18")': 0.4287,
+    'DN500 (20")': 0.4778,
+    'DN600 (24")': 0.5746,
+}
+
+
+def factor_valor_presente(tasa: float = TASA_DESCUENTO, anios: int = VIDA_UTIL) -> float:
+    """Factor de valor presente de una anualidad: [1 - (1+i)^-n] / i."""
+    if tasa == 0:
+        return float(anios)
+    return (1.0 - (1.0 + tasa) ** -anios) / tasa
+
+
+def optimizar_estaciones(
+    Q: float = 0.025,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    objetivo: str = 'potencia',
+    max_estaciones: int = 6,
+    presion_max_mpa: float = PRESION_MAX_MPA,
+    costo_estacion: float = COSTO_ESTACION,
+    costo_kw: float = COSTO_KW_INSTALADO,
+    costo_energia: float = COSTO_ENERGIA,
+    horas_operacion: float = HORAS_OPERACION,
+    vida_util: int = VIDA_UTIL,
+    tasa: float = TASA_DESCUENTO,
+) -> dict:
+    """
+    Busca el número de estaciones de bombeo de cada tramo con bomba.
+
+    Evalúa todas las combinaciones de 1..max_estaciones estaciones en los
+    tramos con bomba (los tramos descendentes conservan su configuración)
+    en un único lote vectorizado, descarta las que superan la presión
+    máxima de descarga y elige la de menor objetivo:
+        'potencia': potencia total instalada (kW)
+        'costo': costo de ciclo de vida = estaciones + kW instalados
+                 + valor presente de la energía
+
+    Las estaciones de un tramo se ubican a igual desnivel (z/n): la
+    energía total no depende de la ubicación, y repartir el desnivel en
+    partes iguales minimiza la presión máxima de descarga para un n dado.
+
+    Retorna dict con:
+        'num_estaciones': {tramo: n} de la mejor configuración
+        'potencia_total_kw', 'costo_ciclo_vida', 'presion_max_mpa'
+        'candidatos': DataFrame con todas las configuraciones factibles,
+                      ordenadas por el objetivo
+    """
+    if objetivo not in ('potencia', 'costo'):
+        raise ValueError(f"objetivo debe ser 'potencia' o 'costo', no {objetivo!r}")
+
+    geometria = obtener_geometria()
+    bomba = ~geometria.es_bajada
+    idx_bomba = np.flatnonzero(bomba)
+
+    # Producto cartesiano de estaciones en los tramos con bomba: (C, T)
+    opciones = np.array(
+        list(itertools.product(range(1, max_estaciones + 1), repeat=len(idx_bomba))),
+        dtype=int,
+    )
+    configs = np.tile(geometria.num_estaciones, (len(opciones), 1))
+    configs[:, idx_bomba] = opciones
+
+    C = len(configs)
+    arr = _calcular_sistema_arrays(
+        np.full(C, Q), np.full(C, D), np.full(C, rho),
+        np.full(C, mu), np.full(C, epsilon),
+        geometria=geometria, num_estaciones=configs,
+    )
+
+    # Presión de descarga de cada estación (antes de descontar gravedad
+    # recibida: la cabeza entrante también presuriza la tubería)
+    presion_mpa = rho * g * arr['carga_estacion_original'] / 1e6
+    presion_mpa = np.where(bomba, presion_mpa, 0.0)
+    presion_max = presion_mpa.max(axis=1)
+
+    potencia_total = potencia_instalada(arr['potencia_kw'], configs)
+    estaciones_total = configs[:, idx_bomba].sum(axis=1)
+    energia_anual = potencia_total * horas_operacion * costo_energia
+    costo = (
+        estaciones_total * costo_estacion
+        + potencia_total * costo_kw
+        + energia_anual * factor_valor_presente(tasa, vida_util)
+    )
+
+    factible = presion_max <= presion_max_mpa
+    if not np.any(factible):
+        raise ValueError(
+            f'Ninguna configuración con hasta {max_estaciones} estaciones por tramo '
+            f'cumple la presión máxima de {presion_max_mpa} MPa.'
+        )
+
+    candidatos = pd.DataFrame(
+        configs[:, idx_bomba],
+        columns=[f'estaciones_T{t}' for t in geometria.numeros[idx_bomba]],
+    )
+    candidatos['potencia_total_kw'] = potencia_total
+    candidatos['costo_ciclo_vida'] = costo
+    candidatos['presion_max_mpa'] = presion_max
+    candidatos = candidatos[factible]
+
+    criterio = 'potencia_total_kw' if objetivo == 'potencia' else 'costo_ciclo_vida'
+    candidatos = candidatos.sort_values(
+        [criterio, 'costo_ciclo_vida' if objetivo == 'potencia' else 'potencia_total_kw'],
+        kind='stable',
+    ).reset_index(drop=True)
+
+    fila = candidatos.iloc[0]
+    num_estaciones = {
+        int(t): int(n) for t, n in zip(geometria.numeros, geometria.num_estaciones)
+    }
+    for t in geometria.numeros[idx_bomba]:
+        num_estaciones[int(t)] = int(fila[f'estaciones_T{t}'])
+
+    return {
+        'num_estaciones': num_estaciones,
+        'potencia_total_kw': float(fila['potencia_total_kw']),
+        'costo_ciclo_vida': float(fila['costo_ciclo_vida']),
+        'presion_max_mpa': float(fila['presion_max_mpa']),
+        'candidatos': candidatos,
+    }
+
+
+def frente_pareto(costo_a: np.ndarray, costo_b: np.ndarray) -> np.ndarray:
+    """
+    Marca los puntos no dominados al minimizar dos costos a la vez.
+    
+    `costo_a` y `costo_b` son arreglos (..., M); el frente se calcula de
+    forma independiente sobre el último eje. Retorna máscara booleana.
+    """
+    orden = np.argsort(costo_a, axis=-1, kind='stable')
+    b_ordenado = np.take_along_axis(costo_b, orden, axis=-1)
+    # Un punto es no dominado si mejora el mínimo de todos los anteriores
+    minimo_previo = np.minimum.accumulate(b_ordenado, axis=-1)
+    minimo_previo = np.concatenate(
+        [np.full(minimo_previo.shape[:-1] + (1,), np.inf), minimo_previo[..., :-1]],
+        axis=-1,
+    )
+    mascara = np.empty_like(b_ordenado, dtype=bool)
+    np.put_along_axis(mascara, orden, b_ordenado < minimo_previo, axis=-1)
+    return mascara
+
+
+def optimizar_diametro(
+    Q=0.025,
+    diametros=None,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    costo_tuberia_coef: float = COSTO_TUBERIA_COEF,
+    costo_tuberia_exp: float = COSTO_TUBERIA_EXP,
+    costo_kw: float = COSTO_KW_INSTALADO,
+    costo_energia: float = COSTO_ENERGIA,
+    horas_operacion: float = HORAS_OPERACION,
+    vida_util: int = VIDA_UTIL,
+    tasa: float = TASA_DESCUENTO,
+    presion_max_mpa: float = PRESION_MAX_MPA,
+) -> pd.DataFrame:
+    """
+    Barre diámetros × caudales y calcula el costo anual de cada combinación.
+    
+    Parámetros:
+        Q: caudal o arreglo de caudales (m³/s)
+        diametros: arreglo de diámetros internos (m); por defecto el
+            catálogo `DIAMETROS_COMERCIALES`
+    
+    Toda la malla se evalúa en un solo lote con el núcleo de
+    `calcular_sistema_completo` (configuración de estaciones actual).
+    Costos anualizados con el factor de recuperación de capital:
+        costo_capital   = (tubería + kW instalados) / factor_valor_presente
+        costo_energia   = potencia total · horas · USD/kWh
+    
+    Retorna DataFrame con una fila por (Q, D) y columnas: Q, D, velocidad,
+    potencia_total_kw, presion_max_mpa, factible, costo_capital_anual,
+    costo_energia_anual, costo_total_anual, pareto (factible y no
+    dominado en capital vs. energía entre los factibles de ese Q) y optimo (mínimo costo total factible
+    para ese Q).
+    """
+    if diametros is None:
+        diametros = list(DIAMETROS_COMERCIALES.values())
+    Q = np.atleast_1d(np.asarray(Q, dtype=float))
+    diametros = np.atleast_1d(np.asarray(diametros, dtype=float))
+    nq, nd = len(Q), len(diametros)
+
+    # Malla (nq, nd) aplanada: un punto de operación por combinación
+    Q_malla = np.repeat(Q, nd)
+    D_malla = np.tile(diametros, nq)
+    N = nq * nd
+
+    geometria = obtener_geometria()
+    arr = _calcular_sistema_arrays(
+        Q_malla, D_malla, np.full(N, rho), np.full(N, mu), np.full(N, epsilon),
+        geometria=geometria,
+    )
+    n = geometria.num_estaciones
+    potencia_total = potencia_instalada(arr['potencia_kw'], n)
+    presion_max = np.where(
+        geometria.es_bajada, 0.0, rho * g * arr['carga_estacion_original'] / 1e6
+    ).max(axis=1)
+
+    longitud_total = geometria.longitud_tuberia.sum()
+    capital = (
+        costo_tuberia_coef * D_malla**costo_tuberia_exp * longitud_total
+        + potencia_total * costo_kw
+    )
+    costo_capital = capital / factor_valor_presente(tasa, vida_util)
+    costo_energia_anual = potencia_total * horas_operacion * costo_energia
+    costo_total = costo_capital + costo_energia_anual
+    factible = presion_max <= presion_max_mpa
+
+    # Solo los diseños factibles compiten por el frente: los demás a costo infinito
+    pareto = frente_pareto(
+        np.where(factible, costo_capital, np.inf).reshape(nq, nd),
+        np.where(factible, costo_energia_anual, np.inf).reshape(nq, nd),
+    ).ravel()
+    total_factible = np.where(factible, costo_total, np.inf).reshape(nq, nd)
+    optimo = np.zeros((nq, nd), dtype=bool)
+    con_solucion = np.isfinite(total_factible).any(axis=1)
+    optimo[np.flatnonzero(con_solucion), np.argmin(total_factible, axis=1)[con_solucion]] = True
+
+    return pd.DataFrame({
+        'Q': Q_malla,
+        'D': D_malla,
+        'velocidad': arr['velocidad'],
+        'potencia_total_kw': potencia_total,
+        'presion_max_mpa': presion_max,
+        'factible': factible,
+        'costo_capital_anual': costo_capital,
+        'costo_energia_anual': costo_energia_anual,
+        'costo_total_anual': costo_total,
+        'pareto': pareto,
+        'optimo': optimo.ravel(),
+    })
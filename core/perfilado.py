@@ -0,0 +1,302 @@
+"""
+perfilado.py — Tiempos y memoria por etapa de cada rerun de Streamlit.
+
+Streamlit ejecuta `app.py` completo en cada interacción. `PERFILADOR`
+mide cuánto aporta cada etapa (CSS, sidebar, cálculo, cada pestaña):
+
+    PERFILADOR.iniciar_rerun()
+    with PERFILADOR.etapa('calculo'):
+        ...
+    PERFILADOR.terminar_rerun()
+
+o como decorador: `@PERFILADOR.medir('extraer_datos')`. Las etapas
+anidadas se nombran con su ruta ('pestaña_datos/extraer_datos') y una
+etapa que se repite en un rerun suma sus tiempos.
+
+Cada sesión corre en su propio hilo: el rerun abierto es local al hilo
+y los tiempos se acumulan en una ventana compartida por todo el proceso,
+de la que salen los percentiles (`percentiles`), el JSON (`a_json`) y el
+texto de Prometheus (`a_prometheus`). Con `configurar(memoria=True)` se
+registran también los bytes asignados (pico sobre el inicio de la etapa,
+vía tracemalloc; es global al proceso, así que con sesiones simultáneas
+es aproximado y el costo de tracemalloc se nota).
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PERFIL_VENTANA = 500          # reruns que se conservan por etapa
+PERFIL_PERCENTILES = (50, 90, 99)
+ETAPA_TOTAL = 'rerun'
+
+
+class Perfilador:
+    """
+    Registro de tiempos por etapa, compartido por todas las sesiones.
+
+    Es seguro entre hilos: el rerun en curso es local a cada hilo y el
+    acumulado se actualiza bajo un candado.
+    """
+
+    def __init__(self, ventana: int = PERFIL_VENTANA):
+        self._candado = threading.Lock()
+        self._local = threading.local()
+        self.ventana = ventana
+        self.memoria = False
+        self.directorio = None
+        self.intervalo_exportacion = 5.0
+        self._ultima_exportacion = 0.0
+        self._tiempos = {}       # etapa → deque de segundos
+        self._picos = {}         # etapa → deque de bytes
+        self._sumas = {}         # etapa → [segundos acumulados, reruns]
+        self.reruns = 0
+
+    def configurar(self, memoria: bool | None = None, ventana: int | None = None,
+                   directorio=None, intervalo_exportacion: float | None = None):
+        """
+        Cambia las opciones del perfilador.
+
+        Parámetros:
+            memoria: registrar bytes asignados por etapa (inicia o
+                detiene tracemalloc)
+            ventana: reruns conservados por etapa para los percentiles
+            directorio: si se da, `terminar_rerun` escribe ahí
+                'perfil.json' y 'perfil.prom' (como mucho una vez cada
+                `intervalo_exportacion` segundos)
+        """
+        with self._candado:
+            if memoria is not None and memoria != self.memoria:
+                self.memoria = memoria
+                if memoria and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                elif not memoria and tracemalloc.is_tracing():
+                    tracemalloc.stop()
+                self._picos.clear()
+            if ventana is not None:
+                self.ventana = ventana
+                for registro in (self._tiempos, self._picos):
+                    for etapa, valores in registro.items():
+                        registro[etapa] = deque(valores, maxlen=ventana)
+            if directorio is not None:
+                self.directorio = Path(directorio)
+            if intervalo_exportacion is not None:
+                self.intervalo_exportacion = intervalo_exportacion
+
+    def limpiar(self):
+        """Descarta todos los registros."""
+        with self._candado:
+            self._tiempos.clear()
+            self._picos.clear()
+            self._sumas.clear()
+            self.reruns = 0
+
+    # --- Registro ---
+
+    def iniciar_rerun(self):
+        """Abre el rerun del hilo actual (descarta uno anterior sin terminar)."""
+        self._local.rerun = {'inicio': time.perf_counter(), 'etapas': {}}
+        self._local.pila = []
+
+    def terminar_rerun(self) -> dict | None:
+        """
+        Cierra el rerun del hilo actual y lo agrega a los registros.
+
+        Retorna {etapa: segundos} de este rerun (incluye el total como
+        'rerun'), o None si no había uno abierto.
+        """
+        rerun = getattr(self._local, 'rerun', None)
+        if rerun is None:
+            return None
+        self._local.rerun = None
+        etapas = rerun['etapas']
+        etapas[ETAPA_TOTAL] = [time.perf_counter() - rerun['inicio'], None]
+        with self._candado:
+            self.reruns += 1
+            for nombre, (segundos, pico) in etapas.items():
+                self._agregar(nombre, segundos, pico)
+        self._exportar_si_corresponde()
+        return {nombre: segundos for nombre, (segundos, _) in etapas.items()}
+
+    def _agregar(self, nombre: str, segundos: float, pico):
+        if nombre not in self._tiempos:
+            self._tiempos[nombre] = deque(maxlen=self.ventana)
+            self._sumas[nombre] = [0.0, 0]
+        self._tiempos[nombre].append(segundos)
+        suma = self._sumas[nombre]
+        suma[0] += segundos
+        suma[1] += 1
+        if pico is not None:
+            self._picos.setdefault(nombre, deque(maxlen=self.ventana)).append(pico)
+
+    @contextmanager
+    def etapa(self, nombre: str):
+        """Mide el bloque como etapa `nombre` (anidable)."""
+        pila = getattr(self._local, 'pila', None)
+        if pila is None:
+            pila = self._local.pila = []
+        ruta = f"{pila[-1]['ruta']}/{nombre}" if pila else nombre
+        marco = {'ruta': ruta, 'pico_abs': 0}
+        memoria = self.memoria and tracemalloc.is_tracing()
+        if memoria:
+            marco['memoria_inicio'] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        pila.append(marco)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            pila.pop()
+            pico = None
+            if memoria:
+                pico_abs = max(tracemalloc.get_traced_memory()[1], marco['pico_abs'])
+                pico = pico_abs - marco['memoria_inicio']
+                if pila:
+                    pila[-1]['pico_abs'] = max(pila[-1]['pico_abs'], pico_abs)
+            rerun = getattr(self._local, 'rerun', None)
+            if rerun is not None:
+                previo = rerun['etapas'].get(ruta)
+                if previo is not None:
+                    segundos += previo[0]
+                    pico = None if pico is None else max(pico, previo[1] or 0)
+                rerun['etapas'][ruta] = [segundos, pico]
+            else:
+                with self._candado:
+                    self._agregar(ruta, segundos, pico)
+
+    def medir(self, nombre: str | None = None):
+        """Decorador: cada llamada a la función es una etapa (por defecto, su nombre)."""
+        def decorador(funcion):
+            etiqueta = nombre or funcion.__name__
+
+            @wraps(funcion)
+            def envoltura(*args, **kwargs):
+                with self.etapa(etiqueta):
+                    return funcion(*args, **kwargs)
+            return envoltura
+        return decorador
+
+    # --- Consulta y exportación ---
+
+    def _instantanea(self) -> tuple[dict, dict, dict, int]:
+        """
+        Copia coherente de tiempos, picos, acumulados y reruns.
+
+        Todo se copia en una sola sección crítica (los acumulados como
+        tuplas), así ningún `limpiar()` ni etapa nueva queda a medias
+        entre los percentiles y las sumas.
+        """
+        with self._candado:
+            tiempos = {k: np.array(v) for k, v in self._tiempos.items()}
+            picos = {k: np.array(v) for k, v in self._picos.items()}
+            sumas = {k: tuple(v) for k, v in self._sumas.items()}
+            return tiempos, picos, sumas, self.reruns
+
+    def percentiles(self) -> pd.DataFrame:
+        """
+        Resumen por etapa, de la etapa más lenta (p50) a la más rápida.
+
+        Columnas: 'reruns' (en la ventana), 'p50_ms', 'p90_ms', 'p99_ms',
+        'max_ms', 'media_ms', 'fraccion' (p50 / p50 del rerun completo)
+        y, con memoria activa, 'pico_kb_p50' y 'pico_kb_max'.
+        """
+        tiempos, picos, _, _ = self._instantanea()
+        return self._tabla_percentiles(tiempos, picos)
+
+    @staticmethod
+    def _tabla_percentiles(tiempos: dict, picos: dict) -> pd.DataFrame:
+        """Tabla de `percentiles` a partir de una instantánea."""
+        filas = {}
+        for nombre, valores in tiempos.items():
+            fila = {'reruns': len(valores)}
+            for q, valor in zip(PERFIL_PERCENTILES, np.percentile(valores, PERFIL_PERCENTILES) * 1e3):
+                fila[f'p{q}_ms'] = valor
+            fila['max_ms'] = valores.max() * 1e3
+            fila['media_ms'] = valores.mean() * 1e3
+            if nombre in picos:
+                fila['pico_kb_p50'] = np.median(picos[nombre]) / 1024
+                fila['pico_kb_max'] = picos[nombre].max() / 1024
+            filas[nombre] = fila
+        tabla = pd.DataFrame.from_dict(filas, orient='index').rename_axis('etapa')
+        if tabla.empty:
+            return tabla
+        if ETAPA_TOTAL in tabla.index:
+            tabla['fraccion'] = tabla['p50_ms'] / tabla.loc[ETAPA_TOTAL, 'p50_ms']
+        return tabla.sort_values('p50_ms', ascending=False)
+
+    def a_json(self) -> str:
+        """Percentiles, acumulados y opciones en JSON."""
+        tiempos, picos, sumas, reruns = self._instantanea()
+        tabla = self._tabla_percentiles(tiempos, picos)
+        sumas = {k: {'segundos': s, 'reruns': n} for k, (s, n) in sumas.items()}
+        return json.dumps({
+            'generado': time.time(),
+            'reruns': reruns,
+            'memoria': self.memoria,
+            'etapas': {nombre: {**{k: float(v) for k, v in fila.items() if pd.notna(v)},
+                                'acumulado': sumas.get(nombre)}
+                       for nombre, fila in tabla.iterrows()},
+        }, indent=2, ensure_ascii=False)
+
+    def a_prometheus(self) -> str:
+        """Texto de exposición de Prometheus (resúmenes por etapa)."""
+        tiempos, picos, sumas, _ = self._instantanea()
+        tabla = self._tabla_percentiles(tiempos, picos)
+        lineas = [
+            '# HELP hidraulica_etapa_segundos Tiempo por etapa de cada rerun de la app.',
+            '# TYPE hidraulica_etapa_segundos summary',
+        ]
+        for nombre, fila in tabla.iterrows():
+            etiqueta = nombre.replace('\\', '\\\\').replace('"', '\\"')
+            for q in PERFIL_PERCENTILES:
+                lineas.append(f'hidraulica_etapa_segundos{{etapa="{etiqueta}",quantile="{q / 100:g}"}} '
+                              f'{fila[f"p{q}_ms"] / 1e3:.9g}')
+            acumulado = sumas.get(nombre)
+            if acumulado is not None:
+                segundos, cuenta = acumulado
+                lineas.append(f'hidraulica_etapa_segundos_sum{{etapa="{etiqueta}"}} {segundos:.9g}')
+                lineas.append(f'hidraulica_etapa_segundos_count{{etapa="{etiqueta}"}} {cuenta}')
+        if 'pico_kb_p50' in tabla:
+            lineas += [
+                '# HELP hidraulica_etapa_pico_bytes Pico de memoria asignada por etapa (tracemalloc).',
+                '# TYPE hidraulica_etapa_pico_bytes gauge',
+            ]
+            for nombre, fila in tabla.dropna(subset=['pico_kb_p50']).iterrows():
+                etiqueta = nombre.replace('\\', '\\\\').replace('"', '\\"')
+                lineas.append(f'hidraulica_etapa_pico_bytes{{etapa="{etiqueta}"}} {fila["pico_kb_p50"] * 1024:.0f}')
+        return '\n'.join(lineas) + '\n'
+
+    def exportar(self, directorio) -> None:
+        """Escribe 'perfil.json' y 'perfil.prom' en `directorio` (reemplazo atómico)."""
+        directorio = Path(directorio)
+        directorio.mkdir(parents=True, exist_ok=True)
+        for nombre, contenido in (('perfil.json', self.a_json()), ('perfil.prom', self.a_prometheus())):
+            temporal = directorio / f'.{nombre}.{os.getpid()}.{threading.get_ident()}.tmp'
+            temporal.write_text(contenido, encoding='utf-8')
+            os.replace(temporal, directorio / nombre)
+
+    def _exportar_si_corresponde(self):
+        if self.directorio is None:
+            return
+        ahora = time.monotonic()
+        with self._candado:
+            if ahora - self._ultima_exportacion < self.intervalo_exportacion:
+                return
+            self._ultima_exportacion = ahora
+        self.exportar(self.directorio)
+
+
+# Instancia única del proceso, compartida por todas las sesiones de la app
+PERFILADOR = Perfilador()
+if os.environ.get('HIDRAULICA_PERFIL_DIR'):
+    PERFILADOR.configurar(directorio=os.environ['HIDRAULICA_PERFIL_DIR'])
@@ -0,0 +1,501 @@
+"""
+red.py — Modelo general de red de tuberías (nodos y enlaces).
+
+Generaliza la cadena fija de 8 tramos a una red arbitraria (ramales,
+líneas en paralelo, varias tomas):
+
+- Nodos: uniones (con demanda, m³/s) y tanques (carga fija =
+  elevación + nivel).
+- Enlaces: tuberías (L, D, ε, K; o coeficiente C de Hazen-Williams en
+  vez de ε), bombas y válvulas. Una bomba o válvula
+  con 'caudal' fijo impone ese caudal y su cambio de carga resulta del
+  cálculo (así se modelan las estaciones de la cadena actual, cuya bomba
+  entrega la carga que haga falta). Una bomba con 'curva' (H₀, r, n)
+  entrega H = H₀ - r·Qⁿ; una válvula sin caudal fijo es una pérdida K.
+
+La red se describe en JSON (`cargar_red` / `guardar_red`) y se resuelve
+con el método del gradiente global de Todini-Pilati (`resolver_red`):
+Newton sobre caudales y cargas, con el sistema de cargas A₂₁·G⁻¹·A₁₂
+en matrices dispersas de SciPy.
+
+`red_desde_tramos` expresa el sistema actual de 8 tramos como una red;
+`calcular_sistema_red` la resuelve y resume los resultados por tramo,
+que coinciden con los de `calcular_sistema_completo`.
+
+Formato JSON:
+    {"nodos": [{"nombre": "rio", "elevacion": 0, "tipo": "tanque"},
+               {"nombre": "A", "elevacion": 12, "demanda": 0.005}, ...],
+     "enlaces": [{"nombre": "P1", "desde": "rio", "hasta": "A",
+                  "tipo": "tuberia", "longitud": 250, "diametro": 0.15,
+                  "rugosidad": 4.6e-5, "K": 1.5},
+                 {"nombre": "B1", "desde": "A", "hasta": "B",
+                  "tipo": "bomba", "curva": [60, 2.0e4, 2]}, ...]}
+"""
+
+import json
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import spsolve
+
+from core.hidraulica import area_seccion, factor_friccion, g, kw_a_hp, potencia_bomba
+
+TIPOS_NODO = ('union', 'tanque')
+TIPOS_ENLACE = ('tuberia', 'bomba', 'valvula')
+
+# Parámetros del gradiente global
+GGA_MAX_ITER = 100
+GGA_TOL = 1e-8      # cambio relativo de caudales: Σ|ΔQ| / Σ|Q|
+Q_MINIMO = 1e-7     # m³/s, acota la derivada dh/dQ cerca de Q = 0
+
+# Hazen-Williams (SI): hf = 10.67·L·Q^1.852 / (C^1.852·D^4.8704)
+HW_COEFICIENTE = 10.67
+HW_EXPONENTE = 1.852
+HW_EXPONENTE_D = 4.8704
+
+
+@dataclass(frozen=True)
+class Red:
+    """
+    Red de tuberías en forma columnar.
+
+    Los atributos `nodo_*` son arreglos de largo N y los `enlace_*`, de
+    largo E; `desde` y `hasta` son índices de nodo. `caudal_fijo` es NaN
+    en los enlaces sin caudal impuesto y `curva` (E × 3) es NaN salvo en
+    bombas con curva. `hazen` es el coeficiente C de Hazen-Williams de
+    las tuberías que lo usan (NaN: Darcy-Weisbach). `tramo` asocia cada enlace a un tramo de la cadena
+    original (0 si no aplica).
+    """
+    nodo_nombre: np.ndarray
+    nodo_elevacion: np.ndarray
+    nodo_tanque: np.ndarray
+    nodo_nivel: np.ndarray
+    nodo_demanda: np.ndarray
+    enlace_nombre: np.ndarray
+    enlace_tipo: np.ndarray
+    desde: np.ndarray
+    hasta: np.ndarray
+    longitud: np.ndarray
+    diametro: np.ndarray
+    rugosidad: np.ndarray
+    K: np.ndarray
+    caudal_fijo: np.ndarray
+    curva: np.ndarray
+    hazen: np.ndarray
+    tramo: np.ndarray
+
+    @property
+    def n_nodos(self) -> int:
+        return len(self.nodo_nombre)
+
+    @property
+    def n_enlaces(self) -> int:
+        return len(self.enlace_nombre)
+
+
+_CAMPOS_ENLACE = (
+    'enlace_nombre', 'enlace_tipo', 'desde', 'hasta', 'longitud',
+    'diametro', 'rugosidad', 'K', 'caudal_fijo', 'curva', 'hazen', 'tramo',
+)
+
+
+def construir_red(nodos, enlaces, D: float = 0.1541, epsilon: float = 0.000046) -> Red:
+    """
+    Construye una `Red` a partir de listas de dicts (formato del JSON).
+
+    Parámetros:
+        nodos: dicts con 'nombre', 'elevacion' y opcionalmente 'tipo'
+            ('union' por defecto o 'tanque'), 'nivel' (tanques) y
+            'demanda' (uniones, m³/s)
+        enlaces: dicts con 'nombre', 'desde', 'hasta', 'tipo' y los
+            datos del tipo ('longitud', 'diametro', 'rugosidad', 'K',
+            'caudal', 'curva', 'hazen', 'tramo')
+        D, epsilon: diámetro y rugosidad de los enlaces que no los dan
+
+    Lanza ValueError si la red es inconsistente (tipos o nodos
+    desconocidos, bombas sin caudal ni curva, enlaces sin resistencia,
+    ningún tanque).
+    """
+    nodos, enlaces = list(nodos), list(enlaces)
+    posicion = {}
+    for i, n in enumerate(nodos):
+        if n['nombre'] in posicion:
+            raise ValueError(f"Nodo repetido: {n['nombre']!r}")
+        if n.get('tipo', 'union') not in TIPOS_NODO:
+            raise ValueError(f"Tipo de nodo desconocido: {n.get('tipo')!r} (opciones: {', '.join(TIPOS_NODO)})")
+        posicion[n['nombre']] = i
+    tanque = np.array([n.get('tipo', 'union') == 'tanque' for n in nodos], dtype=bool)
+    if not tanque.any():
+        raise ValueError("La red necesita al menos un tanque (nodo de carga fija)")
+
+    for e in enlaces:
+        if e.get('tipo') not in TIPOS_ENLACE:
+            raise ValueError(f"Tipo de enlace desconocido en {e.get('nombre')!r}: {e.get('tipo')!r} "
+                             f"(opciones: {', '.join(TIPOS_ENLACE)})")
+        for extremo in ('desde', 'hasta'):
+            if e[extremo] not in posicion:
+                raise ValueError(f"Nodo desconocido en {e['nombre']!r}: {e[extremo]!r}")
+        fijo = e.get('caudal') is not None
+        if e['tipo'] == 'bomba' and not fijo and e.get('curva') is None:
+            raise ValueError(f"La bomba {e['nombre']!r} necesita 'caudal' o 'curva'")
+        if e['tipo'] != 'bomba' and not fijo and e.get('longitud', 0.0) <= 0 and e.get('K', 0.0) <= 0:
+            raise ValueError(f"El enlace {e['nombre']!r} no tiene resistencia (longitud y K nulos)")
+
+    def columna(clave, defecto, dtype=float):
+        return np.array([defecto if e.get(clave) is None else e[clave]
+                         for e in enlaces], dtype=dtype)
+
+    curva = np.full((len(enlaces), 3), np.nan)
+    for i, e in enumerate(enlaces):
+        if e.get('curva') is not None and e.get('caudal') is None:
+            curva[i] = e['curva']
+    return Red(
+        nodo_nombre=np.array([n['nombre'] for n in nodos], dtype=object),
+        nodo_elevacion=np.array([n['elevacion'] for n in nodos], dtype=float),
+        nodo_tanque=tanque,
+        nodo_nivel=np.array([n.get('nivel', 0.0) for n in nodos], dtype=float),
+        nodo_demanda=np.array([0.0 if t else n.get('demanda', 0.0) for n, t in zip(nodos, tanque)]),
+        enlace_nombre=np.array([e['nombre'] for e in enlaces], dtype=object),
+        enlace_tipo=np.array([e['tipo'] for e in enlaces], dtype=object),
+        desde=np.array([posicion[e['desde']] for e in enlaces], dtype=int),
+        hasta=np.array([posicion[e['hasta']] for e in enlaces], dtype=int),
+        longitud=columna('longitud', 0.0),
+        diametro=columna('diametro', D),
+        rugosidad=columna('rugosidad', epsilon),
+        K=columna('K', 0.0),
+        caudal_fijo=columna('caudal', np.nan),
+        curva=curva,
+        hazen=columna('hazen', np.nan),
+        tramo=columna('tramo', 0, int),
+    )
+
+
+def cargar_red(ruta, **defectos) -> Red:
+    """Lee una red en JSON (ver el formato en el docstring del módulo)."""
+    datos = json.loads(Path(ruta).read_text(encoding='utf-8'))
+    return construir_red(datos['nodos'], datos['enlaces'], **defectos)
+
+
+def guardar_red(red: Red, ruta) -> None:
+    """Escribe la red en JSON (el formato que lee `cargar_red`)."""
+    nodos = []
+    for i in range(red.n_nodos):
+        nodo = {'nombre': red.nodo_nombre[i], 'elevacion': float(red.nodo_elevacion[i])}
+        if red.nodo_tanque[i]:
+            nodo.update(tipo='tanque', nivel=float(red.nodo_nivel[i]))
+        elif red.nodo_demanda[i]:
+            nodo['demanda'] = float(red.nodo_demanda[i])
+        nodos.append(nodo)
+    enlaces = []
+    for i in range(red.n_enlaces):
+        enlace = {
+            'nombre': red.enlace_nombre[i],
+            'desde': red.nodo_nombre[red.desde[i]],
+            'hasta': red.nodo_nombre[red.hasta[i]],
+            'tipo': red.enlace_tipo[i],
+        }
+        if not np.isnan(red.caudal_fijo[i]):
+            enlace['caudal'] = float(red.caudal_fijo[i])
+        elif not np.isnan(red.curva[i, 0]):
+            enlace['curva'] = red.curva[i].tolist()
+        if red.longitud[i] > 0:
+            enlace['longitud'] = float(red.longitud[i])
+        if red.K[i] > 0:
+            enlace['K'] = float(red.K[i])
+        enlace['diametro'] = float(red.diametro[i])
+        if np.isnan(red.hazen[i]):
+            enlace['rugosidad'] = float(red.rugosidad[i])
+        else:
+            enlace['hazen'] = float(red.hazen[i])
+        if red.tramo[i]:
+            enlace['tramo'] = int(red.tramo[i])
+        enlaces.append(enlace)
+    Path(ruta).write_text(
+        json.dumps({'nodos': nodos, 'enlaces': enlaces}, indent=1, ensure_ascii=False) + "\n",
+        encoding='utf-8',
+    )
+
+
+def _friccion(red: Red, Q, rho, mu, metodo_friccion):
+    """
+    Velocidad, Re y f de cada enlace al caudal Q (arreglos de largo E).
+
+    f es 0 en los enlaces sin longitud y en las tuberías de Hazen-Williams.
+    """
+    v = np.abs(Q) / area_seccion(red.diametro)
+    Re = rho * np.maximum(v, Q_MINIMO) * red.diametro / mu
+    darcy = (red.longitud > 0) & np.isnan(red.hazen)
+    f = np.where(darcy, factor_friccion(Re, red.rugosidad, red.diametro, metodo_friccion), 0.0)
+    return v, Re, f
+
+
+def _resistencia_hazen(red: Red) -> np.ndarray:
+    """r de Hazen-Williams (hf = r·|Q|^1.852); 0 en los demás enlaces."""
+    with np.errstate(invalid='ignore'):
+        r = HW_COEFICIENTE * red.longitud / (red.hazen**HW_EXPONENTE * red.diametro**HW_EXPONENTE_D)
+    return np.where(np.isnan(red.hazen), 0.0, r)
+
+
+def _perdidas(red: Red, Q, rho, mu, metodo_friccion):
+    """
+    Pérdida de carga h(Q) (desde → hasta) y su derivada G = dh/dQ.
+
+    Tuberías y válvulas: h = (f·L/D + K)·Q|Q| / (2g·A²), con f fijo en
+    la derivada, o con Hazen-Williams r_hw·Q|Q|^0.852 en vez del término
+    de f. Bombas con curva: h = -(H₀ - r·Qⁿ) para Q ≥ 0.
+    """
+    _, _, f = _friccion(red, Q, rho, mu, metodo_friccion)
+    A = area_seccion(red.diametro)
+    r = (f * red.longitud / red.diametro + red.K) / (2 * g * A**2)
+    r_hw = _resistencia_hazen(red)
+    Qa = np.maximum(np.abs(Q), Q_MINIMO)
+    h = r * Q * np.abs(Q) + r_hw * Q * np.abs(Q)**(HW_EXPONENTE - 1)
+    G = 2 * r * Qa + HW_EXPONENTE * r_hw * Qa**(HW_EXPONENTE - 1)
+
+    bomba = ~np.isnan(red.curva[:, 0])
+    if bomba.any():
+        H0, rb, nb = red.curva[bomba].T
+        Qb = np.maximum(Q[bomba], Q_MINIMO)
+        h[bomba] = -(H0 - rb * Qb**nb)
+        G[bomba] = np.maximum(nb * rb * Qb**(nb - 1), 1e-12)
+    return h, G
+
+
+def _verificar_conexion(red: Red, activos: np.ndarray) -> None:
+    """Cada unión debe llegar a un tanque por enlaces sin caudal fijo."""
+    N = red.n_nodos
+    adyacencia = sparse.coo_matrix(
+        (np.ones(activos.sum()), (red.desde[activos], red.hasta[activos])), shape=(N, N)
+    )
+    _, componente = connected_components(adyacencia, directed=False)
+    con_tanque = np.zeros(componente.max() + 1, dtype=bool)
+    con_tanque[componente[red.nodo_tanque]] = True
+    aisladas = np.flatnonzero(~con_tanque[componente])
+    if len(aisladas):
+        nombres = ', '.join(map(str, red.nodo_nombre[aisladas[:5]]))
+        raise ValueError(
+            f"{len(aisladas)} unión(es) sin camino a un tanque por enlaces sin "
+            f"caudal fijo (carga indeterminada): {nombres}"
+        )
+
+
+def resolver_red(
+    red: Red,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    metodo_friccion: str = 'colebrook',
+    max_iter: int = GGA_MAX_ITER,
+    tolerancia: float = GGA_TOL,
+) -> dict:
+    """
+    Resuelve caudales y cargas con el gradiente global (Todini-Pilati).
+
+    Incógnitas: caudal Q de los enlaces sin caudal fijo y carga H de las
+    uniones. En cada iteración (Newton, con G = dh/dQ):
+        (A₂₁ G⁻¹ A₁₂) H = (A₂₁ Q - q) - A₂₁ G⁻¹ (h(Q) + A₁₀ H₀)
+        Q ← Q - G⁻¹ (h(Q) + A₁₂ H + A₁₀ H₀)
+    donde A₁₂ es la incidencia enlace-unión y A₁₀ H₀ el aporte de los
+    tanques. Los enlaces de caudal fijo entran como demandas en sus
+    extremos y su cambio de carga se obtiene de las cargas resueltas.
+
+    Retorna dict con:
+        'nodos': DataFrame (índice nombre) con 'elevacion', 'demanda',
+                 'carga' (m) y 'presion' (carga - elevación, m.c.a.)
+        'enlaces': DataFrame (índice nombre) con 'tipo', 'desde',
+                   'hasta', 'tramo', 'caudal', 'velocidad', 'reynolds',
+                   'f', 'perdidas_friccion', 'perdidas_menores', 'carga'
+                   (H_hasta - H_desde; positiva en bombas) y
+                   'potencia_kw' (bombas)
+        'iteraciones': iteraciones de Newton
+
+    Lanza ValueError si alguna unión no tiene carga determinada y
+    RuntimeError si no converge en `max_iter` iteraciones.
+    """
+    fijo = ~np.isnan(red.caudal_fijo)
+    activos = ~fijo
+    _verificar_conexion(red, activos)
+
+    libres = np.flatnonzero(~red.nodo_tanque)
+    columna_libre = np.full(red.n_nodos, -1)
+    columna_libre[libres] = np.arange(len(libres))
+    H = red.nodo_elevacion + red.nodo_nivel  # válida en los tanques
+
+    # Demanda en las uniones, más el caudal de los enlaces de caudal fijo
+    q = red.nodo_demanda.copy()
+    np.add.at(q, red.desde[fijo], red.caudal_fijo[fijo])
+    np.add.at(q, red.hasta[fijo], -red.caudal_fijo[fijo])
+    q = q[libres]
+
+    # Incidencia de los enlaces activos: -1 en 'desde', +1 en 'hasta'
+    ea = np.flatnonzero(activos)
+    sub = replace(red, **{campo: getattr(red, campo)[ea] for campo in _CAMPOS_ENLACE})
+    filas, columnas, signos = [], [], []
+    A10H0 = np.zeros(len(ea))
+    for extremo, signo in ((sub.desde, -1.0), (sub.hasta, 1.0)):
+        libre = columna_libre[extremo] >= 0
+        filas.append(np.flatnonzero(libre))
+        columnas.append(columna_libre[extremo[libre]])
+        signos.append(np.full(libre.sum(), signo))
+        A10H0[~libre] += signo * H[extremo[~libre]]
+    A12 = sparse.csr_matrix(
+        (np.concatenate(signos), (np.concatenate(filas), np.concatenate(columnas))),
+        shape=(len(ea), len(libres)),
+    )
+    A21 = A12.T.tocsr()
+
+    Q = area_seccion(sub.diametro) * 1.0  # arranque con v = 1 m/s
+    Hl = np.zeros(len(libres))
+    for iteracion in range(1, max_iter + 1):
+        h, G = _perdidas(sub, Q, rho, mu, metodo_friccion)
+        Ginv = 1.0 / G
+        y = h + A10H0
+        if len(libres):
+            A = (A21 @ sparse.diags(Ginv) @ A12).tocsc()
+            Hl = np.atleast_1d(spsolve(A, (A21 @ Q - q) - A21 @ (Ginv * y)))
+        Q_nuevo = Q - Ginv * (y + A12 @ Hl)
+        cambio = np.abs(Q_nuevo - Q).sum() / max(np.abs(Q_nuevo).sum(), Q_MINIMO)
+        Q = Q_nuevo
+        if cambio < tolerancia:
+            break
+    else:
+        raise RuntimeError(
+            f"El gradiente global no convergió en {max_iter} iteraciones "
+            f"(cambio relativo {cambio:.2e})"
+        )
+    H = H.copy()
+    H[libres] = Hl
+
+    caudal = red.caudal_fijo.copy()
+    caudal[ea] = Q
+    v, Re, f = _friccion(red, caudal, rho, mu, metodo_friccion)
+    resistivo = (red.enlace_tipo != 'bomba') & activos
+    hv = v**2 / (2 * g)
+    hf = f * red.longitud / red.diametro * hv + _resistencia_hazen(red) * np.abs(caudal)**HW_EXPONENTE
+    hf = np.where(resistivo, hf, np.nan)
+    hm = np.where(resistivo, red.K * hv, np.nan)
+    carga = H[red.hasta] - H[red.desde]
+    bomba = red.enlace_tipo == 'bomba'
+    potencia = np.where(bomba, potencia_bomba(rho, np.abs(caudal), np.maximum(carga, 0.0)), 0.0)
+
+    nodos = pd.DataFrame({
+        'elevacion': red.nodo_elevacion,
+        'demanda': red.nodo_demanda,
+        'carga': H,
+        'presion': H - red.nodo_elevacion,
+    }, index=pd.Index(red.nodo_nombre, name='nombre'))
+    enlaces = pd.DataFrame({
+        'tipo': red.enlace_tipo,
+        'desde': red.nodo_nombre[red.desde],
+        'hasta': red.nodo_nombre[red.hasta],
+        'tramo': red.tramo,
+        'caudal': caudal,
+        'velocidad': np.where(resistivo, v, np.nan),
+        'reynolds': np.where(resistivo, Re, np.nan),
+        'f': np.where(resistivo & (red.longitud > 0) & np.isnan(red.hazen), f, np.nan),
+        'perdidas_friccion': hf,
+        'perdidas_menores': hm,
+        'carga': carga,
+        'potencia_kw': potencia,
+    }, index=pd.Index(red.enlace_nombre, name='nombre'))
+    return {'nodos': nodos, 'enlaces': enlaces, 'iteraciones': iteracion}
+
+
+def red_desde_tramos(
+    Q: float = 0.025,
+    D: float = 0.1541,
+    epsilon: float = 0.000046,
+    definiciones=None,
+) -> Red:
+    """
+    Expresa la cadena de tramos como red.
+
+    Cada estación de bombeo es un tanque de succión, una bomba de caudal
+    Q y la tubería de su sub-tramo (L/n, K) hasta el tanque de la
+    siguiente estación. En las bajadas con tanque rompe-presión la
+    tubería llega a una válvula de caudal Q que disipa el sobrante antes
+    del tanque. Una bajada sin tanque (`tanque_rompe_presion=False`)
+    termina en una unión: su cabeza llega con presión a la succión del
+    tramo siguiente, que es la transferencia de gravedad de
+    `calcular_sistema_completo` (aquí la recibe la primera estación).
+    """
+    if definiciones is None:
+        from core.tramos import obtener_definicion_tramos
+        definiciones = obtener_definicion_tramos()
+
+    nodos = [{'nombre': 'inicio', 'elevacion': 0.0, 'tipo': 'tanque'}]
+    enlaces = []
+    actual, cota = 'inicio', 0.0
+    numeros = list(definiciones)
+    for posicion, t in enumerate(numeros):
+        d = definiciones[t]
+        n = max(d['num_estaciones'], 1)
+        dz = d['altura'] / n
+        L = d['longitud_tuberia'] / n
+        tuberia = {'tipo': 'tuberia', 'longitud': L, 'diametro': D,
+                   'rugosidad': epsilon, 'K': d['K_total'], 'tramo': t}
+        for k in range(1, n + 1):
+            cota += dz
+            ultima = k == n
+            con_tanque = not (ultima and d['es_bajada'] and not d.get('tanque_rompe_presion', True))
+            fin = 'planta' if ultima and posicion == len(numeros) - 1 else f'T{t}-{k}'
+            nodos.append({'nombre': fin, 'elevacion': cota, 'tipo': 'tanque' if con_tanque else 'union'})
+            if not d['es_bajada']:
+                impulsion = f'T{t}-{k}-impulsion'
+                nodos.append({'nombre': impulsion, 'elevacion': cota - dz})
+                enlaces.append({'nombre': f'T{t}-{k}-bomba', 'desde': actual, 'hasta': impulsion,
+                                'tipo': 'bomba', 'caudal': Q, 'diametro': D, 'tramo': t})
+                enlaces.append({'nombre': f'T{t}-{k}-tuberia', 'desde': impulsion, 'hasta': fin, **tuberia})
+            elif con_tanque:
+                valvula = f'T{t}-{k}-valvula'
+                nodos.append({'nombre': valvula, 'elevacion': cota})
+                enlaces.append({'nombre': f'T{t}-{k}-tuberia', 'desde': actual, 'hasta': valvula, **tuberia})
+                enlaces.append({'nombre': f'T{t}-{k}-valvula', 'desde': valvula, 'hasta': fin,
+                                'tipo': 'valvula', 'caudal': Q, 'diametro': D, 'tramo': t})
+            else:
+                enlaces.append({'nombre': f'T{t}-{k}-tuberia', 'desde': actual, 'hasta': fin, **tuberia})
+            actual = fin
+    return construir_red(nodos, enlaces, D=D, epsilon=epsilon)
+
+
+def calcular_sistema_red(
+    Q: float = 0.025,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    metodo_friccion: str = 'colebrook',
+    definiciones=None,
+) -> pd.DataFrame:
+    """
+    Resuelve la cadena de tramos como red y resume por tramo.
+
+    Retorna DataFrame indexado por tramo con 'num_estaciones',
+    'perdidas_friccion' y 'perdidas_menores' (por estación, como en
+    `calcular_sistema_completo`), 'carga_estacion' (carga media de sus
+    bombas, NaN sin bombas), 'carga_disipada' (total en válvulas),
+    'potencia_kw' (media por estación), 'potencia_hp' y
+    'potencia_total_kw' (suma de sus bombas).
+    """
+    red = red_desde_tramos(Q=Q, D=D, epsilon=epsilon, definiciones=definiciones)
+    enlaces = resolver_red(red, rho=rho, mu=mu, metodo_friccion=metodo_friccion)['enlaces']
+    por_tramo = enlaces.groupby('tramo')
+    tuberias = enlaces[enlaces['tipo'] == 'tuberia'].groupby('tramo')
+    bombas = enlaces[enlaces['tipo'] == 'bomba'].groupby('tramo')
+    valvulas = enlaces[enlaces['tipo'] == 'valvula'].groupby('tramo')
+    resumen = pd.DataFrame({
+        'num_estaciones': tuberias.size(),
+        'perdidas_friccion': tuberias['perdidas_friccion'].mean(),
+        'perdidas_menores': tuberias['perdidas_menores'].mean(),
+        'carga_estacion': bombas['carga'].mean(),
+        'carga_disipada': -valvulas['carga'].sum(),
+        'potencia_total_kw': por_tramo['potencia_kw'].sum(),
+    })
+    resumen['carga_disipada'] = resumen['carga_disipada'].fillna(0.0)
+    resumen['potencia_kw'] = resumen['potencia_total_kw'] / resumen['num_estaciones']
+    resumen['potencia_hp'] = kw_a_hp(resumen['potencia_kw'])
+    resumen.index.name = 'tramo'
+    return resumen
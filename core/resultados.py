@@ -0,0 +1,165 @@
+"""
+resultados.py — Resultado columnar del sistema completo.
+
+`ResultadoSistema` guarda los resultados de todos los tramos como
+columnas (un arreglo de NumPy de largo T por magnitud) en vez de un
+dict de dicts. Sigue siendo compatible con el acceso anterior:
+`resultados[num_tramo]['potencia_kw']`, `.values()`, `.items()`, etc.
+devuelven vistas de fila (`FilaTramo`) que leen de las columnas sin
+copiar. Los consumidores nuevos usan `columna()` o `to_dataframe()`.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+def _solo_lectura(arreglo: np.ndarray) -> np.ndarray:
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+_ESCALARES = (bool, int, float, np.number, np.bool_)
+
+
+def _columna(valores: list) -> np.ndarray:
+    """Arreglo numérico si todos los valores son escalares; si no, de objetos."""
+    if all(isinstance(v, _ESCALARES) for v in valores):
+        return np.array(valores)
+    columna = np.empty(len(valores), dtype=object)
+    for i, v in enumerate(valores):
+        columna[i] = v
+    return columna
+
+
+class ResultadoSistema(Mapping):
+    """
+    Resultados de todos los tramos en forma columnar.
+
+    Se comporta como el dict {num_tramo: dict} que retornaba antes
+    `calcular_sistema_completo`: indexar por número de tramo devuelve una
+    `FilaTramo` de solo lectura. Las columnas son arreglos inmutables.
+    """
+
+    __slots__ = ('tramos', '_columnas', '_ausentes', '_posicion')
+
+    def __init__(self, tramos, columnas: dict, ausentes: dict | None = None):
+        """
+        Parámetros:
+            tramos: números de tramo (largo T)
+            columnas: {nombre: arreglo de largo T}
+            ausentes: {nombre: máscara booleana} para columnas que no
+                aplican a todos los tramos (p. ej. la cabeza de gravedad
+                recibida): en esas filas la clave no existe
+        """
+        self.tramos = _solo_lectura(np.asarray(tramos, dtype=int))
+        self._columnas = {k: _solo_lectura(np.asarray(v)) for k, v in columnas.items()}
+        self._ausentes = {k: _solo_lectura(np.asarray(m, dtype=bool))
+                          for k, m in (ausentes or {}).items()}
+        self._posicion = {int(t): i for i, t in enumerate(self.tramos)}
+
+    @classmethod
+    def desde_filas(cls, filas: dict) -> 'ResultadoSistema':
+        """
+        Construye el resultado a partir de {num_tramo: dict de valores}.
+
+        Las columnas de floats se copian en un solo bloque (C × T) y cada
+        columna es una fila de ese bloque; las demás se convierten una a
+        una. Las claves que faltan en algunas filas quedan como NaN y se
+        marcan como ausentes.
+        """
+        tramos = list(filas)
+        lista = list(filas.values())
+        claves = list(dict.fromkeys(k for fila in lista for k in fila))
+        valores = {k: [fila.get(k, np.nan) for fila in lista] for k in claves}
+
+        flotantes = [k for k, col in valores.items()
+                     if all(type(v) is float for v in col)]
+        columnas = {}
+        if flotantes:
+            bloque = np.array([valores[k] for k in flotantes], dtype=float)
+            columnas = dict(zip(flotantes, bloque))
+        for k in claves:
+            if k not in columnas:
+                columnas[k] = _columna(valores[k])
+        columnas = {k: columnas[k] for k in claves}  # orden original
+
+        ausentes = {}
+        for i, fila in enumerate(lista):
+            if len(fila) < len(claves):
+                for k in claves:
+                    if k not in fila:
+                        ausentes.setdefault(k, np.zeros(len(lista), dtype=bool))[i] = True
+        return cls(tramos, columnas, ausentes)
+
+    # --- Interfaz de Mapping (compatibilidad con el dict de dicts) ---
+
+    def __getitem__(self, num_tramo) -> 'FilaTramo':
+        return FilaTramo(self, self._posicion[num_tramo])
+
+    def __iter__(self):
+        return iter(self._posicion)
+
+    def __len__(self) -> int:
+        return len(self.tramos)
+
+    def __repr__(self):
+        return f'ResultadoSistema(tramos={self.tramos.tolist()}, columnas={list(self._columnas)})'
+
+    # --- Acceso columnar ---
+
+    @property
+    def nombres_columnas(self) -> list[str]:
+        return list(self._columnas)
+
+    def columna(self, nombre: str) -> np.ndarray:
+        """Arreglo (T,) de una magnitud, en el orden de `tramos` (sin copia)."""
+        return self._columnas[nombre]
+
+    def to_dataframe(self, copy: bool = False) -> pd.DataFrame:
+        """
+        DataFrame con una fila por tramo (índice 'tramo').
+
+        Con copy=False las columnas del DataFrame comparten memoria con
+        las del resultado (que son de solo lectura).
+        """
+        df = pd.DataFrame(
+            self._columnas,
+            index=pd.Index(self.tramos, name='tramo'),
+            copy=copy,
+        )
+        for nombre, falta in self._ausentes.items():
+            if falta.any():
+                df[nombre] = df[nombre].where(~falta)
+        return df
+
+
+class FilaTramo(Mapping):
+    """Vista de solo lectura de un tramo dentro de un `ResultadoSistema`."""
+
+    __slots__ = ('_sistema', '_i')
+
+    def __init__(self, sistema: ResultadoSistema, i: int):
+        self._sistema = sistema
+        self._i = i
+
+    def _presente(self, clave) -> bool:
+        falta = self._sistema._ausentes.get(clave)
+        return falta is None or not falta[self._i]
+
+    def __getitem__(self, clave):
+        valor = self._sistema._columnas[clave][self._i]
+        if not self._presente(clave):
+            raise KeyError(clave)
+        # Escalares de Python (como antes): serializables a JSON
+        return valor.item() if isinstance(valor, np.generic) else valor
+
+    def __iter__(self):
+        return (k for k in self._sistema._columnas if self._presente(k))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f'FilaTramo({dict(self)!r})'
@@ -0,0 +1,145 @@
+"""
+sensibilidad.py — Análisis de sensibilidad global (índices de Sobol).
+
+Descompone la varianza de la potencia total de bombeo y de la carga por
+estación de cada tramo entre las entradas Q, D, ε, ρ, μ y el K_total de
+cada tramo, muestreadas uniformemente dentro de sus rangos.
+
+Usa el esquema de Saltelli: dos matrices A y B (N × d) de una secuencia
+de Sobol aleatorizada y las d matrices A_B^(i) (A con la columna i de B),
+N·(d + 2) evaluaciones en total. Los índices de primer orden se estiman
+con el estimador de Saltelli (2010) y los totales con el de Jansen.
+Todas las evaluaciones pasan por el núcleo vectorizado
+`_calcular_sistema_arrays`, por lotes y opcionalmente en varios procesos.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from core.hidraulica import _calcular_sistema_arrays, potencia_instalada
+from core.tramos import obtener_geometria
+
+TAMANO_BLOQUE = 100_000
+
+
+def rangos_por_defecto(
+    Q: float = 0.025,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    variacion_K: float = 0.30,
+) -> dict:
+    """
+    Rangos (mínimo, máximo) de cada entrada alrededor del punto de diseño.
+
+    Los K_total de cada tramo se nombran 'K_T1' … 'K_T8' y varían
+    ±`variacion_K` respecto al valor de `core.tramos`.
+    """
+    rangos = {
+        'Q': (0.90 * Q, 1.10 * Q),
+        'D': (0.98 * D, 1.02 * D),          # tolerancia de fabricación + incrustación
+        'epsilon': (0.5 * epsilon, 3.0 * epsilon),  # tubería nueva a envejecida
+        'rho': (0.995 * rho, 1.005 * rho),
+        'mu': (0.80 * mu, 1.25 * mu),      # ≈ 10 a 30 °C
+    }
+    geometria = obtener_geometria()
+    for t, K in zip(geometria.numeros, geometria.K_total):
+        rangos[f'K_T{t}'] = ((1 - variacion_K) * K, (1 + variacion_K) * K)
+    return rangos
+
+
+def _evaluar_puntos(args: tuple) -> np.ndarray:
+    """
+    Evalúa el modelo en un bloque de puntos.
+
+    Retorna arreglo (n, 1 + T): potencia total (kW) y carga por estación
+    de cada tramo.
+    """
+    X, nombres = args
+    geometria = obtener_geometria()
+    columna = {nombre: X[:, j] for j, nombre in enumerate(nombres)}
+    K_total = np.column_stack([columna[f'K_T{t}'] for t in geometria.numeros])
+    r = _calcular_sistema_arrays(
+        columna['Q'], columna['D'], columna['rho'], columna['mu'], columna['epsilon'],
+        geometria=geometria, K_total=K_total,
+    )
+    total = potencia_instalada(r['potencia_kw'], r['num_estaciones'])
+    return np.column_stack([total, r['carga_estacion']])
+
+
+def _evaluar(X: np.ndarray, nombres, tamano_bloque: int, procesos) -> np.ndarray:
+    """Evalúa X (M × d) por bloques, en serie o en un ProcessPoolExecutor."""
+    tareas = [(X[i:i + tamano_bloque], nombres) for i in range(0, len(X), tamano_bloque)]
+    if procesos == 1:
+        bloques = [_evaluar_puntos(t) for t in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            bloques = list(ejecutor.map(_evaluar_puntos, tareas))
+    return np.concatenate(bloques)
+
+
+def indices_sobol(
+    n_base: int = 4096,
+    rangos: dict | None = None,
+    tamano_bloque: int = TAMANO_BLOQUE,
+    procesos: int | None = 1,
+    semilla: int | None = None,
+    **punto,
+) -> pd.DataFrame:
+    """
+    Índices de Sobol de primer orden (S1) y totales (ST).
+
+    Parámetros:
+        n_base: N, filas de las matrices A y B (potencia de 2 para que
+            la secuencia de Sobol conserve sus propiedades de balance);
+            se evalúan N·(d + 2) puntos
+        rangos: {variable: (mínimo, máximo)} con las claves de
+            `rangos_por_defecto` (por defecto, esos rangos calculados
+            con `punto`)
+        procesos: con más de 1 los bloques se evalúan en paralelo;
+            None usa todos los núcleos
+        **punto: Q, D, rho, mu, epsilon para `rangos_por_defecto`
+
+    Retorna DataFrame con columnas 'salida' ('potencia_total_kw' o
+    'carga_estacion_T<n>'), 'variable', 'S1', 'ST' y 'varianza' (de la
+    salida). Las salidas con varianza nula (p. ej. la carga de un tramo
+    sin bomba) tienen índices NaN.
+    """
+    if rangos is None:
+        rangos = rangos_por_defecto(**punto)
+    nombres = list(rangos)
+    d = len(nombres)
+    minimo = np.array([rangos[n][0] for n in nombres])
+    maximo = np.array([rangos[n][1] for n in nombres])
+
+    # A y B salen de la misma secuencia de 2d dimensiones
+    muestra = qmc.Sobol(2 * d, scramble=True, seed=semilla).random(n_base)
+    A = qmc.scale(muestra[:, :d], minimo, maximo) if d else muestra[:, :0]
+    B = qmc.scale(muestra[:, d:], minimo, maximo) if d else muestra[:, :0]
+    # Bloque i de AB: A con la columna i tomada de B
+    AB = np.repeat(A[None], d, axis=0)
+    AB[np.arange(d), :, np.arange(d)] = B.T
+
+    Y = _evaluar(np.concatenate([A, B, AB.reshape(-1, d)]), nombres, tamano_bloque, procesos)
+    yA, yB = Y[:n_base], Y[n_base:2 * n_base]
+    yAB = Y[2 * n_base:].reshape(d, n_base, -1)
+
+    varianza = np.var(np.concatenate([yA, yB]), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        S1 = np.mean(yB * (yAB - yA), axis=1) / varianza
+        ST = 0.5 * np.mean((yA - yAB)**2, axis=1) / varianza
+    S1 = np.where(varianza > 0, S1, np.nan)
+    ST = np.where(varianza > 0, ST, np.nan)
+
+    salidas = ['potencia_total_kw'] + [f'carga_estacion_T{t}' for t in obtener_geometria().numeros]
+    return pd.DataFrame({
+        'salida': np.repeat(salidas, d),
+        'variable': np.tile(nombres, len(salidas)),
+        'S1': S1.T.ravel(),
+        'ST': ST.T.ravel(),
+        'varianza': np.repeat(varianza, d),
+    })
@@ -0,0 +1,242 @@
+"""
+simulacion.py — Simulación de periodo extendido (serie de tiempo).
+
+Avanza en el tiempo los niveles de los tanques del sistema (tanques
+receptores entre estaciones, tanques rompe-presión de los tramos 5 y 6
+y el tanque de la planta al final del tramo 8), con:
+- control on/off de bombas por nivel (histéresis) y horario permitido,
+- válvulas de flotador en los tramos por gravedad,
+- perfil horario de demanda de la planta.
+
+La hidráulica de cada elemento es la del estado estacionario
+(`calcular_sistema_completo`): cada bomba encendida entrega el caudal de
+diseño con la potencia calculada para ese caudal. Los resultados
+estacionarios se guardan en caché por caudal, de modo que no se recalcula
+la fricción mientras el caudal no cambie.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.hidraulica import calcular_sistema_completo
+from core.tramos import obtener_definicion_tramos
+
+# Perfil horario de demanda de la planta (multiplicadores, media = 1)
+PATRON_DEMANDA = np.array([
+    0.60, 0.55, 0.55, 0.55, 0.60, 0.75, 0.95, 1.15, 1.30, 1.30, 1.25, 1.20,
+    1.15, 1.20, 1.25, 1.25, 1.20, 1.15, 1.05, 1.00, 0.90, 0.80, 0.70, 0.65,
+])
+
+VOLUMEN_TANQUE = 60.0          # m³, tanques receptores / rompe-presión
+VOLUMEN_TANQUE_PLANTA = 600.0  # m³
+NIVEL_ENCENDIDO = 0.35         # fracción: la bomba arranca por debajo
+NIVEL_APAGADO = 0.90           # fracción: la bomba para por encima
+NIVEL_MINIMO = 0.05            # fracción: protección contra marcha en seco
+
+
+def construir_elementos(definiciones=None) -> list[dict]:
+    """
+    Convierte los tramos en una cadena de elementos tanque → tanque.
+
+    Cada estación de bombeo y cada sub-tramo con tanque rompe-presión es
+    un elemento que descarga en su propio tanque. Un tramo descendente
+    sin tanque rompe-presión (T7) se fusiona con el tramo que recibe su
+    gravedad (T8): el agua pasa de uno a otro sin tanque intermedio.
+    """
+    if definiciones is None:
+        definiciones = obtener_definicion_tramos()
+
+    absorbidos = {
+        d['recibe_gravedad_de'] for d in definiciones.values()
+        if d.get('recibe_gravedad_de') is not None
+    }
+    elementos = []
+    for t, d in definiciones.items():
+        if t in absorbidos:
+            continue
+        n = max(int(d['num_estaciones']), 1)
+        fuente = d.get('recibe_gravedad_de')
+        for e in range(n):
+            etiqueta = f'T{t}' + (f'-E{e + 1}' if n > 1 else '')
+            if fuente is not None and e == 0:
+                etiqueta = f'T{fuente}+' + etiqueta
+            elementos.append({
+                'nombre': etiqueta,
+                'tramo': t,
+                'tipo': 'gravedad' if d['es_bajada'] else 'bomba',
+            })
+    return elementos
+
+
+def _potencias_por_caudal(Q, D, rho, mu, epsilon, elementos, cache) -> list[float]:
+    """Potencia (kW) de cada elemento encendido al caudal Q, con caché."""
+    clave = round(float(Q), 12)
+    if clave not in cache:
+        res = calcular_sistema_completo(Q=Q, D=D, rho=rho, mu=mu, epsilon=epsilon)
+        cache[clave] = [
+            res[el['tramo']]['potencia_kw'] if el['tipo'] == 'bomba' else 0.0
+            for el in elementos
+        ]
+    return cache[clave]
+
+
+def simular_periodo_extendido(
+    duracion_h: float = 24.0 * 7,
+    paso_min: float = 1.0,
+    Q: float = 0.025,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    demanda_media: float = 0.020,
+    patron_demanda=PATRON_DEMANDA,
+    horario_bombas=None,
+    volumen_tanque: float = VOLUMEN_TANQUE,
+    volumen_tanque_planta: float = VOLUMEN_TANQUE_PLANTA,
+    nivel_inicial: float = 0.5,
+    nivel_encendido: float = NIVEL_ENCENDIDO,
+    nivel_apagado: float = NIVEL_APAGADO,
+    intervalo_reporte_min: float = 15.0,
+) -> dict:
+    """
+    Simula el sistema durante `duracion_h` horas con paso de `paso_min`.
+
+    Parámetros:
+        Q: caudal de diseño que entrega cada elemento activo (m³/s)
+        demanda_media: consumo medio de la planta (m³/s), modulado por
+            `patron_demanda` (24 multiplicadores horarios)
+        horario_bombas: 24 booleanos; las bombas solo operan en las horas
+            marcadas (p. ej. para evitar la tarifa punta). Por defecto, todas.
+            En las horas no marcadas se apagan; no cuentan como activas
+            ni suman arranques hasta que el horario les permita operar.
+        volumen_tanque, volumen_tanque_planta: capacidad de los tanques (m³)
+        nivel_encendido, nivel_apagado: histéresis (fracción del tanque
+            aguas abajo) para bombas y válvulas de flotador
+
+    Retorna dict con:
+        'serie': DataFrame muestreado cada `intervalo_reporte_min` con el
+                 nivel (fracción) de cada tanque, elementos activos y
+                 potencia instantánea
+        'elementos': DataFrame por elemento con energía (kWh), horas de
+                     operación y arranques
+        'energia_kwh', 'demanda_m3', 'demanda_no_atendida_m3'
+        'volumen_recortado_m3': volumen que los elementos activos no
+            pudieron mover por falta de agua aguas arriba o de espacio
+            aguas abajo (crece cuando Q·dt supera la banda de histéresis)
+    """
+    elementos = construir_elementos()
+    cache = {}
+    potencias = _potencias_por_caudal(Q, D, rho, mu, epsilon, elementos, cache)
+
+    n_el = len(elementos)
+    dt = paso_min * 60.0
+    n_pasos = int(round(duracion_h * 60.0 / paso_min))
+    pasos_reporte = max(int(round(intervalo_reporte_min / paso_min)), 1)
+
+    # Tanques: uno aguas abajo de cada elemento (el último es la planta);
+    # el tanque aguas arriba del primer elemento es el río (ilimitado).
+    capacidad = [volumen_tanque] * (n_el - 1) + [volumen_tanque_planta]
+    volumen = [nivel_inicial * c for c in capacidad]
+    v_encendido = [nivel_encendido * c for c in capacidad]
+    v_apagado = [nivel_apagado * c for c in capacidad]
+    v_minimo = [NIVEL_MINIMO * c for c in capacidad]
+    es_bomba = [el['tipo'] == 'bomba' for el in elementos]
+    activo = [False] * n_el
+
+    # Demanda y horario por paso, precalculados
+    hora = (np.arange(n_pasos) * paso_min / 60.0).astype(int) % 24
+    demanda = (demanda_media * np.asarray(patron_demanda)[hora] * dt).tolist()
+    if horario_bombas is None:
+        permitido = [True] * n_pasos
+    else:
+        permitido = np.asarray(horario_bombas, dtype=bool)[hora].tolist()
+
+    volumen_paso = Q * dt
+    pasos_activo = [0.0] * n_el
+    arranques = [0] * n_el
+    no_atendida = 0.0
+    recortado = 0.0
+
+    n_reportes = n_pasos // pasos_reporte
+    reporte_niveles = np.empty((n_reportes, n_el))
+    reporte_activos = np.empty(n_reportes, dtype=int)
+    reporte_potencia = np.empty(n_reportes)
+
+    rango = range(n_el)
+    ultimo = n_el - 1
+    for k in range(n_pasos):
+        habilitado = permitido[k]
+        potencia_paso = 0.0
+        for i in rango:
+            # Fuera del horario permitido la bomba queda apagada: al volver
+            # el horario, su arranque cuenta como un arranque más
+            if es_bomba[i] and not habilitado:
+                activo[i] = False
+                continue
+            # --- Control: histéresis sobre el tanque aguas abajo ---
+            v_abajo = volumen[i]
+            if activo[i]:
+                if v_abajo >= v_apagado[i]:
+                    activo[i] = False
+            elif v_abajo <= v_encendido[i]:
+                activo[i] = True
+                arranques[i] += 1
+            if not activo[i]:
+                continue
+            # Se transfiere lo que cabe aguas abajo y lo que el tanque aguas
+            # arriba tiene sobre su mínimo (el río nunca se vacía)
+            transferido = capacidad[i] - v_abajo
+            if i > 0:
+                transferido = min(transferido, volumen[i - 1] - v_minimo[i - 1])
+            if transferido >= volumen_paso:
+                transferido = volumen_paso
+            elif transferido <= 0.0:
+                continue
+            else:
+                recortado += volumen_paso - transferido
+            if i > 0:
+                volumen[i - 1] -= transferido
+            volumen[i] = v_abajo + transferido
+            # Fracción del paso en marcha: energía proporcional al volumen
+            fraccion = transferido / volumen_paso
+            pasos_activo[i] += fraccion
+            potencia_paso += potencias[i] * fraccion
+
+        # --- Demanda de la planta ---
+        d = demanda[k]
+        if volumen[ultimo] >= d:
+            volumen[ultimo] -= d
+        else:
+            no_atendida += d - volumen[ultimo]
+            volumen[ultimo] = 0.0
+
+        if (k + 1) % pasos_reporte == 0:
+            r = k // pasos_reporte
+            reporte_niveles[r] = volumen
+            reporte_activos[r] = sum(activo)
+            reporte_potencia[r] = potencia_paso
+
+    horas_activo = np.array(pasos_activo) * paso_min / 60.0
+    energia = np.array(potencias) * horas_activo
+
+    nombres = [el['nombre'] for el in elementos]
+    serie = pd.DataFrame(reporte_niveles / np.array(capacidad), columns=nombres)
+    serie.insert(0, 'hora', (np.arange(1, n_reportes + 1) * pasos_reporte * paso_min) / 60.0)
+    serie['elementos_activos'] = reporte_activos
+    serie['potencia_kw'] = reporte_potencia
+
+    return {
+        'serie': serie,
+        'elementos': pd.DataFrame({
+            'elemento': nombres,
+            'tipo': [el['tipo'] for el in elementos],
+            'potencia_kw': potencias,
+            'horas_operacion': horas_activo,
+            'energia_kwh': energia,
+            'arranques': arranques,
+        }),
+        'energia_kwh': float(energia.sum()),
+        'demanda_m3': float(sum(demanda)),
+        'demanda_no_atendida_m3': no_atendida,
+        'volumen_recortado_m3': recortado,
+    }
@@ -0,0 +1,260 @@
+"""
+tabla_moody.py — Tabla precalculada del diagrama de Moody.
+
+Guarda ln f de Colebrook-White en una malla uniforme sobre
+log₁₀(Re) × log₁₀(ε/D) y la consulta con interpolación bicúbica
+(convolución cúbica de Keys, a = -0.5). La tabla vive en
+`source/moody_tabla.npy` (float32) con sus metadatos en
+`source/moody_tabla.json`, y se abre como memoria mapeada la primera
+vez que se usa.
+
+El error relativo frente a `f_colebrook` se mide al generar la tabla en
+una malla 4 veces más fina que la de la tabla (incluye los centros de
+celda, donde el error de interpolación es máximo); la cota guardada en
+los metadatos es ese máximo con un margen de `MARGEN_COTA` para los
+puntos intermedios. Fuera del rango tabulado se resuelve Colebrook.
+
+Para regenerar la tabla:
+    python -m core.tabla_moody
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from core.hidraulica import _colebrook_vectorizado, _es_escalar
+
+RUTA_TABLA = Path(__file__).parent.parent / "source" / "moody_tabla.npy"
+RUTA_METADATOS = RUTA_TABLA.with_suffix(".json")
+
+# Malla por defecto: Re de 10² a 10⁸, ε/D de 10⁻⁷ a 10⁻¹
+LOG_RE = (2.0, 8.0)
+LOG_RUGOSIDAD = (-7.0, -1.0)
+PASO_LOG = 0.02
+MARGEN_COTA = 1.25
+
+# Rugosidades relativas de las curvas del diagrama de Moody
+RUGOSIDADES_MOODY = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 2e-4, 5e-4,
+    1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2,
+)
+
+
+@dataclass(frozen=True)
+class TablaMoody:
+    """
+    Malla de ln f y sus metadatos (valores: arreglo n_re × n_rugosidad).
+
+    `log_re0` y `log_rugosidad0` son las coordenadas del primer nodo. La
+    malla lleva un nodo de margen por lado para que el soporte 4×4 de la
+    interpolación siempre caiga dentro; el rango consultable es el
+    interior (propiedades `*_min` / `*_max`).
+    """
+    log_re0: float
+    log_rugosidad0: float
+    paso: float
+    valores: np.ndarray
+    error_rel_max: float
+
+    @property
+    def log_re_min(self) -> float:
+        return self.log_re0 + self.paso
+
+    @property
+    def log_re_max(self) -> float:
+        return self.log_re0 + self.paso * (self.valores.shape[0] - 2)
+
+    @property
+    def log_rugosidad_min(self) -> float:
+        return self.log_rugosidad0 + self.paso
+
+    @property
+    def log_rugosidad_max(self) -> float:
+        return self.log_rugosidad0 + self.paso * (self.valores.shape[1] - 2)
+
+
+_TABLA = None  # tabla mapeada, se abre en el primer uso
+
+
+def _pesos_keys(t):
+    """Pesos de la convolución cúbica (a = -0.5) para los nodos i-1 … i+2."""
+    t2 = t * t
+    t3 = t2 * t
+    return (
+        -0.5 * t3 + t2 - 0.5 * t,
+        1.5 * t3 - 2.5 * t2 + 1.0,
+        -1.5 * t3 + 2.0 * t2 + 0.5 * t,
+        0.5 * (t3 - t2),
+    )
+
+
+def _interpolar(tabla: TablaMoody, log_re, log_rr):
+    """ln f interpolado para arreglos dentro del rango de la tabla."""
+    n1, n2 = tabla.valores.shape
+    plano = tabla.valores.reshape(-1)
+    u = (log_re - tabla.log_re0) / tabla.paso
+    v = (log_rr - tabla.log_rugosidad0) / tabla.paso
+    # El soporte de 4×4 nodos debe caber en la tabla
+    i = np.clip(u.astype(np.intp), 1, n1 - 3)
+    j = np.clip(v.astype(np.intp), 1, n2 - 3)
+    wu = _pesos_keys(u - i)
+    wv = _pesos_keys(v - j)
+    base = (i - 1) * n2 + (j - 1)
+    ln_f = 0.0
+    for a in range(4):
+        fila = 0.0
+        for b in range(4):
+            fila = fila + wv[b] * plano[base + (a * n2 + b)]
+        ln_f = ln_f + wu[a] * fila
+    return ln_f
+
+
+def _interpolar_escalar(tabla: TablaMoody, log_re: float, log_rr: float) -> float:
+    """Versión escalar en Python puro (sin la sobrecarga de NumPy)."""
+    n1, n2 = tabla.valores.shape
+    u = (log_re - tabla.log_re0) / tabla.paso
+    v = (log_rr - tabla.log_rugosidad0) / tabla.paso
+    i = min(max(int(u), 1), n1 - 3)
+    j = min(max(int(v), 1), n2 - 3)
+    wu = _pesos_keys(u - i)
+    wv = _pesos_keys(v - j)
+    bloque = tabla.valores[i - 1:i + 3, j - 1:j + 3].tolist()
+    return sum(
+        wu[a] * sum(wv[b] * bloque[a][b] for b in range(4)) for a in range(4)
+    )
+
+
+def generar_tabla(
+    log_re=LOG_RE,
+    log_rugosidad=LOG_RUGOSIDAD,
+    paso: float = PASO_LOG,
+) -> TablaMoody:
+    """
+    Calcula la tabla con el solver exacto, mide su error y la guarda
+    en `RUTA_TABLA` / `RUTA_METADATOS`.
+
+    Retorna la tabla recién generada (en memoria, no mapeada).
+    """
+    global _TABLA
+    # Rango consultable más un nodo de margen por lado
+    eje_re = np.arange(log_re[0] - paso, log_re[1] + 1.5 * paso, paso)
+    eje_rr = np.arange(log_rugosidad[0] - paso, log_rugosidad[1] + 1.5 * paso, paso)
+    f = _colebrook_vectorizado(10.0**eje_re[:, None], 10.0**eje_rr[None, :])
+    valores = np.log(f).astype(np.float32)
+    origen_re, origen_rr = float(eje_re[0]), float(eje_rr[0])
+    tabla = TablaMoody(origen_re, origen_rr, paso, valores, float('nan'))
+
+    # Error frente al solver exacto en una malla 4× más fina
+    n_re, n_rr = len(eje_re) - 2, len(eje_rr) - 2
+    fino_re = np.linspace(log_re[0], log_re[1], 4 * (n_re - 1) + 1)
+    fino_rr = np.linspace(log_rugosidad[0], log_rugosidad[1], 4 * (n_rr - 1) + 1)
+    LR, LK = np.meshgrid(fino_re, fino_rr, indexing='ij')
+    exacto = _colebrook_vectorizado(10.0**LR, 10.0**LK)
+    interpolado = np.exp(_interpolar(tabla, LR, LK))
+    error_medido = float(np.max(np.abs(interpolado / exacto - 1.0)))
+    error = MARGEN_COTA * error_medido
+
+    np.save(RUTA_TABLA, valores)
+    RUTA_METADATOS.write_text(json.dumps({
+        'descripcion': 'ln f de Colebrook-White sobre log10(Re) x log10(e/D)',
+        'log_re0': origen_re,
+        'log_rugosidad0': origen_rr,
+        'paso': paso,
+        'forma': list(valores.shape),
+        'margen': 'un nodo por lado fuera del rango consultable',
+        'dtype': str(valores.dtype),
+        'interpolacion': 'convolucion cubica (Keys, a=-0.5)',
+        'error_rel_medido': error_medido,
+        'error_rel_max': error,
+    }, indent=2) + "\n", encoding="utf-8")
+    _TABLA = None
+    return TablaMoody(origen_re, origen_rr, paso, valores, error)
+
+
+def cargar_tabla() -> TablaMoody:
+    """
+    Abre la tabla como memoria mapeada (una sola vez por proceso).
+
+    Lanza FileNotFoundError si la tabla no existe; se genera con
+    `python -m core.tabla_moody`.
+    """
+    global _TABLA
+    if _TABLA is None:
+        meta = json.loads(RUTA_METADATOS.read_text(encoding="utf-8"))
+        _TABLA = TablaMoody(
+            log_re0=meta['log_re0'],
+            log_rugosidad0=meta['log_rugosidad0'],
+            paso=meta['paso'],
+            valores=np.load(RUTA_TABLA, mmap_mode='r'),
+            error_rel_max=meta['error_rel_max'],
+        )
+    return _TABLA
+
+
+def f_tabla(Re, epsilon, D):
+    """
+    Factor de fricción de Colebrook interpolado desde la tabla de Moody.
+
+    Misma interfaz que `f_colebrook` (escalares o arreglos). El error
+    relativo frente a `f_colebrook` es menor que `error_rel_max` de la
+    tabla; los puntos fuera del rango tabulado (o con ε = 0) se
+    resuelven con el solver exacto.
+    """
+    tabla = cargar_tabla()
+    if _es_escalar(Re, epsilon, D):
+        if Re <= 0:
+            return 0.0
+        rr = epsilon / D
+        if rr > 0:
+            log_re = math.log10(Re)
+            log_rr = math.log10(rr)
+            if (tabla.log_re_min <= log_re <= tabla.log_re_max
+                    and tabla.log_rugosidad_min <= log_rr <= tabla.log_rugosidad_max):
+                return math.exp(_interpolar_escalar(tabla, log_re, log_rr))
+        return float(_colebrook_vectorizado(Re, rr))
+
+    Re, rr = np.broadcast_arrays(
+        np.asarray(Re, dtype=float), np.asarray(epsilon, dtype=float) / D
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_re = np.log10(Re)
+        log_rr = np.log10(rr)
+    dentro = (
+        (log_re >= tabla.log_re_min) & (log_re <= tabla.log_re_max)
+        & (log_rr >= tabla.log_rugosidad_min) & (log_rr <= tabla.log_rugosidad_max)
+    )
+    if np.all(dentro):
+        return np.exp(_interpolar(tabla, log_re, log_rr))
+    f = np.empty(Re.shape)
+    f[dentro] = np.exp(_interpolar(tabla, log_re[dentro], log_rr[dentro]))
+    fuera = ~dentro
+    f[fuera] = _colebrook_vectorizado(Re[fuera], rr[fuera])
+    return f
+
+
+def curvas_moody(rugosidades=RUGOSIDADES_MOODY, n_puntos: int = 200) -> dict:
+    """
+    Datos del diagrama de Moody a partir de la tabla.
+
+    Retorna dict con:
+        'laminar': (Re, f) de f = 64/Re para Re ≤ 2300
+        'turbulento': {ε/D: (Re, f)} desde Re = 2300 hasta el máximo
+                      tabulado, interpolados de la tabla
+    """
+    tabla = cargar_tabla()
+    Re_lam = np.logspace(np.log10(600.0), np.log10(2300.0), 50)
+    Re_tur = np.logspace(np.log10(2300.0), tabla.log_re_max, n_puntos)
+    return {
+        'laminar': (Re_lam, 64.0 / Re_lam),
+        'turbulento': {rr: (Re_tur, f_tabla(Re_tur, rr, 1.0)) for rr in rugosidades},
+    }
+
+
+if __name__ == '__main__':
+    nueva = generar_tabla()
+    print(f'Tabla {nueva.valores.shape} guardada en {RUTA_TABLA} '
+          f'({RUTA_TABLA.stat().st_size / 1024:.0f} KiB), '
+          f'error relativo máximo {nueva.error_rel_max:.2e}')
@@ -4,12 +4,23 @@ tramos.py — Definición de los 8 tramos del sistema hidráulico.
 Cada tramo contiene su geometría fija (distancia, altura, pendiente),
 los accesorios instalados (codos, válvulas, entradas/salidas), y
 las decisiones de ingeniería (número de estaciones, tipo de control).
+
+La definición se construye una sola vez al importar el módulo y se
+expone de dos formas:
+- `obtener_definicion_tramos()`: vista de solo lectura con la API de dict.
+- `obtener_geometria()`: tabla columnar (arreglos NumPy inmutables) para
+  los cálculos vectorizados.
 """
 
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
 
-def obtener_definicion_tramos() -> dict:
+
+def _construir_definiciones() -> dict:
     """
-    Retorna la definición geométrica y de accesorios de los 8 tramos.
+    Construye la definición geométrica y de accesorios de los 8 tramos.
     
     Los datos provienen del CSV original y del mapa topográfico.
     La geometría es fija; lo que cambia al interactuar son Q, D, ρ, μ, ε.
@@ -214,6 +225,111 @@ def obtener_definicion_tramos() -> dict:
     return tramos
 
 
+def _congelar(valor):
+    """Convierte dicts y listas anidados en vistas de solo lectura."""
+    if isinstance(valor, dict):
+        return MappingProxyType({k: _congelar(v) for k, v in valor.items()})
+    if isinstance(valor, list):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _solo_lectura(arreglo: np.ndarray) -> np.ndarray:
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+@dataclass(frozen=True)
+class GeometriaTramos:
+    """
+    Geometría de los tramos en forma columnar.
+    
+    Cada atributo por tramo es un arreglo de largo T (en el orden de
+    `numeros`); los accesorios se guardan en una tabla plana donde
+    `acc_tramo` indica el tramo al que pertenece cada fila.
+    """
+    numeros: np.ndarray
+    distancia: np.ndarray
+    altura: np.ndarray
+    pendiente: np.ndarray
+    longitud_tuberia: np.ndarray
+    z: np.ndarray
+    K_total: np.ndarray
+    num_estaciones: np.ndarray
+    es_bajada: np.ndarray
+    tanque_rompe_presion: np.ndarray
+    # Índice (posición, no número) del tramo que cede su gravedad; -1 si ninguno
+    fuente_gravedad: np.ndarray
+    acc_tramo: np.ndarray
+    acc_nombre: np.ndarray
+    acc_cantidad: np.ndarray
+    acc_K: np.ndarray
+
+    def indice(self, num_tramo: int) -> int:
+        """Posición del tramo `num_tramo` dentro de los arreglos."""
+        return int(np.flatnonzero(self.numeros == num_tramo)[0])
+
+
+def construir_geometria(definiciones) -> GeometriaTramos:
+    """Construye la tabla columnar a partir de un dict de definiciones."""
+    numeros = list(definiciones)
+    posicion = {t: i for i, t in enumerate(numeros)}
+
+    def columna(clave, dtype, defecto=None):
+        return _solo_lectura(np.array(
+            [definiciones[t].get(clave, defecto) for t in numeros], dtype=dtype
+        ))
+
+    fuente = [
+        posicion.get(definiciones[t].get('recibe_gravedad_de'), -1) for t in numeros
+    ]
+    accesorios = [
+        (t, a['nombre'], a['cantidad'], a['K'])
+        for t in numeros for a in definiciones[t]['accesorios']
+    ]
+    acc_tramo, acc_nombre, acc_cantidad, acc_K = (
+        zip(*accesorios) if accesorios else ((), (), (), ())
+    )
+    return GeometriaTramos(
+        numeros=_solo_lectura(np.array(numeros, dtype=int)),
+        distancia=columna('distancia', float),
+        altura=columna('altura', float),
+        pendiente=columna('pendiente', float),
+        longitud_tuberia=columna('longitud_tuberia', float),
+        z=columna('z', float),
+        K_total=columna('K_total', float),
+        num_estaciones=columna('num_estaciones', int),
+        es_bajada=columna('es_bajada', bool),
+        tanque_rompe_presion=columna('tanque_rompe_presion', bool, True),
+        fuente_gravedad=_solo_lectura(np.array(fuente, dtype=int)),
+        acc_tramo=_solo_lectura(np.array(acc_tramo, dtype=int)),
+        acc_nombre=_solo_lectura(np.array(acc_nombre, dtype=object)),
+        acc_cantidad=_solo_lectura(np.array(acc_cantidad, dtype=int)),
+        acc_K=_solo_lectura(np.array(acc_K, dtype=float)),
+    )
+
+
+# Construidos una sola vez al importar el módulo
+_DEFINICIONES = _congelar(_construir_definiciones())
+_GEOMETRIA = construir_geometria(_DEFINICIONES)
+
+
+def obtener_definicion_tramos() -> MappingProxyType:
+    """
+    Retorna la definición geométrica y de accesorios de los 8 tramos.
+    
+    Es una vista de solo lectura compartida (no se reconstruye en cada
+    llamada): los dicts son `MappingProxyType` y las listas, tuplas.
+    Para modificar un tramo, copiarlo primero (p. ej. `dict(defn)`).
+    """
+    return _DEFINICIONES
+
+
+def obtener_geometria() -> GeometriaTramos:
+    """Retorna la geometría columnar (inmutable) de los 8 tramos."""
+    return _GEOMETRIA
+
+
 def obtener_elevaciones_acumuladas() -> list[dict]:
     """
     Calcula las elevaciones y distancias acumuladas en los puntos
@@ -0,0 +1,244 @@
+"""
+transitorios.py — Golpe de ariete por el método de las características.
+
+Discretiza una estación de cada tramo (los tanques receptores y
+rompe-presión separan hidráulicamente las estaciones) y simula:
+- tramos con bomba: paro de bomba con válvula de retención, aguas abajo
+  un tanque de nivel constante;
+- tramos descendentes: cierre de la válvula de estrangulamiento aguas
+  abajo, aguas arriba un tanque de nivel constante.
+
+Las ecuaciones de compatibilidad C⁺/C⁻ se actualizan para todos los
+nodos interiores con operaciones de NumPy sobre rebanadas (sin ciclos
+por nodo). Se reportan las envolventes de presión máxima y mínima.
+
+Simplificaciones: fricción cuasi-estacionaria (Darcy con f de Colebrook
+en régimen permanente), sin separación de columna, y el tramo 7 (sin
+tanque rompe-presión) se simula aislado del tramo 8 con cabeza constante
+en la unión.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.hidraulica import area_seccion, calcular_sistema_completo, f_colebrook, g, reynolds
+from core.optimizacion import PRESION_MAX_MPA
+from core.tramos import obtener_definicion_tramos
+
+CELERIDAD = 1200.0          # m/s, velocidad de onda en acero
+TIEMPO_CIERRE = 5.0         # s, cierre de válvula
+INERCIA_BOMBA = 2.0         # s, constante de desaceleración de la bomba
+PRESION_VAPOR_MPA = -0.098  # MPa manométrica (≈ presión de vapor a 20 °C)
+
+
+def simular_tramo(
+    num_tramo: int,
+    Q: float = 0.025,
+    D: float = 0.1541,
+    rho: float = 998.0,
+    mu: float = 0.001,
+    epsilon: float = 0.000046,
+    celeridad: float = CELERIDAD,
+    n_tramos_malla: int = 200,
+    duracion: float | None = None,
+    tiempo_cierre: float = TIEMPO_CIERRE,
+    inercia_bomba: float = INERCIA_BOMBA,
+    t_evento: float = 0.0,
+    resultados: dict | None = None,
+) -> dict:
+    """
+    Simula el transitorio de una estación del tramo `num_tramo`.
+
+    Parámetros:
+        celeridad: velocidad de la onda de presión (m/s)
+        n_tramos_malla: número de tramos de la malla (nodos = n + 1)
+        duracion: tiempo simulado (s); por defecto 20 periodos 2L/a
+            más el tiempo de cierre
+        tiempo_cierre: cierre lineal de la válvula (tramos descendentes)
+        inercia_bomba: la velocidad relativa de la bomba cae como
+            1/(1 + t/inercia) tras el paro (tramos con bomba)
+        resultados: salida de `calcular_sistema_completo` (se calcula
+            si no se da)
+
+    Retorna dict con arreglos por nodo: 'x', 'z', 'H_inicial', 'H_max',
+    'H_min', 'p_inicial_mpa', 'p_max_mpa', 'p_min_mpa', y los escalares
+    'tramo', 'escenario', 'dt', 'pasos'.
+    """
+    if resultados is None:
+        resultados = calcular_sistema_completo(Q=Q, D=D, rho=rho, mu=mu, epsilon=epsilon)
+    defn = obtener_definicion_tramos()[num_tramo]
+    r = resultados[num_tramo]
+    n_est = max(int(defn['num_estaciones']), 1)
+
+    # Geometría de una estación, elevaciones relativas al inicio
+    L = defn['longitud_tuberia'] / n_est
+    N = n_tramos_malla
+    dx = L / N
+    dt = dx / celeridad
+    x = np.linspace(0.0, L, N + 1)
+    z = defn['altura'] / n_est * x / L
+
+    A = area_seccion(D)
+    f = f_colebrook(reynolds(rho, Q / A, D, mu), epsilon, D)
+    B = celeridad / (g * A)
+    R = f * dx / (2 * g * D * A**2)
+
+    # Régimen permanente: solo fricción distribuida en la tubería
+    hf = R * N * Q * abs(Q)
+    bomba = not defn['es_bajada']
+    if bomba:
+        escenario = 'paro de bomba'
+        H_succion = r.get('cabeza_gravedad_recibida', 0.0)
+        H_bomba0 = r['carga_estacion']
+        H_arriba = H_succion + H_bomba0
+        H_abajo = H_arriba - hf
+        # Curva de bomba que pasa por el punto de diseño: H = a0·α² - a2·Q²
+        a0 = 1.25 * H_bomba0
+        a2 = 0.25 * H_bomba0 / Q**2
+    else:
+        escenario = 'cierre de válvula'
+        H_arriba = 0.0
+        H_abajo = z[-1]
+        dH_valvula0 = max(H_arriba - hf - H_abajo, 1e-3)
+        Cv0 = Q**2 / (2 * dH_valvula0)
+
+    H = H_arriba - hf * x / L
+    Qn = np.full(N + 1, Q)
+    H_inicial = H.copy()
+    H_max = H.copy()
+    H_min = H.copy()
+
+    if duracion is None:
+        duracion = t_evento + tiempo_cierre + 20 * 2 * L / celeridad
+    pasos = int(np.ceil(duracion / dt))
+
+    # Buffers reutilizados en cada paso
+    rq = np.empty(N + 1)
+    CP = np.empty(N)
+    CM = np.empty(N)
+    H_n = np.empty(N + 1)
+    Q_n = np.empty(N + 1)
+
+    for k in range(1, pasos + 1):
+        t = k * dt - t_evento
+
+        np.multiply(Qn, np.abs(Qn), out=rq)
+        rq *= R
+        # C⁺ desde el nodo i-1 y C⁻ desde el nodo i+1
+        np.add(H[:-1], B * Qn[:-1], out=CP)
+        CP -= rq[:-1]
+        np.subtract(H[1:], B * Qn[1:], out=CM)
+        CM += rq[1:]
+
+        # Nodos interiores
+        np.subtract(CP[:-1], CM[1:], out=Q_n[1:-1])
+        Q_n[1:-1] /= 2 * B
+        np.add(CP[:-1], CM[1:], out=H_n[1:-1])
+        H_n[1:-1] /= 2
+
+        # Frontera aguas arriba (usa C⁻ del nodo 1)
+        cm = CM[0]
+        if bomba:
+            alfa = 1.0 if t <= 0 else 1.0 / (1.0 + t / inercia_bomba)
+            # H_succion + a0·α² - a2·Q² = cm + B·Q
+            c = cm - H_succion - a0 * alfa**2
+            q = (-B + np.sqrt(max(B**2 - 4 * a2 * c, 0.0))) / (2 * a2)
+            if q <= 0:  # válvula de retención cerrada
+                q = 0.0
+            Q_n[0] = q
+            H_n[0] = cm + B * q
+        else:
+            H_n[0] = H_arriba
+            Q_n[0] = (H_arriba - cm) / B
+
+        # Frontera aguas abajo (usa C⁺ del nodo N-1)
+        cp = CP[-1]
+        if bomba:
+            H_n[-1] = H_abajo
+            Q_n[-1] = (cp - H_abajo) / B
+        else:
+            tau = 1.0 if t <= 0 else max(1.0 - t / tiempo_cierre, 0.0)
+            Cv = Cv0 * tau**2
+            dH = cp - H_abajo
+            if Cv == 0 or dH <= 0:
+                q = 0.0
+            else:
+                q = -B * Cv + np.sqrt((B * Cv)**2 + 2 * Cv * dH)
+            Q_n[-1] = q
+            H_n[-1] = cp - B * q
+
+        H, H_n = H_n, H
+        Qn, Q_n = Q_n, Qn
+        np.maximum(H_max, H, out=H_max)
+        np.minimum(H_min, H, out=H_min)
+
+    factor = rho * g / 1e6
+    return {
+        'tramo': num_tramo,
+        'escenario': escenario,
+        'x': x,
+        'z': z,
+        'H_inicial': H_inicial,
+        'H_max': H_max,
+        'H_min': H_min,
+        'p_inicial_mpa': (H_inicial - z) * factor,
+        'p_max_mpa': (H_max - z) * factor,
+        'p_min_mpa': (H_min - z) * factor,
+        'dt': dt,
+        'pasos': pasos,
+    }
+
+
+def _simular_tramo_args(args: tuple) -> dict:
+    """Adaptador para ProcessPoolExecutor.map."""
+    num_tramo, kwargs = args
+    return simular_tramo(num_tramo, **kwargs)
+
+
+def simular_transitorios(
+    tramos=None,
+    procesos: int | None = 1,
+    **kwargs,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Simula los transitorios de varios tramos y resume las envolventes.
+
+    Parámetros:
+        tramos: números de tramo (por defecto, los 8)
+        procesos: número de procesos; con más de 1 los tramos se simulan
+            en paralelo (los tanques los desacoplan). None usa todos los
+            núcleos disponibles.
+        **kwargs: parámetros de `simular_tramo`
+
+    Retorna (resumen, detalle): DataFrame con una fila por tramo
+    (escenario, presiones extremas y verificación contra 1.6 MPa y
+    cavitación) y dict {tramo: salida de `simular_tramo`}.
+    """
+    if tramos is None:
+        tramos = list(obtener_definicion_tramos())
+    if 'resultados' not in kwargs:
+        claves = ('Q', 'D', 'rho', 'mu', 'epsilon')
+        kwargs['resultados'] = calcular_sistema_completo(
+            **{k: kwargs[k] for k in claves if k in kwargs}
+        )
+
+    tareas = [(t, kwargs) for t in tramos]
+    if procesos == 1:
+        salidas = [_simular_tramo_args(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            salidas = list(ejecutor.map(_simular_tramo_args, tareas))
+
+    detalle = {s['tramo']: s for s in salidas}
+    resumen = pd.DataFrame([{
+        'tramo': s['tramo'],
+        'escenario': s['escenario'],
+        'p_inicial_max_mpa': float(s['p_inicial_mpa'].max()),
+        'p_max_mpa': float(s['p_max_mpa'].max()),
+        'p_min_mpa': float(s['p_min_mpa'].min()),
+        'cumple_presion_max': bool(s['p_max_mpa'].max() <= PRESION_MAX_MPA),
+        'riesgo_cavitacion': bool(s['p_min_mpa'].min() <= PRESION_VAPOR_MPA),
+    } for s in salidas])
+    return resumen, detalle
@@ -9,8 +9,10 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from core.resultados import ResultadoSistema
 
-def crear_mapa_piezometrico(resultados: dict, Q: float, D: float) -> go.Figure:
+
+def crear_mapa_piezometrico(resultados: ResultadoSistema, Q: float, D: float) -> go.Figure:
     """
     Genera el mapa piezométrico completo del sistema.
     """
@@ -312,26 +314,19 @@ def crear_mapa_piezometrico(resultados: dict, Q: float, D: float) -> go.Figure:
     return fig
 
 
-def crear_desglose_perdidas(resultados: dict) -> go.Figure:
+def crear_desglose_perdidas(resultados: ResultadoSistema) -> go.Figure:
     """
     Gráfico de barras apiladas: desglose de pérdidas por tramo.
     """
-    tramos_nums = list(range(1, 9))
-    nombres = [f'Tramo {i}' for i in tramos_nums]
-    
-    z_vals = []
-    hf_vals = []
-    hm_vals = []
-    
-    for i in tramos_nums:
-        r = resultados[i]
-        z_abs = abs(r.get('z_estacion', 0)) * r['num_estaciones']
-        hf = r['perdidas_friccion_colebrook'] * r['num_estaciones']
-        hm = r['perdidas_menores'] * r['num_estaciones']
-        
-        z_vals.append(z_abs if not r['es_bajada'] else 0)
-        hf_vals.append(hf)
-        hm_vals.append(hm)
+    nombres = [f'Tramo {i}' for i in resultados.tramos]
+    
+    n_est = resultados.columna('num_estaciones')
+    z_vals = np.where(
+        resultados.columna('es_bajada'), 0.0,
+        np.abs(resultados.columna('z_estacion')) * n_est,
+    )
+    hf_vals = resultados.columna('perdidas_friccion_colebrook') * n_est
+    hm_vals = resultados.columna('perdidas_menores') * n_est
     
     fig = go.Figure()
     
@@ -378,14 +373,13 @@ def crear_desglose_perdidas(resultados: dict) -> go.Figure:
     return fig
 
 
-def crear_grafico_potencia(resultados: dict) -> go.Figure:
+def crear_grafico_potencia(resultados: ResultadoSistema) -> go.Figure:
     """Gráfico de barras: potencia requerida por tramo (kW y HP)."""
-    tramos_nums = list(range(1, 9))
-    nombres = [f'T{i}' for i in tramos_nums]
+    nombres = [f'T{i}' for i in resultados.tramos]
     
-    kw_vals = [resultados[i]['potencia_kw'] for i in tramos_nums]
-    hp_vals = [resultados[i]['potencia_hp'] for i in tramos_nums]
-    tipos = [resultados[i]['tipo'] for i in tramos_nums]
+    kw_vals = resultados.columna('potencia_kw')
+    hp_vals = resultados.columna('potencia_hp')
+    tipos = resultados.columna('tipo')
     colores = ['#10B981' if t == 'bomba' else '#F59E0B' for t in tipos] # Green vs Amber
     
     fig = make_subplots(rows=1, cols=2, subplot_titles=('<b>Potencia (kW)</b>', '<b>Potencia (HP)</b>'))
@@ -428,7 +422,7 @@ def crear_grafico_potencia(resultados: dict) -> go.Figure:
     return fig
 
 
-def crear_perfil_terreno_con_tramos(resultados: dict) -> go.Figure:
+def crear_perfil_terreno_con_tramos(resultados: ResultadoSistema) -> go.Figure:
     """
     Perfil de elevación del terreno con tramos coloreados.
     """
@@ -540,3 +534,233 @@ def crear_perfil_terreno_con_tramos(resultados: dict) -> go.Figure:
     )
     
     return fig
+
+
+def crear_grafico_pareto_diametro(df) -> go.Figure:
+    """
+    Costo de capital vs. costo de energía (anuales) por diámetro comercial.
+    
+    Recibe el DataFrame de `optimizar_diametro` para un solo caudal;
+    resalta el frente de Pareto (solo diámetros factibles), los que exceden
+    la presión máxima y el diámetro de mínimo costo total.
+    """
+    fig = go.Figure()
+    
+    for factible, nombre, marcador in (
+        (True, 'Diámetros evaluados', dict(size=9, color='#64748b')),
+        (False, 'Exceden presión máxima', dict(size=9, symbol='x', color='#ef4444')),
+    ):
+        grupo = df[df['factible'] == factible]
+        if grupo.empty:
+            continue
+        fig.add_trace(go.Scatter(
+            x=grupo['costo_capital_anual'], y=grupo['costo_energia_anual'],
+            mode='markers',
+            marker=marcador,
+            text=[f'{d*1000:.1f} mm' for d in grupo['D']],
+            name=nombre,
+            hovertemplate='<b>D = %{text}</b><br>Capital: $%{x:,.0f}/año<br>'
+                          'Energía: $%{y:,.0f}/año<extra></extra>',
+        ))
+    
+    frente = df[df['pareto']].sort_values('costo_capital_anual')
+    fig.add_trace(go.Scatter(
+        x=frente['costo_capital_anual'], y=frente['costo_energia_anual'],
+        mode='lines+markers',
+        line=dict(color='#00d4ff', width=2),
+        marker=dict(size=10, color='#00d4ff'),
+        text=[f'{d*1000:.1f} mm' for d in frente['D']],
+        name='Frente de Pareto',
+        hovertemplate='<b>D = %{text}</b><br>Capital: $%{x:,.0f}/año<br>'
+                      'Energía: $%{y:,.0f}/año<extra></extra>',
+    ))
+    
+    optimo = df[df['optimo']]
+    if not optimo.empty:
+        fig.add_trace(go.Scatter(
+            x=optimo['costo_capital_anual'], y=optimo['costo_energia_anual'],
+            mode='markers+text',
+            marker=dict(size=16, symbol='star', color='#10B981'),
+            text=[f'<b>{d*1000:.1f} mm</b>' for d in optimo['D']],
+            textposition='top right',
+            textfont=dict(family="Inter, sans-serif", color="#10B981"),
+            name='Mínimo costo total',
+            hoverinfo='skip',
+        ))
+    
+    fig.update_layout(
+        title='<b>Diámetro Económico</b> — Capital vs. Energía',
+        xaxis_title='<b>Costo de capital anualizado (USD/año)</b>',
+        yaxis_title='<b>Costo de energía (USD/año)</b>',
+        yaxis_type='log',
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=450,
+        font=dict(family='Inter, system-ui, sans-serif', size=14, color='#f1f5f9'),
+        hoverlabel=dict(bgcolor="#1e293b", font_size=14),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5),
+        xaxis=dict(gridcolor='#334155'),
+        yaxis=dict(gridcolor='#334155'),
+    )
+    
+    return fig
+
+
+def crear_histograma_potencia(histograma, percentiles) -> go.Figure:
+    """
+    Histograma de la potencia total de bombeo del análisis Monte Carlo.
+    
+    Recibe el histograma ya calculado, (conteo, bordes) como el de
+    `monte_carlo_potencia`, y lo dibuja como barras: ni la sesión ni el
+    navegador reciben las muestras. `percentiles` es un dict
+    {percentil: potencia_kw} que se marca con líneas verticales.
+    """
+    conteo, bordes = histograma
+    centros = 0.5 * (bordes[:-1] + bordes[1:])
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=centros, y=conteo / conteo.sum() * 100,
+        width=np.diff(bordes),
+        marker=dict(color='#00d4ff', line=dict(width=0)),
+        opacity=0.8,
+        name='Muestras',
+        hovertemplate='%{x:.1f} kW<br>%{y:.2f} %<extra></extra>',
+    ))
+    
+    colores = ['#10B981', '#f1f5f9', '#F59E0B', '#EF4444']
+    for i, (p, valor) in enumerate(percentiles.items()):
+        fig.add_vline(
+            x=valor,
+            line=dict(color=colores[i % len(colores)], width=2, dash='dash'),
+            annotation_text=f'P{p}: {valor:.1f} kW',
+            annotation_position='top',
+            annotation_font=dict(color=colores[i % len(colores)]),
+        )
+    
+    fig.update_layout(
+        title='<b>Incertidumbre de la Potencia Total</b> — Monte Carlo',
+        xaxis_title='<b>Potencia total de bombeo (kW)</b>',
+        yaxis_title='<b>Frecuencia (%)</b>',
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=450,
+        bargap=0,
+        showlegend=False,
+        font=dict(family='Inter, system-ui, sans-serif', size=14, color='#f1f5f9'),
+        hoverlabel=dict(bgcolor="#1e293b", font_size=14),
+        xaxis=dict(gridcolor='#334155'),
+        yaxis=dict(gridcolor='#334155'),
+    )
+    
+    return fig
+
+
+def crear_grafico_sobol(df, salida: str = 'potencia_total_kw') -> go.Figure:
+    """
+    Barras horizontales (tipo tornado) con los índices de Sobol.
+    
+    Recibe el DataFrame de `indices_sobol` y grafica S1 y ST de una
+    salida, ordenados de mayor a menor índice total.
+    """
+    datos = df[df['salida'] == salida].sort_values('ST')
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=datos['variable'], x=datos['ST'],
+        orientation='h',
+        name='Total (ST)',
+        marker=dict(color='#F59E0B'),
+        hovertemplate='<b>%{y}</b><br>ST = %{x:.4f}<extra></extra>',
+    ))
+    fig.add_trace(go.Bar(
+        y=datos['variable'], x=datos['S1'],
+        orientation='h',
+        name='Primer orden (S1)',
+        marker=dict(color='#00d4ff'),
+        hovertemplate='<b>%{y}</b><br>S1 = %{x:.4f}<extra></extra>',
+    ))
+    
+    fig.update_layout(
+        title=f'<b>Índices de Sobol</b> — {salida}',
+        xaxis_title='<b>Fracción de la varianza</b>',
+        barmode='group',
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=450,
+        font=dict(family='Inter, system-ui, sans-serif', size=14, color='#f1f5f9'),
+        hoverlabel=dict(bgcolor="#1e293b", font_size=14),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='center', x=0.5),
+        xaxis=dict(gridcolor='#334155', range=[0, 1]),
+        yaxis=dict(gridcolor='#334155'),
+    )
+    
+    return fig
+
+
+def crear_diagrama_moody(curvas: dict, punto: tuple | None = None) -> go.Figure:
+    """
+    Diagrama de Moody (log-log) a partir de `core.tabla_moody.curvas_moody`.
+    
+    Dibuja la recta laminar 64/Re y una curva de Colebrook por rugosidad
+    relativa; `punto` = (Re, f, ε/D) marca el punto de operación actual.
+    """
+    fig = go.Figure()
+    
+    Re_lam, f_lam = curvas['laminar']
+    fig.add_trace(go.Scatter(
+        x=Re_lam, y=f_lam,
+        mode='lines',
+        line=dict(color='#F59E0B', width=3),
+        name='Laminar (64/Re)',
+        hovertemplate='Re = %{x:,.0f}<br>f = %{y:.4f}<extra>Laminar</extra>',
+    ))
+    
+    rugosidades = list(curvas['turbulento'])
+    for k, rr in enumerate(rugosidades):
+        Re_tur, f_tur = curvas['turbulento'][rr]
+        tono = int(80 + 175 * k / max(len(rugosidades) - 1, 1))
+        fig.add_trace(go.Scatter(
+            x=Re_tur, y=f_tur,
+            mode='lines',
+            line=dict(color=f'rgb(0,{tono},255)', width=1.5),
+            name=f'ε/D = {rr:g}',
+            hovertemplate=f'ε/D = {rr:g}<br>' + 'Re = %{x:,.0f}<br>f = %{y:.4f}<extra></extra>',
+        ))
+    
+    if punto is not None:
+        Re, f, rr = punto
+        fig.add_trace(go.Scatter(
+            x=[Re], y=[f],
+            mode='markers+text',
+            marker=dict(size=14, symbol='star', color='#10B981'),
+            text=['<b>Punto de operación</b>'],
+            textposition='top right',
+            textfont=dict(family="Inter, sans-serif", color="#10B981"),
+            name=f'Operación (ε/D = {rr:.2e})',
+            hovertemplate='Re = %{x:,.0f}<br>f = %{y:.5f}<extra>Operación</extra>',
+        ))
+    
+    fig.add_vrect(x0=2300, x1=4000, fillcolor='#64748b', opacity=0.15, line_width=0)
+    
+    fig.update_layout(
+        title='<b>Diagrama de Moody</b> — Tabla precalculada de Colebrook-White',
+        xaxis_title='<b>Número de Reynolds</b>',
+        yaxis_title='<b>Factor de fricción f</b>',
+        xaxis_type='log',
+        yaxis_type='log',
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=550,
+        font=dict(family='Inter, system-ui, sans-serif', size=14, color='#f1f5f9'),
+        hoverlabel=dict(bgcolor="#1e293b", font_size=14),
+        legend=dict(font=dict(size=11)),
+        xaxis=dict(gridcolor='#334155'),
+        yaxis=dict(gridcolor='#334155'),
+    )
+    
+    return fig
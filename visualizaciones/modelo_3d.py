@@ -671,7 +671,7 @@ def generar_modelo_tramo(num_tramo: int, resultados: dict) -> str:
         velocidad=r['velocidad'],
         presion_entrada=presion_entrada,
         presion_salida=presion_salida,
-        accesorios=defn['accesorios'],
+        accesorios=[dict(a) for a in defn['accesorios']],
         tipo=defn['tipo'],
         potencia_kw=r['potencia_kw'],
         reynolds=r['reynolds'],